@@ -0,0 +1,101 @@
+import os
+from typing import Optional
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..cache import TTLCache
+from ..database import get_db
+from ..models import Project, User, Workspace, workspace_members
+from .router import get_current_user
+
+WORKSPACE_ACCESS_TTL_SECONDS = float(os.getenv("WORKSPACE_ACCESS_TTL_SECONDS", "60"))
+WORKSPACE_ACCESS_MAX_ENTRIES = int(os.getenv("WORKSPACE_ACCESS_MAX_ENTRIES", "10000"))
+
+# user id -> workspace ids the user has been confirmed to access. Only grants
+# are cached, never denials, so a miss always falls through to the database.
+_memberships = TTLCache(WORKSPACE_ACCESS_MAX_ENTRIES, WORKSPACE_ACCESS_TTL_SECONDS)
+# project id -> workspace id
+_project_workspaces = TTLCache(WORKSPACE_ACCESS_MAX_ENTRIES, WORKSPACE_ACCESS_TTL_SECONDS)
+
+
+async def resolve_workspace_access(
+    db: AsyncSession,
+    user: User,
+    workspace_id: Optional[int] = None,
+    project_id: Optional[int] = None,
+) -> Optional[int]:
+    """Return the workspace id if ``user`` owns or belongs to it, else None.
+
+    Pass either ``workspace_id`` or ``project_id``. On a cache miss the
+    project -> workspace -> membership chain is resolved in one joined query.
+    """
+    if project_id is not None:
+        workspace_id = _project_workspaces.get(project_id)
+    granted = _memberships.get(user.id)
+    if workspace_id is not None and granted is not None and workspace_id in granted:
+        return workspace_id
+
+    query = (
+        select(Workspace.id)
+        .outerjoin(
+            workspace_members,
+            and_(
+                workspace_members.c.workspace_id == Workspace.id,
+                workspace_members.c.user_id == user.id,
+            ),
+        )
+        .where(or_(Workspace.owner_id == user.id, workspace_members.c.user_id.isnot(None)))
+    )
+    if project_id is not None:
+        query = query.join(Project, Project.workspace_id == Workspace.id).where(Project.id == project_id)
+    else:
+        query = query.where(Workspace.id == workspace_id)
+
+    result = await db.execute(query.limit(1))
+    workspace_id = result.scalar()
+    if workspace_id is None:
+        return None
+
+    if project_id is not None:
+        _project_workspaces.set(project_id, workspace_id)
+    _memberships.set(user.id, (granted or frozenset()) | {workspace_id})
+    return workspace_id
+
+
+async def require_workspace_access(
+    workspace_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> int:
+    if await resolve_workspace_access(db, current_user, workspace_id=workspace_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workspace not found or access denied")
+    return workspace_id
+
+
+async def require_project_access(
+    project_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> int:
+    """Resolves to the id of the workspace that owns the project."""
+    workspace_id = await resolve_workspace_access(db, current_user, project_id=project_id)
+    if workspace_id is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found or access denied")
+    return workspace_id
+
+
+def forget_user_access(user_id: int) -> None:
+    _memberships.pop(user_id)
+
+
+def forget_project(project_id: int) -> None:
+    _project_workspaces.pop(project_id)
+
+
+def forget_workspace() -> None:
+    # Grants for a deleted workspace may be held by any user, so drop them all
+    _memberships.clear()
+    _project_workspaces.clear()
@@ -0,0 +1,54 @@
+import hashlib
+import os
+import time
+from typing import Optional
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from ..cache import TTLCache
+from ..models import User
+from ..schemas import TokenData
+
+AUTH_CACHE_TTL_SECONDS = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+AUTH_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+
+# sha256(token) -> verified claims, so a repeat request skips jwt.decode
+_tokens = TTLCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+# user id -> column values of the user row, so a repeat request skips the SELECT
+_users = TTLCache(AUTH_CACHE_MAX_ENTRIES, AUTH_CACHE_TTL_SECONDS)
+
+_USER_COLUMNS = [column.key for column in User.__table__.columns]
+
+
+def token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def cached_claims(key: str) -> Optional[TokenData]:
+    return _tokens.get(key)
+
+
+def remember_claims(key: str, token_data: TokenData, expires_at: Optional[float]) -> None:
+    ttl = None if expires_at is None else expires_at - time.time()
+    _tokens.set(key, token_data, ttl)
+
+
+def cached_user(user_id: Optional[int]) -> Optional[User]:
+    if user_id is None:
+        return None
+    values = _users.get(user_id)
+    if values is None:
+        return None
+    # A fresh instance per request: it behaves like a row loaded by a session
+    # that has since closed, so handlers can still db.add() and update it.
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+def remember_user(user: User) -> None:
+    _users.set(user.id, {key: getattr(user, key) for key in _USER_COLUMNS})
+
+
+def invalidate_user(user_id: int) -> None:
+    _users.pop(user_id)
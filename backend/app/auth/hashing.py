@@ -0,0 +1,91 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+from fastapi import HTTPException, status
+
+from ..metrics import registry, Counter, Gauge, PASSWORD_HASH_DURATION, PASSWORD_HASH_WAIT
+
+# bcrypt releases the GIL while hashing, so a small thread pool keeps the
+# event loop free without the overhead of a process pool.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Calls allowed to wait for a free worker before new ones are turned away
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "32"))
+
+
+def _timed(fn, *args):
+    start = perf_counter()
+    result = fn(*args)
+    return result, perf_counter() - start
+
+
+class HashingPool:
+    """Bounded executor for password hashing.
+
+    Counters are only touched from the event loop thread, so they need no lock.
+    """
+
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self.in_flight = 0
+        self.calls = 0
+        self.rejected = 0
+        self.hash_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.in_flight - self.workers)
+
+    async def run(self, fn, *args):
+        if self.queue_depth >= self.queue_limit:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        self.in_flight += 1
+        start = perf_counter()
+        try:
+            result, hash_time = await asyncio.get_running_loop().run_in_executor(self._executor, _timed, fn, *args)
+        finally:
+            self.in_flight -= 1
+        wait_time = perf_counter() - start - hash_time
+        self.calls += 1
+        self.hash_seconds += hash_time
+        self.wait_seconds += wait_time
+        PASSWORD_HASH_DURATION.observe(value=hash_time)
+        PASSWORD_HASH_WAIT.observe(value=wait_time)
+        return result
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "hash_seconds": self.hash_seconds,
+            "wait_seconds": self.wait_seconds,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+hashing_pool = HashingPool(PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_LIMIT)
+
+
+@registry.collector
+def _hashing_metrics():
+    queue_depth = Gauge("password_hash_queue_depth", "bcrypt calls waiting for a hashing pool thread.")
+    queue_depth.set(value=hashing_pool.queue_depth)
+    in_flight = Gauge("password_hash_in_flight", "bcrypt calls queued or running.")
+    in_flight.set(value=hashing_pool.in_flight)
+    rejected = Counter("password_hash_rejected_total", "bcrypt calls turned away because the queue was full.")
+    rejected.inc(amount=hashing_pool.rejected)
+    return [queue_depth, in_flight, rejected]
@@ -1,3 +1,4 @@
+import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -6,9 +7,11 @@ from jose import JWTError, jwt
 from ..database import get_db
 from ..models import User
 from ..schemas import UserCreate, UserResponse, Token, TokenData
-from .utils import get_password_hash, verify_password, create_access_token, ALGORITHM, SECRET_KEY
+from .utils import get_password_hash_async, verify_password_async, create_access_token, ALGORITHM, SECRET_KEY
+from .cache import token_key, cached_claims, remember_claims, cached_user, remember_user, invalidate_user
 
 router = APIRouter(prefix="/auth", tags=["auth"])
+logger = logging.getLogger(__name__)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
@@ -18,84 +21,102 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
+    key = token_key(token)
+    token_data = cached_claims(key)
+    expires_at = None
+    if token_data is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            email: str = payload.get("sub")
+            if email is None:
+                raise credentials_exception
+            token_data = TokenData(email=email, user_id=payload.get("uid"))
+            expires_at = payload.get("exp")
+        except JWTError:
             raise credentials_exception
-        token_data = TokenData(email=email)
-    except JWTError:
-        raise credentials_exception
-    
-    result = await db.execute(select(User).where(User.email == token_data.email))
-    user = result.scalars().first()
+
+    user = cached_user(token_data.user_id)
+    if user is not None and user.email != token_data.email:
+        # An email change only clears the cache on the worker that handled it;
+        # elsewhere the cached row may predate it, so re-read before rejecting
+        user = None
     if user is None:
+        # Tokens issued before the "uid" claim existed are resolved by email
+        if token_data.user_id is not None:
+            result = await db.execute(select(User).where(User.id == token_data.user_id))
+        else:
+            result = await db.execute(select(User).where(User.email == token_data.email))
+        user = result.scalars().first()
+        if user is None:
+            raise credentials_exception
+        remember_user(user)
+
+    # An email change invalidates tokens issued for the old address
+    if user.email != token_data.email:
         raise credentials_exception
+
+    if expires_at is not None or token_data.user_id is None:
+        remember_claims(key, token_data.model_copy(update={"user_id": user.id}), expires_at)
     return user
 
 @router.post("/register", response_model=UserResponse)
 async def register(user_in: UserCreate, db: AsyncSession = Depends(get_db)):
-    print(f"Registration attempt for: {user_in.email}")
     result = await db.execute(select(User).where(User.email == user_in.email))
     user = result.scalars().first()
     if user:
-        print(f"Registration failed: User {user_in.email} already exists")
+        logger.info("Registration rejected, email already registered")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="The user with this email already exists in the system.",
         )
     
+    hashed_password = await get_password_hash_async(user_in.password)
     try:
         db_user = User(
             email=user_in.email,
-            hashed_password=get_password_hash(user_in.password),
+            hashed_password=hashed_password,
             full_name=user_in.full_name,
             role=user_in.role,
         )
         db.add(db_user)
         await db.commit()
         await db.refresh(db_user)
-        print(f"Registration successful for: {db_user.email}")
+        logger.info("Registered user %s", db_user.id)
         return db_user
     except Exception as e:
-        print(f"Registration error for {user_in.email}: {str(e)}")
+        logger.exception("Registration failed")
         await db.rollback()
         raise HTTPException(status_code=500, detail=f"Registration failed: {str(e)}")
 
 @router.post("/login", response_model=Token)
 async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)):
     try:
-        print(f"[LOGIN] Attempting login for: {form_data.username}")
         result = await db.execute(select(User).where(User.email == form_data.username))
         user = result.scalars().first()
         
         if not user:
-            print(f"[LOGIN] User not found: {form_data.username}")
+            logger.info("Login failed: unknown user")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail=f"User {form_data.username} not found",
                 headers={"WWW-Authenticate": "Bearer"},
             )
             
-        print(f"[LOGIN] User found: {user.email}, verifying password...")
-        if not verify_password(form_data.password, user.hashed_password):
-            print(f"[LOGIN] Password verification failed for: {user.email}")
+        if not await verify_password_async(form_data.password, user.hashed_password):
+            logger.info("Login failed: wrong password for user %s", user.id)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        print(f"[LOGIN] Password verified, creating token...")
-        access_token = create_access_token(data={"sub": user.email})
-        print(f"[LOGIN] Login successful for: {user.email}")
+        access_token = create_access_token(data={"sub": user.email, "uid": user.id})
+        logger.debug("Login succeeded for user %s", user.id)
         return {"access_token": access_token, "token_type": "bearer"}
     except HTTPException:
         raise
     except Exception as e:
-        print(f"[LOGIN ERROR] Unexpected error: {type(e).__name__}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Login failed with an unexpected error")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Login failed: {str(e)}"
@@ -125,9 +146,14 @@ async def update_user_me(
         current_user.full_name = full_name
     
     if password:
-        current_user.hashed_password = get_password_hash(password)
+        current_user.hashed_password = await get_password_hash_async(password)
+
+    if email or full_name:
+        # Tickets and workspaces embed the profile; their ETags include this
+        current_user.version = User.version + 1
     
     db.add(current_user)
     await db.commit()
+    invalidate_user(current_user.id)
     await db.refresh(current_user)
     return current_user
@@ -3,6 +3,7 @@ from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 import os
+from .hashing import hashing_pool
 
 # Secret key to sign JWT tokens
 SECRET_KEY = os.getenv("SECRET_KEY", "abhiram-secret-key")  # In production, use a secure method to set this
@@ -17,6 +18,14 @@ def verify_password(plain_password, hashed_password):
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+# Async variants for request handlers: bcrypt runs on the bounded hashing pool
+# instead of blocking the event loop.
+async def verify_password_async(plain_password, hashed_password):
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password):
+    return await hashing_pool.run(get_password_hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -0,0 +1,46 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """Small in-process LRU cache whose entries expire after ``ttl`` seconds.
+
+    Each uvicorn worker keeps its own copy, so anything cached here can be
+    stale in other workers for up to ``ttl`` seconds after an invalidation.
+    A ``ttl`` or ``maxsize`` of 0 disables the cache.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+        value, expires_at = item
+        if expires_at <= monotonic():
+            self._data.pop(key, None)
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        self._data[key] = (value, monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
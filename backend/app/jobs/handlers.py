@@ -0,0 +1,51 @@
+import logging
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from starlette.concurrency import run_in_threadpool
+
+from ..models import Attachment, Project, Ticket, User, Workspace
+from ..notifications import send_email
+from ..storage import sniff_content_type
+from .queue import job
+
+logger = logging.getLogger(__name__)
+
+# Content types browsers send when they don't know better
+_GENERIC_CONTENT_TYPES = {None, "", "application/octet-stream"}
+
+
+@job("process_attachment", queue="attachments")
+async def process_attachment(db: AsyncSession, payload: dict) -> None:
+    # Fill in the content type of uploads the client didn't label
+    attachment = await db.get(Attachment, payload["attachment_id"])
+    if attachment is None or attachment.sha256 is None:
+        return
+    if attachment.content_type not in _GENERIC_CONTENT_TYPES:
+        return
+    try:
+        content_type = await run_in_threadpool(sniff_content_type, attachment.sha256)
+    except FileNotFoundError:
+        logger.warning("Attachment %s has no stored content", attachment.id)
+        return
+    if content_type:
+        attachment.content_type = content_type
+        # The ticket listing embeds attachments; its ETag must change
+        ticket_project = select(Ticket.project_id).where(Ticket.id == attachment.ticket_id).scalar_subquery()
+        await db.execute(update(Project).where(Project.id == ticket_project).values(version=Project.version + 1))
+
+
+@job("notify_member_added", queue="notifications")
+async def notify_member_added(db: AsyncSession, payload: dict) -> None:
+    workspace = await db.get(Workspace, payload["workspace_id"])
+    member = await db.get(User, payload["user_id"])
+    if workspace is None or member is None:
+        return
+    added_by = await db.get(User, payload["added_by_id"])
+    inviter = (added_by.full_name or added_by.email) if added_by else "Someone"
+    await send_email(
+        member.email,
+        f"You were added to {workspace.name}",
+        f"{inviter} added you to the workspace \"{workspace.name}\" on Bug Tracker.",
+    )
@@ -0,0 +1,87 @@
+import asyncio
+import os
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models import Job
+
+# Attempts before a job is left as failed, unless its handler says otherwise
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+# Retry n waits about JOB_RETRY_BASE_SECONDS * 2**(n-1), capped at JOB_RETRY_MAX_SECONDS
+JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "5"))
+JOB_RETRY_MAX_SECONDS = float(os.getenv("JOB_RETRY_MAX_SECONDS", "900"))
+# A run longer than this is cancelled and counts as a failed attempt
+JOB_TIMEOUT_SECONDS = float(os.getenv("JOB_TIMEOUT_SECONDS", "300"))
+
+JobFunction = Callable[[AsyncSession, dict], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class JobHandler:
+    name: str
+    queue: str
+    fn: JobFunction
+    max_attempts: int
+    timeout: float
+
+
+HANDLERS: Dict[str, JobHandler] = {}
+
+# Queue name -> event set when a job for it is committed in this process, so
+# in-process workers pick it up without waiting for their next poll
+wakeups: Dict[str, asyncio.Event] = {}
+
+
+def job(name: str, queue: str = "default", max_attempts: int = JOB_MAX_ATTEMPTS, timeout: float = JOB_TIMEOUT_SECONDS):
+    """Register ``fn(db, payload)`` as the handler for jobs called ``name``.
+
+    The handler runs on a fresh session; the job row is deleted on that same
+    session and committed with whatever the handler wrote, so a handler that
+    fails part-way leaves nothing behind and is simply retried.
+    """
+    def register(fn: JobFunction) -> JobHandler:
+        if name in HANDLERS:
+            raise ValueError(f"Job {name!r} is already registered")
+        handler = HANDLERS[name] = JobHandler(name, queue, fn, max_attempts, timeout)
+        return handler
+    return register
+
+
+def enqueue(db: AsyncSession, handler: JobHandler, payload: Optional[dict] = None, delay: float = 0) -> Job:
+    """Add a job to the caller's transaction; it becomes visible to workers when that commits."""
+    db_job = Job(
+        queue=handler.queue,
+        name=handler.name,
+        payload=payload or {},
+        max_attempts=handler.max_attempts,
+        run_at=datetime.utcnow() + timedelta(seconds=delay),
+    )
+    db.add(db_job)
+    db.sync_session.info.setdefault("enqueued_queues", set()).add(handler.queue)
+    return db_job
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds before retrying a job that has failed ``attempts`` times (exponential, with jitter)."""
+    delay = min(JOB_RETRY_BASE_SECONDS * 2 ** (attempts - 1), JOB_RETRY_MAX_SECONDS)
+    # Jitter keeps jobs that failed together (e.g. an outage) from retrying together
+    return delay * random.uniform(0.5, 1.0)
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_workers(session):
+    for queue in session.info.pop("enqueued_queues", ()):
+        wakeup = wakeups.get(queue)
+        if wakeup is not None:
+            wakeup.set()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_wakeups(session):
+    session.info.pop("enqueued_queues", None)
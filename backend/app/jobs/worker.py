@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import and_, delete, or_, update
+from sqlalchemy.future import select
+
+from ..database import SessionLocal
+from ..metrics import registry, Gauge, JOBS_FINISHED, JOB_DURATION
+from ..models import Job, JobStatus
+from . import handlers  # noqa: F401  (registers the handlers)
+from .queue import HANDLERS, JOB_TIMEOUT_SECONDS, retry_delay, wakeups
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_concurrency(value: str) -> Dict[str, int]:
+    limits = {}
+    for item in value.split(","):
+        if item.strip():
+            queue, _, limit = item.partition(":")
+            limits[queue.strip()] = int(limit)
+    return limits
+
+
+# Run workers inside each API process. Set to false when running
+# `python -m app.worker` separately.
+JOB_WORKERS_IN_PROCESS = os.getenv("JOB_WORKERS_IN_PROCESS", "true").lower() in ("1", "true", "yes")
+# Jobs run at once per queue and process, e.g. "attachments:2,notifications:8"
+JOB_QUEUE_CONCURRENCY = _parse_concurrency(os.getenv("JOB_QUEUE_CONCURRENCY", ""))
+JOB_DEFAULT_CONCURRENCY = int(os.getenv("JOB_DEFAULT_CONCURRENCY", "4"))
+# Idle queues are polled this often for jobs enqueued by other processes or due for retry
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1.0"))
+# Running jobs get this long to finish on shutdown before they are cancelled and requeued
+JOB_SHUTDOWN_SECONDS = float(os.getenv("JOB_SHUTDOWN_SECONDS", "30"))
+# A job still marked running this long after it was claimed belongs to a dead worker
+JOB_LOCK_SECONDS = float(os.getenv("JOB_LOCK_SECONDS", str(JOB_TIMEOUT_SECONDS * 2)))
+
+_CLAIMED_COLUMNS = (Job.id, Job.queue, Job.name, Job.payload, Job.attempts, Job.max_attempts)
+
+
+async def claim(queue: str, limit: int, worker_id: str) -> List:
+    """Mark up to ``limit`` due jobs as running and return them.
+
+    FOR UPDATE SKIP LOCKED lets any number of workers claim from the same
+    queue at once without blocking on, or double-claiming, each other's rows.
+    """
+    now = datetime.utcnow()
+    due = (
+        select(Job.id)
+        .where(
+            Job.queue == queue,
+            or_(
+                and_(Job.status == JobStatus.QUEUED, Job.run_at <= now),
+                and_(Job.status == JobStatus.RUNNING, Job.locked_at < now - timedelta(seconds=JOB_LOCK_SECONDS)),
+            ),
+        )
+        .order_by(Job.run_at, Job.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    async with SessionLocal() as db:
+        result = await db.execute(
+            update(Job)
+            .where(Job.id.in_(due.scalar_subquery()))
+            .values(status=JobStatus.RUNNING, locked_at=now, locked_by=worker_id, attempts=Job.attempts + 1)
+            .returning(*_CLAIMED_COLUMNS)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = result.all()
+        await db.commit()
+    return claimed
+
+
+async def _reschedule(claimed, error: str, retry: bool) -> None:
+    values = {"locked_at": None, "locked_by": None, "last_error": error[:2000]}
+    if retry:
+        values.update(status=JobStatus.QUEUED, run_at=datetime.utcnow() + timedelta(seconds=retry_delay(claimed.attempts)))
+    else:
+        values.update(status=JobStatus.FAILED)
+    async with SessionLocal() as db:
+        await db.execute(update(Job).where(Job.id == claimed.id).values(**values))
+        await db.commit()
+
+
+async def _release(claimed) -> None:
+    # Interrupted by shutdown, not a failure: run again as soon as possible
+    async with SessionLocal() as db:
+        await db.execute(
+            update(Job).where(Job.id == claimed.id)
+            .values(status=JobStatus.QUEUED, attempts=Job.attempts - 1, run_at=datetime.utcnow(), locked_at=None, locked_by=None)
+        )
+        await db.commit()
+
+
+async def run_job(claimed) -> None:
+    handler = HANDLERS.get(claimed.name)
+    start = perf_counter()
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for job {claimed.name!r}")
+        async with SessionLocal() as db:
+            await asyncio.wait_for(handler.fn(db, claimed.payload), handler.timeout)
+            await db.execute(delete(Job).where(Job.id == claimed.id))
+            await db.commit()
+    except asyncio.CancelledError:
+        await _release(claimed)
+        raise
+    except Exception as exc:
+        retry = handler is not None and claimed.attempts < claimed.max_attempts
+        logger.warning(
+            "Job %s %s failed (attempt %d of %d)%s", claimed.id, claimed.name, claimed.attempts,
+            claimed.max_attempts, "" if retry else ", giving up", exc_info=True,
+        )
+        await _reschedule(claimed, f"{type(exc).__name__}: {exc}", retry)
+        JOBS_FINISHED.inc(claimed.queue, claimed.name, "retried" if retry else "failed")
+    else:
+        JOBS_FINISHED.inc(claimed.queue, claimed.name, "done")
+    finally:
+        JOB_DURATION.observe(claimed.queue, claimed.name, value=perf_counter() - start)
+
+
+class WorkerPool:
+    """One claim loop per queue, each running at most its queue's limit of jobs at a time.
+
+    Loops sleep until a job is committed in this process, one of their jobs
+    finishes, or JOB_POLL_SECONDS pass.
+    """
+
+    def __init__(self, queues: Optional[Iterable[str]] = None):
+        names = set(queues) if queues else {handler.queue for handler in HANDLERS.values()}
+        self.limits = {queue: JOB_QUEUE_CONCURRENCY.get(queue, JOB_DEFAULT_CONCURRENCY) for queue in sorted(names)}
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._running: Dict[str, Set[asyncio.Task]] = {queue: set() for queue in self.limits}
+        self._loops: List[asyncio.Task] = []
+        self._stopping = False
+
+    @property
+    def running(self) -> Dict[str, int]:
+        return {queue: len(tasks) for queue, tasks in self._running.items()}
+
+    async def start(self) -> None:
+        if self._loops:
+            return
+        self._stopping = False
+        for queue, limit in self.limits.items():
+            wakeups[queue] = asyncio.Event()
+            self._loops.append(asyncio.create_task(self._run(queue, limit)))
+        logger.info("Job workers started for %s", ", ".join(f"{q} ({n})" for q, n in self.limits.items()))
+
+    async def stop(self) -> None:
+        """Stop claiming, give running jobs JOB_SHUTDOWN_SECONDS to finish, then requeue the rest."""
+        self._stopping = True
+        for queue in self.limits:
+            wakeups.pop(queue, asyncio.Event()).set()
+        await asyncio.gather(*self._loops, return_exceptions=True)
+        self._loops = []
+        running = [task for tasks in self._running.values() for task in tasks]
+        if running:
+            _, pending = await asyncio.wait(running, timeout=JOB_SHUTDOWN_SECONDS)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _run(self, queue: str, limit: int) -> None:
+        running = self._running[queue]
+        wakeup = wakeups[queue]
+        while not self._stopping:
+            # Cleared before claiming so a commit during the claim isn't missed. A
+            # full claim means the queue may hold more: a finishing job wakes the loop.
+            wakeup.clear()
+            free = limit - len(running)
+            if free > 0:
+                try:
+                    claimed = await claim(queue, free, self.worker_id)
+                except Exception:
+                    logger.warning("Claiming jobs from %s failed", queue, exc_info=True)
+                    claimed = []
+                for row in claimed:
+                    task = asyncio.create_task(run_job(row))
+                    running.add(task)
+                    task.add_done_callback(running.discard)
+                    task.add_done_callback(lambda _: wakeup.set())
+            try:
+                await asyncio.wait_for(wakeup.wait(), JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+
+worker_pool = WorkerPool()
+
+
+@registry.collector
+def _job_metrics():
+    running = Gauge("jobs_running", "Jobs currently running in this process, by queue.", ("queue",))
+    for queue, count in worker_pool.running.items():
+        running.set(queue, value=count)
+    return [running]
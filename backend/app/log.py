@@ -0,0 +1,94 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# "json" for one JSON object per line, "text" for human-readable local output
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+# Log every SQL statement at INFO. Off by default; this is very chatty.
+SQL_ECHO = os.getenv("SQL_ECHO", "false").lower() in ("1", "true", "yes")
+
+# uvicorn attaches an ANSI-coloured copy of its messages as color_message
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName", "color_message"}
+
+_listener: Optional[QueueListener] = None
+
+
+def _extra_fields(record: logging.LogRecord) -> dict:
+    return {
+        key: value for key, value in record.__dict__.items()
+        if key not in _RECORD_ATTRS and not key.startswith("_")
+    }
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON line. Anything passed via ``extra=`` becomes a top-level key."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        data.update(_extra_fields(record))
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable format for local development; extras are appended as key=value."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-5.5s [%(name)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        extras = _extra_fields(record)
+        if extras:
+            line += " " + " ".join(f"{key}={value}" for key, value in extras.items())
+        return line
+
+
+def configure_logging() -> None:
+    """Route all app logging through a queue drained by a background thread.
+
+    Request handlers only pay for a queue put. Formatting and the write to
+    stdout happen on the listener thread.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == "text":
+        handler.setFormatter(TextFormatter())
+    else:
+        handler.setFormatter(JsonFormatter())
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger()
+    root.handlers = [_DeferredFormatQueueHandler(log_queue)]
+    root.setLevel(LOG_LEVEL)
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO if SQL_ECHO else logging.WARNING)
+
+
+class _DeferredFormatQueueHandler(QueueHandler):
+    # The stock QueueHandler fully formats the record on the calling thread and
+    # drops exc_info. Only merge the message args here (they may reference
+    # objects that change after the call) and let the listener do the rest.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
@@ -1,13 +1,48 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 import os
 
+from app.log import configure_logging
+from app.database import engine
+from app.middleware import RequestTimingMiddleware, instrument_engine
+from app.metrics import registry
+from app.replicas import PRIMARY_UNTIL_HEADER, ReadYourWritesMiddleware, replicas
+from app.storage import UploadLimitMiddleware
 from app.auth.router import router as auth_router
 from app.projects.router import router as projects_router
-from app.tickets.router import router as tickets_router
+from app.tickets.router import router as tickets_router, me_router
+from app.realtime.router import router as realtime_router
+from app.realtime.hub import hub
+from app.tickets.activity import activity_writer
+from app.jobs.worker import JOB_WORKERS_IN_PROCESS, worker_pool
+from app.auth.hashing import hashing_pool
+from app.warmup import warm_up
 
-app = FastAPI(title="Bug Tracker API")
+configure_logging()
+instrument_engine(engine)
+for replica in replicas.replicas:
+    instrument_engine(replica.engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_up()
+    await replicas.start()
+    await hub.start()
+    await activity_writer.start()
+    if JOB_WORKERS_IN_PROCESS:
+        await worker_pool.start()
+    yield
+    await worker_pool.stop()
+    await activity_writer.stop()
+    await hub.stop()
+    await replicas.stop()
+    hashing_pool.shutdown()
+    await engine.dispose()
+
+app = FastAPI(title="Bug Tracker API", lifespan=lifespan)
 
 # Get allowed origins from environment variable or use defaults
 allowed_origins_str = os.getenv(
@@ -16,19 +51,30 @@ allowed_origins_str = os.getenv(
 )
 allowed_origins = [origin.strip() for origin in allowed_origins_str.split(",")]
 
+# Inside CORS so early 413s still carry the CORS headers
+app.add_middleware(UploadLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allowed_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", PRIMARY_UNTIL_HEADER],
 )
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(RequestTimingMiddleware)
 
 
 app.include_router(auth_router)
 app.include_router(projects_router)
 app.include_router(tickets_router)
+app.include_router(me_router)
+app.include_router(realtime_router)
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Bug Tracker API"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,158 @@
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Minimal Prometheus text-format metrics.
+#
+# Every update happens on the event loop thread (request middleware, pool
+# checkouts inside SQLAlchemy's greenlets, hashing pool completions), so the
+# hot path is a dict lookup and an add with no locking. Gauges that mirror
+# state owned elsewhere (pool usage, hashing queue) are read at scrape time
+# through collectors instead of being kept up to date on every change.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels: str, value: float) -> None:
+        self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Labels, List[float]] = {}
+
+    def observe(self, *labels: str, value: float) -> None:
+        state = self._values.get(labels)
+        if state is None:
+            state = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, state in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _format_value(bound)
+                bucket_labels = _format_labels(self.labelnames, labels, 'le="%s"' % le)
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(state[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[_Metric]]] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def collector(self, fn: Callable[[], Iterable[_Metric]]):
+        """Register a function that builds metrics from live state at scrape time."""
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collect in self._collectors:
+            for metric in collect():
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUESTS = registry.register(Counter(
+    "http_requests_total", "HTTP requests handled.", ("method", "route", "status")))
+HTTP_REQUEST_DURATION = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency.", ("method", "route")))
+HTTP_REQUESTS_IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled."))
+DB_STATEMENTS = registry.register(Counter(
+    "db_statements_total", "SQL statements executed, by route.", ("method", "route")))
+DB_STATEMENT_SECONDS = registry.register(Counter(
+    "db_statement_seconds_total", "Time spent executing SQL statements, by route.", ("method", "route")))
+DB_READ_SESSIONS = registry.register(Counter(
+    "db_read_sessions_total", "Sessions opened for read-only endpoints, by target (primary or replica).", ("target",)))
+DB_POOL_WAIT = registry.register(Histogram(
+    "db_pool_wait_seconds", "Time spent waiting to check out a pooled connection.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)))
+PASSWORD_HASH_DURATION = registry.register(Histogram(
+    "password_hash_duration_seconds", "bcrypt hash/verify time on the hashing pool.",
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0)))
+PASSWORD_HASH_WAIT = registry.register(Histogram(
+    "password_hash_wait_seconds", "Time bcrypt calls waited for a hashing pool thread."))
+REALTIME_EVENTS = registry.register(Counter(
+    "realtime_events_total", "Ticket and comment events dispatched to realtime subscribers.", ("type",)))
+REALTIME_RESYNCS = registry.register(Counter(
+    "realtime_resyncs_total", "Realtime outboxes that overflowed and were replaced by a resync."))
+ACTIVITY_WRITTEN = registry.register(Counter(
+    "ticket_activity_written_total", "Ticket activity entries inserted by the batched writer."))
+ACTIVITY_DROPPED = registry.register(Counter(
+    "ticket_activity_dropped_total", "Ticket activity entries dropped because the queue was full or writes kept failing."))
+JOBS_FINISHED = registry.register(Counter(
+    "jobs_finished_total", "Background job runs, by outcome (done, retried, failed).", ("queue", "name", "outcome")))
+JOB_DURATION = registry.register(Histogram(
+    "job_duration_seconds", "Background job run time, including failed runs.", ("queue", "name")))
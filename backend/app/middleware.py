@@ -0,0 +1,96 @@
+import logging
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .metrics import HTTP_REQUESTS, HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_FLIGHT, DB_STATEMENTS, DB_STATEMENT_SECONDS
+
+logger = logging.getLogger("app.requests")
+
+
+class QueryStats:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+# Statement count and time of the request being handled. SQLAlchemy runs the
+# driver calls in a greenlet that shares the caller's context, so the cursor
+# events below see the same object.
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = perf_counter() - conn.info["query_start"].pop()
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class RequestTimingMiddleware:
+    """Emits one structured log line and the request metrics per HTTP request.
+
+    Written as plain ASGI rather than BaseHTTPMiddleware so it adds no extra
+    task or body buffering to each request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        status_code = 500
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = perf_counter() - start
+            current_query_stats.reset(token)
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            method = scope["method"]
+            route = scope.get("route")
+            # Unmatched paths share one label so scanners can't blow up cardinality
+            route_label = getattr(route, "path", "<unmatched>")
+            HTTP_REQUESTS.inc(method, route_label, str(status_code))
+            HTTP_REQUEST_DURATION.observe(method, route_label, value=duration)
+            DB_STATEMENTS.inc(method, route_label, amount=stats.count)
+            DB_STATEMENT_SECONDS.inc(method, route_label, amount=stats.seconds)
+            logger.info(
+                "request",
+                extra={
+                    "method": method,
+                    "route": getattr(route, "path", scope["path"]),
+                    "status": status_code,
+                    "duration_ms": round(duration * 1000, 2),
+                    "db_ms": round(stats.seconds * 1000, 2),
+                    "db_queries": stats.count,
+                },
+            )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Enum, DateTime, Table
+from sqlalchemy import Column, Integer, BigInteger, String, Text, ForeignKey, Enum, DateTime, Table, Index, JSON
 from sqlalchemy.orm import relationship, backref
 from datetime import datetime
 import enum
@@ -26,10 +26,15 @@ class TicketType(enum.Enum):
     TASK = "task"
     FEATURE = "feature"
 
+class JobStatus(enum.Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    FAILED = "failed"
+
 workspace_members = Table(
     "workspace_members",
     Base.metadata,
-    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column("user_id", Integer, ForeignKey("users.id"), primary_key=True, index=True),
     Column("workspace_id", Integer, ForeignKey("workspaces.id"), primary_key=True),
     Column("joined_at", DateTime, default=datetime.utcnow)
 )
@@ -42,6 +47,8 @@ class User(Base):
     full_name = Column(String, nullable=True)
     role = Column(Enum(UserRole), default=UserRole.MEMBER)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Bumped whenever the profile embedded in other responses changes; feeds ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     
     owned_workspaces = relationship("Workspace", back_populates="owner")
     collaborated_workspaces = relationship("Workspace", secondary=workspace_members, back_populates="members")
@@ -55,6 +62,8 @@ class Workspace(Base):
     description = Column(String, nullable=True)
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Bumped whenever the workspace's members or projects change; feeds ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     owner = relationship("User", back_populates="owned_workspaces")
     members = relationship("User", secondary=workspace_members, back_populates="collaborated_workspaces")
@@ -66,8 +75,11 @@ class Project(Base):
     name = Column(String, nullable=False)
     description = Column(String, nullable=True)
     image_url = Column(String, nullable=True)
-    workspace_id = Column(Integer, ForeignKey("workspaces.id"), nullable=False)
+    workspace_id = Column(Integer, ForeignKey("workspaces.id"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Bumped when the ticket listing changes without any ticket's updated_at
+    # moving (rank rebalancing, attachment processing); feeds ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     workspace = relationship("Workspace", back_populates="projects")
     tickets = relationship("Ticket", back_populates="project", cascade="all, delete-orphan")
@@ -84,11 +96,28 @@ class Ticket(Base):
     assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # Position within the board column (project, status); see app/tickets/ranking.py.
+    # Compared bytewise, so Postgres uses the "C" collation whatever the database default.
+    board_rank = Column(String(64).with_variant(String(64, collation="C"), "postgresql"), nullable=False)
+    # On Postgres the table also has a generated, GIN-indexed "search_vector"
+    # column (see app/tickets/search.py). It is left unmapped to keep the model portable.
 
     project = relationship("Project", back_populates="tickets")
     assignee = relationship("User", back_populates="assigned_tickets")
-    comments = relationship("Comment", back_populates="ticket", cascade="all, delete-orphan")
-    attachments = relationship("Attachment", back_populates="ticket", cascade="all, delete-orphan")
+    # Ordered by id, as the FAST_JSON_RESPONSES path (tickets/rows.py) lists them
+    comments = relationship("Comment", back_populates="ticket", cascade="all, delete-orphan", order_by="Comment.id")
+    attachments = relationship("Attachment", back_populates="ticket", cascade="all, delete-orphan", order_by="Attachment.id")
+
+    __table_args__ = (
+        Index("ix_tickets_project_id_status", "project_id", "status"),
+        Index("ix_tickets_project_id_priority", "project_id", "priority"),
+        # Board listing keyset (updated_at desc, id desc) and the listing ETag
+        Index("ix_tickets_project_id_updated_at", "project_id", "updated_at", "id"),
+        # "My work" across workspaces (GET /me/tickets); also serves assignee_id-only lookups
+        Index("ix_tickets_assignee_id_status_updated_at", "assignee_id", "status", "updated_at", "id"),
+        # Board column order, and the neighbour lookups when a card is moved
+        Index("ix_tickets_project_id_status_board_rank", "project_id", "status", "board_rank"),
+    )
 
 class Comment(Base):
     __tablename__ = "comments"
@@ -96,20 +125,75 @@ class Comment(Base):
     content = Column(String, nullable=False)
     ticket_id = Column(Integer, ForeignKey("tickets.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    parent_id = Column(Integer, ForeignKey("comments.id"), nullable=True)
+    parent_id = Column(Integer, ForeignKey("comments.id"), nullable=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     ticket = relationship("Ticket", back_populates="comments")
     author = relationship("User", back_populates="comments")
     # Using a string reference for remote_side to be safe with name resolution
-    replies = relationship("Comment", backref=backref("parent", remote_side="Comment.id"), cascade="all, delete-orphan")
+    replies = relationship("Comment", backref=backref("parent", remote_side="Comment.id"), cascade="all, delete-orphan", order_by="Comment.id")
+
+    __table_args__ = (
+        Index("ix_comments_ticket_id_parent_id", "ticket_id", "parent_id"),
+    )
 
 class Attachment(Base):
     __tablename__ = "attachments"
     id = Column(Integer, primary_key=True, index=True)
     file_name = Column(String, nullable=False)
     file_url = Column(String, nullable=False)
-    ticket_id = Column(Integer, ForeignKey("tickets.id"), nullable=False)
+    ticket_id = Column(Integer, ForeignKey("tickets.id"), nullable=False, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Content lives in app/storage.py's content-addressed store; null for legacy rows
+    sha256 = Column(String(64), nullable=True, index=True)
+    size = Column(BigInteger, nullable=True)
+    content_type = Column(String, nullable=True)
 
     ticket = relationship("Ticket", back_populates="attachments")
+
+class TicketCount(Base):
+    # Per-status ticket totals, kept in step with ticket writes by app/tickets/counters.py
+    __tablename__ = "ticket_counts"
+    workspace_id = Column(Integer, ForeignKey("workspaces.id", ondelete="CASCADE"), primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(Enum(TicketStatus), primary_key=True)
+    ticket_count = Column(Integer, nullable=False, default=0)
+
+class TicketActivity(Base):
+    # Append-only change history, written in batches by app/tickets/activity.py.
+    # No foreign keys on ticket/project so the history outlives deleted tickets.
+    __tablename__ = "ticket_activity"
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    ticket_id = Column(Integer, nullable=False)
+    project_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    action = Column(String(32), nullable=False)
+    # {field: [old, new]} for updates, null otherwise
+    changes = Column(JSON, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_ticket_activity_ticket_id_created_at", "ticket_id", "created_at", "id"),
+    )
+
+class Job(Base):
+    # Background work claimed by app/jobs/worker.py. Rows are deleted once the
+    # job succeeds; failed ones are kept with their last error.
+    __tablename__ = "jobs"
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    queue = Column(String(64), nullable=False)
+    name = Column(String(128), nullable=False)
+    payload = Column(JSON, nullable=False, default=dict)
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.QUEUED)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    # Not claimed before this time; pushed back by the retry backoff
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_at = Column(DateTime, nullable=True)
+    locked_by = Column(String(128), nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_jobs_queue_status_run_at", "queue", "status", "run_at"),
+    )
@@ -0,0 +1,40 @@
+import logging
+import os
+import smtplib
+from email.message import EmailMessage
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# Outgoing mail. Without SMTP_HOST notifications are only logged.
+SMTP_HOST = os.getenv("SMTP_HOST", "")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_USER = os.getenv("SMTP_USER", "")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() in ("1", "true", "yes")
+SMTP_FROM = os.getenv("SMTP_FROM", "bugtracker@localhost")
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "10"))
+
+
+def _send(message: EmailMessage) -> None:
+    with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT) as smtp:
+        if SMTP_STARTTLS:
+            smtp.starttls()
+        if SMTP_USER:
+            smtp.login(SMTP_USER, SMTP_PASSWORD)
+        smtp.send_message(message)
+
+
+async def send_email(to: str, subject: str, body: str) -> None:
+    """Send a plain-text email. Errors propagate so the calling job is retried."""
+    if not SMTP_HOST:
+        logger.info("Email not sent (SMTP_HOST unset)", extra={"to": to, "subject": subject})
+        return
+    message = EmailMessage()
+    message["From"] = SMTP_FROM
+    message["To"] = to
+    message["Subject"] = subject
+    message.set_content(body)
+    # smtplib blocks; keep it off the event loop
+    await run_in_threadpool(_send, message)
@@ -0,0 +1,33 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+# Keyset cursors are opaque to clients: a urlsafe base64 encoding of the sort
+# key of the last row on the previous page. Datetimes are tagged so they can be
+# restored exactly for the next comparison.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(*values) -> str:
+    parts = [{"dt": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(parts, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], size: int) -> Optional[Tuple]:
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        parts = json.loads(raw)
+        if not isinstance(parts, list) or len(parts) != size:
+            raise ValueError("wrong cursor size")
+        return tuple(
+            datetime.fromisoformat(p["dt"]) if isinstance(p, dict) else p
+            for p in parts
+        )
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
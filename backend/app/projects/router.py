@@ -1,15 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from typing import List
+from typing import List, Literal, Optional
 from ..database import get_db
-from sqlalchemy import func
-from ..models import Workspace, Project, User, workspace_members, Ticket, TicketStatus
+from ..replicas import get_read_db
+from sqlalchemy import delete, func, insert, or_, update
+from ..models import Workspace, Project, User, workspace_members, Ticket, TicketStatus, TicketPriority, TicketCount
 from ..schemas import WorkspaceCreate, WorkspaceResponse, ProjectCreate, ProjectResponse, MemberAdd, UserResponse
 from ..auth.router import get_current_user
+from ..auth.access import require_workspace_access, forget_user_access, forget_project, forget_workspace
+from ..etag import make_etag, etag_matches, not_modified, set_etag
+from ..serialization import FAST_JSON_RESPONSES, model_json_response
+from ..jobs.handlers import notify_member_added
+from ..jobs.queue import enqueue
+from .export import MEDIA_TYPES, export_query, parse_columns, stream_export
 
 router = APIRouter(prefix="/workspaces", tags=["workspaces"])
+logger = logging.getLogger(__name__)
+
+async def _bump_version(db: AsyncSession, workspace_id: int):
+    await db.execute(update(Workspace).where(Workspace.id == workspace_id).values(version=Workspace.version + 1))
 
 # Workspace Endpoints
 @router.post("/", response_model=WorkspaceResponse)
@@ -34,14 +48,33 @@ async def create_workspace(workspace_in: WorkspaceCreate, db: AsyncSession = Dep
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
 @router.get("/", response_model=List[WorkspaceResponse])
-async def list_workspaces(db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def list_workspaces(request: Request, response: Response, db: AsyncSession = Depends(get_read_db), current_user: User = Depends(get_current_user)):
     # Get owned workspaces and workspaces where user is a member
+    visible = (Workspace.owner_id == current_user.id) | (Workspace.members.any(id=current_user.id))
+    # Members' profiles are embedded, so their versions count too
+    member_versions = (
+        select(func.coalesce(func.sum(User.version), 0))
+        .join(workspace_members, workspace_members.c.user_id == User.id)
+        .where(workspace_members.c.workspace_id == Workspace.id)
+        .correlate(Workspace)
+        .scalar_subquery()
+    )
+    versions = await db.execute(
+        select(Workspace.id, Workspace.version, member_versions).where(visible).order_by(Workspace.id)
+    )
+    etag = make_etag(versions.all())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
     # Using selectinload for members to avoid lazy load issues with async
     result = await db.execute(
         select(Workspace)
-        .where((Workspace.owner_id == current_user.id) | (Workspace.members.any(id=current_user.id)))
+        .where(visible)
         .options(selectinload(Workspace.members))
     )
+    if FAST_JSON_RESPONSES:
+        return model_json_response(List[WorkspaceResponse], result.scalars().all(), response)
     return result.scalars().all()
 
 # Member Management
@@ -68,34 +101,23 @@ async def add_workspace_member(workspace_id: int, member_in: MemberAdd, db: Asyn
         raise HTTPException(status_code=400, detail="User is already a member")
     
     db_workspace.members.append(user_to_add)
+    await _bump_version(db, workspace_id)
+    # The email goes out from the job queue once this commits
+    enqueue(db, notify_member_added, {"workspace_id": workspace_id, "user_id": user_to_add.id, "added_by_id": current_user.id})
     await db.commit()
+    forget_user_access(user_to_add.id)
     return {"message": f"User {member_in.email} added to workspace"}
 
-@router.get("/{workspace_id}/members", response_model=List[UserResponse])
-async def list_workspace_members(workspace_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    # Check if user is owner or member
-    ws_result = await db.execute(
-        select(Workspace)
-        .where(Workspace.id == workspace_id)
-        .where((Workspace.owner_id == current_user.id) | (Workspace.members.any(id=current_user.id)))
-    )
-    db_workspace = ws_result.scalars().first()
-    if not db_workspace:
-        raise HTTPException(status_code=404, detail="Workspace not found or no access")
-    
-    # Load members explicitly
+@router.get("/{workspace_id}/members", response_model=List[UserResponse], dependencies=[Depends(require_workspace_access)])
+async def list_workspace_members(workspace_id: int, db: AsyncSession = Depends(get_read_db)):
+    # Members plus the owner, who can also be assigned tickets
     result = await db.execute(
-        select(User).join(workspace_members).where(workspace_members.c.workspace_id == workspace_id)
+        select(User).where(or_(
+            User.id.in_(select(workspace_members.c.user_id).where(workspace_members.c.workspace_id == workspace_id)),
+            User.id == select(Workspace.owner_id).where(Workspace.id == workspace_id).scalar_subquery(),
+        ))
     )
-    members = result.scalars().all()
-    
-    # Also include owner in the list of people who can be assigned
-    owner_result = await db.execute(select(User).where(User.id == db_workspace.owner_id))
-    owner = owner_result.scalars().first()
-    if owner and owner not in members:
-        members.append(owner)
-        
-    return members
+    return result.scalars().all()
 
 @router.delete("/{workspace_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_workspace(workspace_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
@@ -104,78 +126,84 @@ async def delete_workspace(workspace_id: int, db: AsyncSession = Depends(get_db)
     if not db_workspace:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workspace not found or not owned by you")
     
+    # Not every backend enforces the ON DELETE CASCADE on the counters
+    await db.execute(delete(TicketCount).where(TicketCount.workspace_id == workspace_id))
     await db.delete(db_workspace)
     await db.commit()
+    forget_workspace()
     return None
 
-@router.get("/{workspace_id}/projects", response_model=List[ProjectResponse])
-async def list_workspace_projects(workspace_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    # Verify ownership or membership
-    ws_result = await db.execute(
-        select(Workspace)
-        .where(Workspace.id == workspace_id)
-        .where((Workspace.owner_id == current_user.id) | (Workspace.members.any(id=current_user.id)))
-    )
-    if not ws_result.scalars().first():
-        raise HTTPException(status_code=404, detail="Workspace not found or access denied")
+@router.get("/{workspace_id}/projects", response_model=List[ProjectResponse], dependencies=[Depends(require_workspace_access)])
+async def list_workspace_projects(workspace_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_read_db)):
+    version = await db.execute(select(Workspace.version).where(Workspace.id == workspace_id))
+    etag = make_etag(workspace_id, version.scalar())
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
 
     result = await db.execute(select(Project).where(Project.workspace_id == workspace_id))
     return result.scalars().all()
 
 # Project Endpoints
-@router.post("/{workspace_id}/projects", response_model=ProjectResponse)
+@router.post("/{workspace_id}/projects", response_model=ProjectResponse, dependencies=[Depends(require_workspace_access)])
 async def create_project(workspace_id: int, project_in: ProjectCreate, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    print(f"\n{'='*50}\n[API] CREATE PROJECT CALLED\nWorkspace: {workspace_id}\nUser: {current_user.email}\n{'='*50}\n")
-    # Verify workspace exists and belongs to user or user is a member
-    workspace_result = await db.execute(
-        select(Workspace)
-        .where(Workspace.id == workspace_id)
-        .where((Workspace.owner_id == current_user.id) | (Workspace.members.any(id=current_user.id)))
+    logger.debug("create_project workspace=%s user=%s", workspace_id, current_user.id)
+    # INSERT ... RETURNING gives back the full row; no refetch after commit
+    result = await db.execute(
+        insert(Project)
+        .values(**{**project_in.dict(), "workspace_id": workspace_id})
+        .returning(*Project.__table__.columns)
     )
-    if not workspace_result.scalars().first():
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workspace not found or access denied")
-    
-    db_project = Project(**project_in.dict())
-    db_project.workspace_id = workspace_id
-    db.add(db_project)
-    await db.flush()
-    project_id = db_project.id
+    row = result.mappings().one()
+    await _bump_version(db, workspace_id)
     await db.commit()
-    
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    return result.scalars().first()
-
-@router.get("/{workspace_id}/stats")
-async def get_workspace_stats(workspace_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
-    # Verify access
-    ws_result = await db.execute(
-        select(Workspace)
-        .where(Workspace.id == workspace_id)
-        .where((Workspace.owner_id == current_user.id) | (Workspace.members.any(id=current_user.id)))
-    )
-    if not ws_result.scalars().first():
-        raise HTTPException(status_code=404, detail="Workspace not found or access denied")
+    return ProjectResponse(**row)
 
-    # Get project count
+@router.get("/{workspace_id}/stats", dependencies=[Depends(require_workspace_access)])
+async def get_workspace_stats(workspace_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_read_db)):
     project_count_res = await db.execute(select(func.count(Project.id)).where(Project.workspace_id == workspace_id))
     project_count = project_count_res.scalar()
 
-    # Get ticket counts by status workspace-wide
+    # Ticket counts come from the per-project counters, not a scan of every ticket
     ticket_stats_res = await db.execute(
-        select(Ticket.status, func.count(Ticket.id))
-        .join(Project)
-        .where(Project.workspace_id == workspace_id)
-        .group_by(Ticket.status)
+        select(TicketCount.status, func.sum(TicketCount.ticket_count))
+        .where(TicketCount.workspace_id == workspace_id)
+        .group_by(TicketCount.status)
     )
     
-    status_counts = {status.value: count for status, count in ticket_stats_res.all()}
+    status_counts = {status.value: count for status, count in ticket_stats_res.all() if count}
     
+    # Cheap enough to compute every time; the ETag only saves the transfer
+    etag = make_etag(project_count, sorted(status_counts.items()))
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
     return {
         "project_count": project_count,
         "total_tickets": sum(status_counts.values()),
         "status_counts": status_counts
     }
 
+@router.get("/{workspace_id}/export", dependencies=[Depends(require_workspace_access)])
+async def export_workspace_tickets(
+    workspace_id: int,
+    format: Literal["ndjson", "csv"] = "ndjson",
+    columns: Optional[str] = Query(None, description="Comma-separated column names; all columns by default"),
+    status: Optional[List[TicketStatus]] = Query(None),
+    priority: Optional[List[TicketPriority]] = Query(None),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+):
+    # Every ticket in the workspace, streamed from a server-side cursor
+    names = parse_columns(columns)
+    query = export_query(workspace_id, names, status, priority, created_after, created_before)
+    return StreamingResponse(
+        stream_export(query, names, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="workspace-{workspace_id}-tickets.{format}"'},
+    )
+
 @router.delete("/{workspace_id}/projects/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_project(workspace_id: int, project_id: int, db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)):
     # Verify the workspace is owned by the user
@@ -188,6 +216,9 @@ async def delete_project(workspace_id: int, project_id: int, db: AsyncSession =
     if not db_project:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
+    await db.execute(delete(TicketCount).where(TicketCount.project_id == project_id))
     await db.delete(db_project)
+    await _bump_version(db, workspace_id)
     await db.commit()
+    forget_project(project_id)
     return None
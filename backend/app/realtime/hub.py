@@ -0,0 +1,208 @@
+import asyncio
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..database import DATABASE_URL, IS_POSTGRES
+from ..metrics import registry, Gauge, REALTIME_EVENTS, REALTIME_RESYNCS
+
+logger = logging.getLogger(__name__)
+
+# Ticket and comment changes are published on this NOTIFY channel so every
+# worker process can fan them out to its own WebSocket connections.
+CHANNEL = "ticket_events"
+# LISTEN needs a session-level connection; behind pgbouncer in transaction
+# mode point this at Postgres directly.
+REALTIME_LISTEN_URL = os.getenv("REALTIME_LISTEN_URL", DATABASE_URL)
+# Events buffered per connection before it is told to resync instead
+REALTIME_MAX_PENDING = int(os.getenv("REALTIME_MAX_PENDING", "256"))
+# NOTIFY payloads are capped at 8000 bytes; larger events go out without "data"
+_MAX_PAYLOAD_BYTES = 7900
+_KEEPALIVE_SECONDS = 30
+
+RESYNC = {"type": "resync"}
+_RESYNC_KEY = ("resync", None)
+
+
+def row_data(obj) -> dict:
+    """Column values of an ORM object, without relationships."""
+    return {column.key: getattr(obj, column.key) for column in obj.__table__.columns}
+
+
+class Subscriber:
+    """Outbox for one connection.
+
+    Events for the same object are coalesced so a slow client only gets the
+    latest state. If the outbox still overflows it is replaced by a single
+    resync event and the client refetches.
+    """
+
+    def __init__(self, project_id: int, max_pending: int = REALTIME_MAX_PENDING):
+        self.project_id = project_id
+        self.max_pending = max_pending
+        self._pending: "OrderedDict[tuple, dict]" = OrderedDict()
+        self._ready = asyncio.Event()
+
+    def push(self, event: dict) -> None:
+        if _RESYNC_KEY in self._pending:
+            # The client refetches everything anyway
+            return
+        key = (event["type"].split(".")[0], event.get("id"))
+        previous = self._pending.pop(key, None)
+        if previous is not None and previous["type"] == "ticket.created" and event["type"] == "ticket.updated":
+            event = {**event, "type": "ticket.created"}
+        if key == _RESYNC_KEY or len(self._pending) >= self.max_pending:
+            if key != _RESYNC_KEY:
+                REALTIME_RESYNCS.inc()
+            self._pending.clear()
+            self._pending[_RESYNC_KEY] = RESYNC
+        else:
+            self._pending[key] = event
+        self._ready.set()
+
+    async def next_batch(self) -> List[dict]:
+        await self._ready.wait()
+        self._ready.clear()
+        events = list(self._pending.values())
+        self._pending.clear()
+        return events
+
+
+class Hub:
+    """Per-process registry of project subscribers.
+
+    On Postgres events arrive through LISTEN (including this process's own
+    publishes); elsewhere they are dispatched locally after commit.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[int, Set[Subscriber]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def connections(self) -> int:
+        return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def subscribe(self, project_id: int) -> Subscriber:
+        subscriber = Subscriber(project_id)
+        self._subscribers.setdefault(project_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        subscribers = self._subscribers.get(subscriber.project_id)
+        if subscribers is not None:
+            subscribers.discard(subscriber)
+            if not subscribers:
+                del self._subscribers[subscriber.project_id]
+
+    def dispatch(self, event: dict) -> None:
+        REALTIME_EVENTS.inc(event["type"])
+        for subscriber in self._subscribers.get(event.get("project_id"), ()):
+            subscriber.push(event)
+
+    def resync_all(self) -> None:
+        for subscribers in self._subscribers.values():
+            for subscriber in subscribers:
+                subscriber.push(RESYNC)
+
+    async def start(self) -> None:
+        if IS_POSTGRES and self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            self.dispatch(json.loads(payload))
+        except (ValueError, KeyError):
+            logger.warning("Dropping malformed realtime event")
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        dsn = make_url(REALTIME_LISTEN_URL).set(drivername="postgresql").render_as_string(hide_password=False)
+        delay = 1
+        connected_before = False
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(CHANNEL, self._on_notify)
+                logger.info("Listening for realtime events")
+                if connected_before:
+                    # Anything published while we were disconnected is gone
+                    self.resync_all()
+                connected_before = True
+                delay = 1
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), _KEEPALIVE_SECONDS)
+                    except asyncio.TimeoutError:
+                        await connection.execute("SELECT 1")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Realtime listener connection lost", exc_info=True)
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close(timeout=5)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+
+
+hub = Hub()
+
+
+async def publish(db: AsyncSession, project_id: int, event_type: str, object_id: Optional[int], data: Optional[dict] = None) -> None:
+    """Queue an event that is delivered only if the surrounding transaction commits.
+
+    Flush first when ``object_id`` or ``data`` depend on generated values.
+    """
+    event = {"type": event_type, "project_id": project_id, "id": object_id}
+    if data is not None:
+        event["data"] = jsonable_encoder(data)
+    payload = json.dumps(event)
+    if len(payload.encode()) > _MAX_PAYLOAD_BYTES:
+        del event["data"]
+        payload = json.dumps(event)
+
+    if IS_POSTGRES:
+        # NOTIFY is transactional: listeners see it at commit, never on rollback
+        await db.execute(select(func.pg_notify(CHANNEL, payload)))
+    else:
+        db.sync_session.info.setdefault("realtime_events", []).append(event)
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch_committed(session):
+    for pending in session.info.pop("realtime_events", ()):
+        hub.dispatch(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop("realtime_events", None)
+
+
+@registry.collector
+def _realtime_metrics():
+    connections = Gauge("realtime_connections", "Open realtime WebSocket connections.")
+    connections.set(value=hub.connections)
+    return [connections]
@@ -0,0 +1,41 @@
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect, status
+from ..database import SessionLocal
+from ..auth.router import get_current_user
+from ..auth.access import resolve_workspace_access
+from .hub import hub
+
+router = APIRouter(tags=["realtime"])
+
+async def _send_events(websocket: WebSocket, subscriber):
+    while True:
+        for event in await subscriber.next_batch():
+            await websocket.send_json(event)
+
+@router.websocket("/ws/projects/{project_id}")
+async def project_events(websocket: WebSocket, project_id: int, token: str = Query(...)):
+    # Browsers can't set headers on a WebSocket handshake, so the token comes in the query string.
+    # The session is only held for the handshake, not for the life of the connection.
+    async with SessionLocal() as db:
+        try:
+            user = await get_current_user(token, db)
+        except HTTPException:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        workspace_id = await resolve_workspace_access(db, user, project_id=project_id)
+    if workspace_id is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    subscriber = hub.subscribe(project_id)
+    sender = asyncio.create_task(_send_events(websocket, subscriber))
+    try:
+        # Clients don't send anything; receiving just notices the disconnect
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        hub.unsubscribe(subscriber)
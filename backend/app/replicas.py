@@ -0,0 +1,228 @@
+import asyncio
+import hashlib
+import itertools
+import logging
+import os
+import time
+from typing import List, Optional
+
+from fastapi import Request
+from starlette.datastructures import Headers, MutableHeaders
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from .cache import TTLCache
+from .database import DATABASE_REPLICA_URLS, SessionLocal, create_engine_from_settings, warm_up_pool
+from .metrics import registry, Gauge, DB_READ_SESSIONS
+
+logger = logging.getLogger(__name__)
+
+# After a client's successful write its reads stay on the primary for this
+# long, so it never reads a replica that hasn't replayed the write yet
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+READ_YOUR_WRITES_MAX_ENTRIES = int(os.getenv("READ_YOUR_WRITES_MAX_ENTRIES", "10000"))
+# Set on write responses to the Unix time until which the client reads from
+# the primary; clients send it back on later requests. Whichever worker gets
+# the next request honours it, which the per-worker pin alone can't do under
+# python -m app.server.
+PRIMARY_UNTIL_HEADER = "X-Primary-Until"
+# Replicas are probed this often; one that errors, times out or lags by more
+# than REPLICA_MAX_LAG_SECONDS gets no reads until a later probe succeeds
+REPLICA_HEALTH_INTERVAL = float(os.getenv("REPLICA_HEALTH_INTERVAL", "5"))
+REPLICA_HEALTH_TIMEOUT = float(os.getenv("REPLICA_HEALTH_TIMEOUT", "2"))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "10"))
+
+# Seconds since the last replayed transaction, or 0 when the replica has
+# replayed everything it received (an idle primary would otherwise look like lag)
+_PG_LAG = text(
+    "SELECT CASE"
+    " WHEN NOT pg_is_in_recovery() THEN 0"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+
+class Replica:
+    def __init__(self, url: str):
+        parsed = make_url(url)
+        self.name = f"{parsed.host}:{parsed.port or 5432}/{parsed.database}" if parsed.host else str(parsed.database)
+        self.is_postgres = parsed.get_backend_name() == "postgresql"
+        self.engine = create_engine_from_settings(url)
+        self.sessionmaker = async_sessionmaker(bind=self.engine, class_=AsyncSession, expire_on_commit=False)
+        self.healthy = True
+        self.lag = 0.0
+
+    def mark_down(self, reason: str) -> None:
+        if self.healthy:
+            logger.warning("Read replica %s marked unhealthy: %s", self.name, reason)
+        self.healthy = False
+
+    async def check(self) -> None:
+        try:
+            async with self.engine.connect() as conn:
+                query = _PG_LAG if self.is_postgres else text("SELECT 0")
+                lag = float((await asyncio.wait_for(conn.execute(query), REPLICA_HEALTH_TIMEOUT)).scalar() or 0)
+        except Exception as exc:
+            self.mark_down(f"{type(exc).__name__}: {exc}")
+            return
+        self.lag = lag
+        if lag > REPLICA_MAX_LAG_SECONDS:
+            self.mark_down(f"{lag:.1f}s behind")
+        elif not self.healthy:
+            logger.info("Read replica %s is healthy again", self.name)
+            self.healthy = True
+
+
+class ReplicaSet:
+    """Read replicas chosen round-robin among the ones that passed their last health check.
+
+    With no replicas configured (or none healthy) every read goes to the primary.
+    """
+
+    def __init__(self, urls: List[str]):
+        self.replicas = [Replica(url) for url in urls]
+        self._turn = itertools.count()
+        # Per worker, for clients that don't echo PRIMARY_UNTIL_HEADER: their
+        # next read may land on another worker and hit a replica, within
+        # REPLICA_MAX_LAG_SECONDS of the write
+        self._pinned = TTLCache(READ_YOUR_WRITES_MAX_ENTRIES, READ_YOUR_WRITES_SECONDS)
+        self._task: Optional[asyncio.Task] = None
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    @staticmethod
+    def client_key(authorization: Optional[str]) -> Optional[bytes]:
+        """Identifies the client by its Authorization header (hashed, so tokens aren't kept in memory)."""
+        if not authorization:
+            return None
+        return hashlib.blake2b(authorization.encode(), digest_size=16).digest()
+
+    def pin(self, key: Optional[bytes]) -> None:
+        if key is not None:
+            self._pinned.set(key, True)
+
+    def is_pinned(self, key: Optional[bytes]) -> bool:
+        return key is not None and self._pinned.get(key, False)
+
+    @staticmethod
+    def primary_until() -> str:
+        return f"{time.time() + READ_YOUR_WRITES_SECONDS:.3f}"
+
+    @staticmethod
+    def echoes_pin(value: Optional[str]) -> bool:
+        """Whether an echoed PRIMARY_UNTIL_HEADER is still in force.
+
+        Values further ahead than a fresh pin would be are ignored, so a client
+        can't keep itself on the primary for longer than by writing.
+        """
+        if not value:
+            return False
+        try:
+            until = float(value)
+        except ValueError:
+            return False
+        now = time.time()
+        return now < until <= now + READ_YOUR_WRITES_SECONDS
+
+    def choose(self) -> Optional[Replica]:
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._turn) % len(healthy)]
+
+    async def start(self) -> None:
+        if self.replicas and self._task is None:
+            await asyncio.gather(*(warm_up_pool(replica.engine) for replica in self.replicas))
+            await self.check_all()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(replica.check() for replica in self.replicas))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(REPLICA_HEALTH_INTERVAL)
+            await self.check_all()
+
+
+replicas = ReplicaSet(DATABASE_REPLICA_URLS)
+
+
+async def get_read_db(request: Request):
+    """Session for read-only endpoints: a healthy replica, or the primary for recent writers."""
+    replica = None
+    if replicas and not (
+        ReplicaSet.echoes_pin(request.headers.get(PRIMARY_UNTIL_HEADER))
+        or replicas.is_pinned(ReplicaSet.client_key(request.headers.get("authorization")))
+    ):
+        replica = replicas.choose()
+    if replica is None:
+        DB_READ_SESSIONS.inc("primary")
+        async with SessionLocal() as session:
+            yield session
+        return
+
+    DB_READ_SESSIONS.inc("replica")
+    async with replica.sessionmaker() as session:
+        try:
+            yield session
+        except DBAPIError as exc:
+            # Don't wait for the next probe before sending reads elsewhere
+            if exc.connection_invalidated:
+                replica.mark_down(str(exc.orig))
+            raise
+
+
+class ReadYourWritesMiddleware:
+    """Pins a client to the primary after any request that may have written (non-GET, status < 400).
+
+    The pin is taken when the response starts, before the client can send its
+    next request: in this worker's memory, and in PRIMARY_UNTIL_HEADER for the
+    client to send back to any worker.
+    """
+
+    SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not replicas or scope["method"] in self.SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_and_pin(message):
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                replicas.pin(ReplicaSet.client_key(Headers(scope=scope).get("authorization")))
+                MutableHeaders(scope=message)[PRIMARY_UNTIL_HEADER] = ReplicaSet.primary_until()
+            await send(message)
+
+        await self.app(scope, receive, send_and_pin)
+
+
+@registry.collector
+def _replica_metrics():
+    if not replicas:
+        return
+    healthy = Gauge("db_replica_healthy", "1 if the read replica passed its last health check.", ("replica",))
+    lag = Gauge("db_replica_lag_seconds", "Replication lag seen by the last health check.", ("replica",))
+    for replica in replicas.replicas:
+        healthy.set(replica.name, value=1 if replica.healthy else 0)
+        lag.set(replica.name, value=replica.lag)
+    yield healthy
+    yield lag
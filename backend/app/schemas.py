@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, field_validator
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 from .models import UserRole, TicketStatus, TicketPriority, TicketType
 
@@ -13,6 +13,9 @@ class UserCreate(UserBase):
     password: str
 
 class UserResponse(UserBase):
+    # Validated as EmailStr on the way in; re-running the email validator for
+    # every embedded user dominated serialization time on large boards.
+    email: str
     id: int
     created_at: datetime
 
@@ -25,6 +28,7 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     email: Optional[str] = None
+    user_id: Optional[int] = None
 
 # Workspace Member Schemas
 class MemberAdd(BaseModel):
@@ -91,6 +95,8 @@ class AttachmentBase(BaseModel):
 class AttachmentResponse(AttachmentBase):
     id: int
     created_at: datetime
+    size: Optional[int] = None
+    content_type: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -136,6 +142,7 @@ class TicketResponse(TicketBase):
     id: int
     created_at: datetime
     updated_at: datetime
+    board_rank: str
     assignee: Optional[UserResponse] = None
     comments: List[CommentResponse] = []
     attachments: List[AttachmentResponse] = []
@@ -143,5 +150,74 @@ class TicketResponse(TicketBase):
     class Config:
         from_attributes = True
 
+# Lightweight card used by the paginated board listing: no embedded comments
+# or attachments, just their counts. Full detail comes from GET /{ticket_id}.
+class TicketSummary(TicketBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+    board_rank: str
+    assignee: Optional[UserResponse] = None
+    comment_count: int = 0
+    attachment_count: int = 0
+
+    class Config:
+        from_attributes = True
+
+# Search hit: a summary card plus its ts_rank score and a highlighted snippet
+# (both only populated on Postgres).
+class TicketSearchResult(TicketSummary):
+    rank: float = 0.0
+    snippet: Optional[str] = None
+
+# Card in the caller's cross-workspace "my work" list
+class AssignedTicket(TicketSummary):
+    workspace_id: int
+    project_name: str
+
+# Drag-and-drop target: the card to follow (after_id), the card to precede
+# (before_id), or both, in the ticket's column or the one named by status.
+# With neither the ticket goes to the bottom of the column.
+class TicketMove(BaseModel):
+    status: Optional[TicketStatus] = None
+    after_id: Optional[int] = None
+    before_id: Optional[int] = None
+
+    @field_validator('status', mode='before')
+    @classmethod
+    def normalize_enums(cls, v):
+        if isinstance(v, str):
+            return v.lower()
+        return v
+
+# Bulk ticket operations: creates, updates and deletes applied in one transaction
+class TicketBulkUpdate(TicketUpdate):
+    id: int
+
+class TicketBulkRequest(BaseModel):
+    create: List[TicketCreate] = []
+    update: List[TicketBulkUpdate] = []
+    delete: List[int] = []
+
+class TicketBulkResult(BaseModel):
+    op: str
+    id: Optional[int] = None
+    ok: bool = True
+    error: Optional[str] = None
+    # Omitted when the caller asks for a minimal response
+    ticket: Optional[TicketResponse] = None
+
+# One entry of a ticket's change history; changes maps field -> [old, new]
+class TicketActivityResponse(BaseModel):
+    id: int
+    ticket_id: int
+    user_id: Optional[int] = None
+    action: str
+    changes: Optional[Dict[str, List[Any]]] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
 # Refresh forward references for CommentResponse
 CommentResponse.model_rebuild()
@@ -0,0 +1,34 @@
+import os
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+
+# Opt-in fast path for large listings: build the JSON body directly instead of
+# going through FastAPI's response_model validation and jsonable_encoder pass.
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "false").lower() in ("1", "true", "yes")
+
+
+@lru_cache(maxsize=None)
+def type_adapter(type_: Any) -> TypeAdapter:
+    return TypeAdapter(type_)
+
+
+def _headers(response: Optional[Response]) -> Optional[dict]:
+    # Headers set on an injected Response (ETag, cursors) are not merged into
+    # a Response the endpoint returns itself, so carry them over.
+    return dict(response.headers) if response is not None else None
+
+
+def model_json_response(type_: Any, value: Any, response: Optional[Response] = None) -> Response:
+    """Validate ``value`` (ORM objects or models) as ``type_`` and encode it in a single pydantic-core pass."""
+    adapter = type_adapter(type_)
+    body = adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+    return Response(content=body, media_type="application/json", headers=_headers(response))
+
+
+def dict_json_response(content: Any, response: Optional[Response] = None) -> Response:
+    """Encode plain dicts and lists (datetimes and enums included) with orjson."""
+    return ORJSONResponse(content, headers=_headers(response))
@@ -0,0 +1,54 @@
+"""Production entry point.
+
+    python -m app.server
+
+Runs the API under uvicorn with WEB_CONCURRENCY worker processes sharing one
+listening socket; a worker that dies is replaced. Each worker warms up
+(pool connections, bcrypt, JWT) before it accepts connections, and requests
+arriving meanwhile wait in the socket backlog rather than failing.
+
+On SIGTERM/SIGINT workers stop accepting connections, finish in-flight
+requests for up to GRACEFUL_SHUTDOWN_SECONDS, then run the app's shutdown
+(activity log flush, job workers, realtime hub) before exiting.
+
+For local development with auto-reload use `uvicorn app.main:app --reload`.
+"""
+import os
+
+import uvicorn
+
+from .log import configure_logging
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+# Worker processes; each has its own pools, caches and background tasks, so
+# Postgres sees up to WEB_CONCURRENCY * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", str(min(4, os.cpu_count() or 1))))
+GRACEFUL_SHUTDOWN_SECONDS = int(os.getenv("GRACEFUL_SHUTDOWN_SECONDS", "30"))
+KEEPALIVE_SECONDS = int(os.getenv("KEEPALIVE_SECONDS", "5"))
+# Proxies whose X-Forwarded-For / X-Forwarded-Proto headers are trusted
+FORWARDED_ALLOW_IPS = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+
+def main() -> None:
+    # Workers inherit the environment: open the whole pool at startup unless told otherwise
+    os.environ.setdefault("DB_POOL_WARMUP", os.getenv("DB_POOL_SIZE", "5"))
+    configure_logging()
+    uvicorn.run(
+        "app.main:app",
+        host=HOST,
+        port=PORT,
+        workers=WEB_CONCURRENCY,
+        lifespan="on",
+        # The app's own logging; RequestTimingMiddleware already logs every request
+        log_config=None,
+        access_log=False,
+        proxy_headers=True,
+        forwarded_allow_ips=FORWARDED_ALLOW_IPS,
+        timeout_keep_alive=KEEPALIVE_SECONDS,
+        timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_SECONDS,
+    )
+
+
+if __name__ == "__main__":
+    main()
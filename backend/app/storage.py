@@ -0,0 +1,240 @@
+import hashlib
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from fastapi import HTTPException, Request, UploadFile, status
+from fastapi.responses import FileResponse, JSONResponse, Response
+from starlette.datastructures import Headers
+from starlette.concurrency import run_in_threadpool
+
+from .etag import etag_matches
+
+# Attachments are stored once per distinct content under UPLOAD_DIR/ab/cd/<sha256>.
+# Blobs are never removed: deleting an attachment (or its ticket) leaves the
+# file behind, since other attachments may share it and a concurrent upload of
+# the same content may be about to reference it. Reclaiming unreferenced blobs
+# is left to an offline sweep.
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+# Room for the multipart boundaries and part headers around the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+_UPLOAD_PATH = re.compile(r"/projects/\d+/tickets/\d+/attachments/?$")
+
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+# Leading bytes of common attachment formats
+_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"%PDF-", "application/pdf"),
+    (b"PK\x03\x04", "application/zip"),
+    (b"\x1f\x8b", "application/gzip"),
+)
+
+
+@dataclass
+class StoredFile:
+    sha256: str
+    size: int
+
+
+def blob_path(sha256: str) -> str:
+    return os.path.join(UPLOAD_DIR, sha256[:2], sha256[2:4], sha256)
+
+
+def _commit_blob(tmp_path: str, sha256: str) -> None:
+    path = blob_path(sha256)
+    if os.path.exists(path):
+        # Same content is already stored
+        os.unlink(tmp_path)
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    os.replace(tmp_path, path)
+
+
+async def store_upload(upload: UploadFile) -> StoredFile:
+    """Copy an upload into content-addressed storage chunk by chunk, hashing as it goes.
+
+    Raises 413 if the file is larger than MAX_UPLOAD_BYTES. By the time this
+    runs Starlette has already spooled the whole request body to disk;
+    UploadLimitMiddleware is what stops oversized bodies early.
+    """
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=UPLOAD_DIR, prefix=".upload-")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := await upload.read(UPLOAD_CHUNK_BYTES):
+                size += len(chunk)
+                if size > MAX_UPLOAD_BYTES:
+                    raise _too_large()
+                digest.update(chunk)
+                await run_in_threadpool(out.write, chunk)
+        sha256 = digest.hexdigest()
+        await run_in_threadpool(_commit_blob, tmp_path, sha256)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return StoredFile(sha256=sha256, size=size)
+
+
+def sniff_content_type(sha256: str) -> Optional[str]:
+    """Content type of a stored blob from its leading bytes; None when it isn't recognised."""
+    with open(blob_path(sha256), "rb") as file:
+        head = file.read(16)
+    if head[8:12] == b"WEBP" and head.startswith(b"RIFF"):
+        return "image/webp"
+    for signature, content_type in _SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    return None
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Inclusive (start, end) for a single ``bytes=`` range, or None to send the whole file.
+
+    Multi-range requests are answered with the whole file, which RFC 9110 allows.
+    """
+    if not header:
+        return None
+    match = _RANGE.match(header.strip())
+    if not match or not any(match.groups()):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the last N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start >= size or start > end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+class FileRangeResponse(Response):
+    """206 response streaming ``[start, end]`` of a file in DOWNLOAD_CHUNK_BYTES pieces."""
+
+    def __init__(self, path: str, start: int, end: int, size: int, headers: dict, media_type: Optional[str] = None):
+        super().__init__(status_code=status.HTTP_206_PARTIAL_CONTENT, headers=headers, media_type=media_type)
+        self.path = path
+        self.start = start
+        self.end = end
+        self.headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        self.headers["Content-Length"] = str(end - start + 1)
+
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"].upper() == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        remaining = self.end - self.start + 1
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.start)
+            while remaining > 0:
+                chunk = await file.read(min(DOWNLOAD_CHUNK_BYTES, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def _content_disposition(filename: str) -> str:
+    # Same encoding FileResponse uses for full downloads
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def stored_file_response(request: Request, sha256: str, size: int, filename: str, media_type: Optional[str]) -> Response:
+    """Serve a stored blob with a content-hash ETag, conditional GET and single-range support."""
+    path = blob_path(sha256)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Attachment content is missing")
+
+    etag = f'"{sha256}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        # An attachment's content never changes
+        "Cache-Control": "private, max-age=31536000, immutable",
+        "X-Content-Type-Options": "nosniff",
+    }
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range.strip() == etag:
+        byte_range = parse_range(request.headers.get("range"), size)
+
+    if byte_range is None:
+        return FileResponse(path, headers=headers, media_type=media_type, filename=filename)
+
+    start, end = byte_range
+    headers["Content-Disposition"] = _content_disposition(filename)
+    return FileRangeResponse(path, start, end, size, headers, media_type=media_type or "application/octet-stream")
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Attachments are limited to {MAX_UPLOAD_BYTES} bytes",
+    )
+
+
+class UploadLimitMiddleware:
+    """Rejects attachment uploads over the size limit before the multipart body is parsed.
+
+    A Content-Length over the limit is answered with 413 without reading the
+    body; otherwise (including chunked uploads) the body is counted as it is
+    received and the request fails with 413 once it passes the limit.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not _UPLOAD_PATH.search(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        limit = MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            error = _too_large()
+            await JSONResponse({"detail": error.detail}, status_code=error.status_code)(scope, receive, send)
+            return
+
+        received = 0
+
+        async def receive_limited():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised inside request.form(); FastAPI re-raises HTTPExceptions from body parsing
+                    raise _too_large()
+            return message
+
+        await self.app(scope, receive_limited, send)
@@ -0,0 +1,174 @@
+import asyncio
+import enum
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List, Mapping, Optional
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..metrics import registry, Gauge, ACTIVITY_WRITTEN, ACTIVITY_DROPPED
+from ..models import TicketActivity
+
+logger = logging.getLogger(__name__)
+
+# Entries are written by a background task in batches of up to this many rows,
+# at the latest this many seconds after the change was committed
+ACTIVITY_BATCH_SIZE = int(os.getenv("ACTIVITY_BATCH_SIZE", "500"))
+ACTIVITY_FLUSH_SECONDS = float(os.getenv("ACTIVITY_FLUSH_SECONDS", "1.0"))
+# Entries waiting for the writer; beyond this new entries are dropped (and counted)
+ACTIVITY_QUEUE_MAX = int(os.getenv("ACTIVITY_QUEUE_MAX", "10000"))
+_WRITE_ATTEMPTS = 3
+
+# Ticket fields whose changes are recorded
+TRACKED_FIELDS = ("title", "description", "status", "priority", "ticket_type", "assignee_id")
+
+
+def _plain(value):
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+def field_changes(current: Mapping, values: Mapping) -> Dict[str, list]:
+    """{field: [old, new]} for the tracked fields in ``values`` that differ from ``current``."""
+    return {
+        key: [_plain(current.get(key)), _plain(value)]
+        for key, value in values.items()
+        if key in TRACKED_FIELDS and current.get(key) != value
+    }
+
+
+def tracked_values(ticket) -> Dict[str, object]:
+    return {key: getattr(ticket, key) for key in TRACKED_FIELDS}
+
+
+def record_activity(
+    db: AsyncSession,
+    ticket_id: int,
+    project_id: int,
+    user_id: Optional[int],
+    action: str,
+    changes: Optional[dict] = None,
+) -> None:
+    """Queue an activity entry that is handed to the writer only if the surrounding transaction commits."""
+    db.sync_session.info.setdefault("ticket_activity", []).append({
+        "ticket_id": ticket_id,
+        "project_id": project_id,
+        "user_id": user_id,
+        "action": action,
+        "changes": changes or None,
+        "created_at": datetime.utcnow(),
+    })
+
+
+class ActivityWriter:
+    """Buffers committed activity entries and inserts them in batches.
+
+    The request only appends to an in-memory queue; one background task per
+    process turns the queue into multi-row INSERTs on its own session. Entries
+    still queued when the process is killed (not stopped) are lost, which is
+    the price of keeping the extra INSERT off the request path.
+    """
+
+    def __init__(self, batch_size: int = ACTIVITY_BATCH_SIZE, flush_seconds: float = ACTIVITY_FLUSH_SECONDS,
+                 max_pending: int = ACTIVITY_QUEUE_MAX):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._queue: asyncio.Queue = asyncio.Queue(max_pending)
+        self._task: Optional[asyncio.Task] = None
+        self._writing: Optional[asyncio.Future] = None
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def enqueue(self, entries: List[dict]) -> None:
+        for entry in entries:
+            try:
+                self._queue.put_nowait(entry)
+            except asyncio.QueueFull:
+                ACTIVITY_DROPPED.inc()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the writer after flushing everything already queued."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._writing is not None:
+            await self._writing
+        while not self._queue.empty():
+            await self._write(self._take(self.batch_size))
+
+    def _take(self, limit: int) -> List[dict]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.flush_seconds
+            # Keep collecting until the batch is full or the oldest entry has waited long enough
+            while len(batch) < self.batch_size:
+                batch.extend(self._take(self.batch_size - len(batch)))
+                remaining = deadline - loop.time()
+                if len(batch) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            # Shielded so stopping never abandons a half-written batch
+            self._writing = asyncio.ensure_future(self._write(batch))
+            await asyncio.shield(self._writing)
+            self._writing = None
+
+    async def _write(self, batch: List[dict]) -> None:
+        if not batch:
+            return
+        for attempt in range(1, _WRITE_ATTEMPTS + 1):
+            try:
+                async with SessionLocal() as db:
+                    await db.execute(insert(TicketActivity), batch)
+                    await db.commit()
+                ACTIVITY_WRITTEN.inc(amount=len(batch))
+                return
+            except Exception:
+                logger.warning("Writing %d activity entries failed (attempt %d)", len(batch), attempt, exc_info=True)
+                await asyncio.sleep(attempt)
+        ACTIVITY_DROPPED.inc(amount=len(batch))
+        logger.error("Dropped %d activity entries", len(batch))
+
+
+activity_writer = ActivityWriter()
+
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_committed(session):
+    entries = session.info.pop("ticket_activity", None)
+    if entries:
+        activity_writer.enqueue(entries)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop("ticket_activity", None)
+
+
+@registry.collector
+def _activity_metrics():
+    pending = Gauge("ticket_activity_pending", "Activity entries waiting for the batched writer.")
+    pending.set(value=activity_writer.pending)
+    return [pending]
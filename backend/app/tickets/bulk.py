@@ -0,0 +1,109 @@
+import os
+from datetime import datetime
+from typing import List
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..models import Attachment, Comment, Ticket
+from ..schemas import TicketBulkRequest, TicketBulkResult
+from .counters import adjust_ticket_counts, status_deltas
+from .activity import TRACKED_FIELDS, field_changes, record_activity
+from .ranking import lock_columns, ranks_at_end
+
+# Upper bound on creates + updates + deletes in a single request
+TICKET_BULK_MAX_ITEMS = int(os.getenv("TICKET_BULK_MAX_ITEMS", "1000"))
+
+
+async def apply_bulk(db: AsyncSession, project_id: int, workspace_id: int, batch: TicketBulkRequest, user_id: int) -> List[TicketBulkResult]:
+    """Apply a batch of ticket writes in one transaction, without committing.
+
+    Each operation kind is a single executemany round-trip. Updates and
+    deletes naming tickets outside the project are reported per item and
+    skipped; the rest of the batch still goes through.
+    """
+    if len(batch.create) + len(batch.update) + len(batch.delete) > TICKET_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {TICKET_BULK_MAX_ITEMS} operations per bulk request",
+        )
+    touched = [item.id for item in batch.update] + list(batch.delete)
+    if len(touched) != len(set(touched)):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Each ticket may appear only once per bulk request")
+
+    current = {}
+    if touched:
+        # Current values of the tracked fields, for the status counters and the activity log.
+        # Locked until commit so concurrent writes can't change the statuses counted as
+        # removed; always in id order, so two overlapping batches can't deadlock.
+        result = await db.execute(
+            select(Ticket.id, *(getattr(Ticket, name) for name in TRACKED_FIELDS))
+            .where(Ticket.id.in_(touched), Ticket.project_id == project_id)
+            .order_by(Ticket.id)
+            .with_for_update()
+        )
+        current = {row.id: row._mapping for row in result.all()}
+
+    results: List[TicketBulkResult] = []
+    added, removed = [], []
+    now = datetime.utcnow()
+    # Created tickets, and updated ones that change column, go to the bottom of
+    # their column, in batch order
+    appended = [item.status for item in batch.create] + [
+        item.status for item in batch.update
+        if item.id in current and item.status is not None and item.status != current[item.id]["status"]
+    ]
+    await lock_columns(db, project_id, appended)
+    column_keys = {}
+    for ticket_status in dict.fromkeys(appended):
+        column_keys[ticket_status] = iter(await ranks_at_end(db, project_id, ticket_status, appended.count(ticket_status)))
+
+    if batch.create:
+        rows = [{**item.dict(), "project_id": project_id} for item in batch.create]
+        for row in rows:
+            row["board_rank"] = next(column_keys[row["status"]])
+        result = await db.execute(insert(Ticket).returning(Ticket.id, sort_by_parameter_order=True), rows)
+        created = result.scalars().all()
+        results.extend(TicketBulkResult(op="create", id=ticket_id) for ticket_id in created)
+        for ticket_id in created:
+            record_activity(db, ticket_id, project_id, user_id, "created")
+        added.extend(row["status"] for row in rows)
+
+    updates = []
+    for item in batch.update:
+        if item.id not in current:
+            results.append(TicketBulkResult(op="update", id=item.id, ok=False, error="Ticket not found"))
+            continue
+        values = item.dict(exclude_unset=True)
+        if "status" in values:
+            removed.append(current[item.id]["status"])
+            added.append(values["status"])
+            if values["status"] is not None and values["status"] != current[item.id]["status"]:
+                values["board_rank"] = next(column_keys[values["status"]])
+        changes = field_changes(current[item.id], values)
+        if changes:
+            record_activity(db, item.id, project_id, user_id, "updated", changes)
+        updates.append({**values, "updated_at": now})
+        results.append(TicketBulkResult(op="update", id=item.id))
+    if updates:
+        # ORM bulk UPDATE by primary key: one executemany per distinct set of columns
+        await db.execute(update(Ticket), updates)
+
+    deleted = [ticket_id for ticket_id in batch.delete if ticket_id in current]
+    results.extend(
+        TicketBulkResult(op="delete", id=ticket_id, ok=ticket_id in current, error=None if ticket_id in current else "Ticket not found")
+        for ticket_id in batch.delete
+    )
+    if deleted:
+        # Bulk deletes bypass the ORM cascades, so remove dependents first
+        await db.execute(delete(Attachment).where(Attachment.ticket_id.in_(deleted)))
+        await db.execute(delete(Comment).where(Comment.ticket_id.in_(deleted)))
+        await db.execute(delete(Ticket).where(Ticket.id.in_(deleted)))
+        removed.extend(current[ticket_id]["status"] for ticket_id in deleted)
+        for ticket_id in deleted:
+            record_activity(db, ticket_id, project_id, user_id, "deleted")
+
+    await adjust_ticket_counts(db, workspace_id, project_id, status_deltas(added=added, removed=removed))
+    return results
@@ -0,0 +1,73 @@
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, literal, true, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import joinedload
+
+from ..models import Comment
+from ..schemas import CommentResponse, UserResponse
+
+
+async def load_comment_threads(
+    db: AsyncSession,
+    ticket_id: int,
+    limit: int,
+    after: Optional[Tuple] = None,
+    max_depth: Optional[int] = None,
+) -> Tuple[List[CommentResponse], bool]:
+    """Load a page of top-level comments with their reply trees in one query.
+
+    Top-level comments are ordered oldest first and paged by (created_at, id)
+    after ``after``. Replies deeper than ``max_depth`` (top level is depth 0)
+    are left out. Returns the threads and whether more top-level comments follow.
+    """
+    # One extra root is fetched to detect a next page; its replies are not expanded
+    roots = select(Comment.id).where(Comment.ticket_id == ticket_id, Comment.parent_id.is_(None))
+    if after is not None:
+        roots = roots.where(tuple_(Comment.created_at, Comment.id) > tuple_(*after))
+    roots = roots.add_columns(
+        (func.row_number().over(order_by=(Comment.created_at, Comment.id)) <= limit).label("expand")
+    ).order_by(Comment.created_at, Comment.id).limit(limit + 1).cte("roots")
+
+    thread = select(roots.c.id, literal(0).label("depth"), roots.c.expand).cte("thread", recursive=True)
+    replies = (
+        select(Comment.id, (thread.c.depth + 1).label("depth"), thread.c.expand)
+        .join(thread, Comment.parent_id == thread.c.id)
+        .where(Comment.ticket_id == ticket_id, thread.c.expand == true())
+    )
+    if max_depth is not None:
+        replies = replies.where(thread.c.depth < max_depth)
+    thread = thread.union_all(replies)
+
+    result = await db.execute(
+        select(Comment)
+        .join(thread, thread.c.id == Comment.id)
+        .options(joinedload(Comment.author))
+        .order_by(Comment.created_at, Comment.id)
+    )
+    comments = result.scalars().all()
+
+    # Build the tree from plain response objects so nothing touches the ORM
+    # replies collections (which would lazy-load under async).
+    nodes: Dict[int, CommentResponse] = {}
+    for comment in comments:
+        nodes[comment.id] = CommentResponse(
+            id=comment.id,
+            content=comment.content,
+            ticket_id=comment.ticket_id,
+            parent_id=comment.parent_id,
+            user_id=comment.user_id,
+            created_at=comment.created_at,
+            author=UserResponse.model_validate(comment.author),
+        )
+    threads: List[CommentResponse] = []
+    for comment in comments:
+        node = nodes[comment.id]
+        if comment.parent_id is None:
+            threads.append(node)
+        else:
+            nodes[comment.parent_id].replies.append(node)
+
+    has_more = len(threads) > limit
+    return threads[:limit], has_more
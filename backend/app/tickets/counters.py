@@ -0,0 +1,64 @@
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import delete, func, insert, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..database import IS_POSTGRES
+from ..models import Project, Ticket, TicketCount, TicketStatus
+
+
+def status_deltas(added: Iterable[Optional[TicketStatus]] = (), removed: Iterable[Optional[TicketStatus]] = ()) -> Dict[TicketStatus, int]:
+    deltas = Counter(status for status in added if status is not None)
+    deltas.subtract(status for status in removed if status is not None)
+    return {status: delta for status, delta in deltas.items() if delta}
+
+
+async def adjust_ticket_counts(db: AsyncSession, workspace_id: int, project_id: int, deltas: Dict[TicketStatus, int]) -> None:
+    """Apply per-status deltas to the counters inside the caller's transaction."""
+    rows = [
+        {"workspace_id": workspace_id, "project_id": project_id, "status": status, "ticket_count": delta}
+        # A fixed row order keeps concurrent status moves from deadlocking
+        for status, delta in sorted(deltas.items(), key=lambda item: item[0].name)
+        if delta
+    ]
+    if not rows:
+        return
+    stmt = (pg_insert if IS_POSTGRES else sqlite_insert)(TicketCount)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TicketCount.workspace_id, TicketCount.project_id, TicketCount.status],
+        set_={"ticket_count": TicketCount.ticket_count + stmt.excluded.ticket_count},
+    )
+    await db.execute(stmt, rows)
+
+
+async def rebuild_ticket_counts(db: AsyncSession, workspace_id: Optional[int] = None) -> None:
+    """Recompute the counters from the tickets table and commit.
+
+    Concurrent ticket writers block on the counters table until the rebuild
+    commits and then apply their own deltas on top, so nothing is lost.
+    """
+    if IS_POSTGRES:
+        await db.execute(text("LOCK TABLE ticket_counts IN EXCLUSIVE MODE"))
+
+    clear = delete(TicketCount)
+    source = (
+        select(Project.workspace_id, Ticket.project_id, Ticket.status, func.count(Ticket.id))
+        .join(Project, Project.id == Ticket.project_id)
+        .where(Ticket.status.isnot(None))
+        .group_by(Project.workspace_id, Ticket.project_id, Ticket.status)
+    )
+    if workspace_id is not None:
+        clear = clear.where(TicketCount.workspace_id == workspace_id)
+        source = source.where(Project.workspace_id == workspace_id)
+
+    await db.execute(clear)
+    await db.execute(
+        insert(TicketCount).from_select(
+            ["workspace_id", "project_id", "status", "ticket_count"], source
+        )
+    )
+    await db.commit()
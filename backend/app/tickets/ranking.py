@@ -0,0 +1,288 @@
+import asyncio
+import logging
+import os
+from typing import Iterable, List, Optional, Set
+
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, event, func, update
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import Session
+
+from ..database import IS_POSTGRES, SessionLocal
+from ..models import Project, Ticket, TicketStatus
+
+logger = logging.getLogger(__name__)
+
+# Board order within a status column is a lexicographically sorted string key:
+# base-36 digits read as a fraction in [0, 1). A key can always be found
+# between two others, so moving a card rewrites only that card's row.
+ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(ALPHABET)
+# Digits used when appending to either end of a column: about 1.7 million
+# appends before keys start to grow
+_STEP_DIGITS = 4
+# Keys longer than this (repeated inserts into the same gap) trigger a rebalance of the column
+RANK_REBALANCE_LENGTH = int(os.getenv("RANK_REBALANCE_LENGTH", "16"))
+# Width of the board_rank column. The background rebalance can be held off by
+# busy rows, so a write whose key would pass half of this respaces the column
+# itself, in its own transaction, first.
+RANK_MAX_LENGTH = Ticket.__table__.c.board_rank.type.length
+_SYNC_REBALANCE_LENGTH = RANK_MAX_LENGTH // 2
+# Background rebalances retry this many times, a second apart, while rows are locked
+_REBALANCE_ATTEMPTS = 5
+
+
+def _to_key(value: int, width: int) -> str:
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(ALPHABET[digit])
+    # Trailing zeros don't change the value and would leave no room directly after the key
+    return "".join(reversed(digits)).rstrip("0")
+
+
+def _midpoint(lower: str, upper: Optional[str]) -> str:
+    result = []
+    i = 0
+    while True:
+        low = ALPHABET.index(lower[i]) if i < len(lower) else 0
+        high = ALPHABET.index(upper[i]) if upper is not None and i < len(upper) else BASE
+        if high - low > 1:
+            result.append(ALPHABET[(low + high) // 2])
+            return "".join(result)
+        result.append(ALPHABET[low])
+        if high - low == 1:
+            # Any continuation of this prefix is below upper
+            upper = None
+        i += 1
+
+
+def rank_between(lower: Optional[str], upper: Optional[str]) -> str:
+    """A key sorting strictly between ``lower`` and ``upper`` (None means the start or end of the column)."""
+    if lower is not None and upper is not None and lower >= upper:
+        raise ValueError(f"{lower!r} does not sort before {upper!r}")
+    if upper is None and lower is not None:
+        # Append: step the leading digits up rather than halving the remaining gap
+        stepped = int(lower[:_STEP_DIGITS].ljust(_STEP_DIGITS, "0"), BASE) + 1
+        if stepped < BASE ** _STEP_DIGITS:
+            return _to_key(stepped, _STEP_DIGITS)
+    elif lower is None and upper is not None:
+        stepped = int(upper[:_STEP_DIGITS].ljust(_STEP_DIGITS, "0"), BASE) - 1
+        key = _to_key(stepped, _STEP_DIGITS) if stepped > 0 else ""
+        # Truncation can land on upper itself (e.g. "0001" from "00010005")
+        if key and key < upper:
+            return key
+    return _midpoint(lower or "", upper)
+
+
+def evenly_spaced(count: int) -> List[str]:
+    """``count`` ascending keys spread over the whole key space."""
+    width = _STEP_DIGITS
+    while BASE ** width < (count + 1) * BASE:
+        width += 1
+    step = BASE ** width // (count + 1)
+    return [_to_key(step * (i + 1), width) for i in range(count)]
+
+
+# Second key of a column's advisory lock; the first is the project id
+_COLUMN_LOCK_KEYS = {ticket_status: index for index, ticket_status in enumerate(TicketStatus)}
+
+
+async def lock_columns(db: AsyncSession, project_id: int, statuses: Iterable[TicketStatus]) -> None:
+    """Serialise rank assignment in these columns until the transaction ends.
+
+    Everything that picks a key for a column (appends, moves, rebalancing)
+    takes the column's lock first, so two of them can't read the same
+    neighbours and produce the same key. Callers that lock ticket rows do
+    that before this. Columns are locked in a fixed order so that bulk
+    writes spanning several can't deadlock. SQLite already serialises
+    writers, so this is a no-op there.
+    """
+    if not IS_POSTGRES:
+        return
+    for key in sorted({_COLUMN_LOCK_KEYS[ticket_status] for ticket_status in statuses}):
+        await db.execute(select(func.pg_advisory_xact_lock(project_id, key)))
+
+
+async def last_rank(db: AsyncSession, project_id: int, ticket_status: TicketStatus) -> Optional[str]:
+    result = await db.execute(
+        select(func.max(Ticket.board_rank)).where(Ticket.project_id == project_id, Ticket.status == ticket_status)
+    )
+    return result.scalar()
+
+
+async def respace_column(db: AsyncSession, project_id: int, ticket_status: TicketStatus) -> int:
+    """Give every ticket in one column an evenly spaced key, keeping the order. Returns the ticket count.
+
+    The caller holds the column lock. Raises DBAPIError if another transaction
+    has a ticket in the column locked: writers lock the ticket row before the
+    column, so waiting here could deadlock.
+
+    updated_at is left alone, since the order (and so the board) doesn't
+    change; the project version is bumped instead so listing ETags change.
+    """
+    result = await db.execute(
+        select(Ticket.id)
+        .where(Ticket.project_id == project_id, Ticket.status == ticket_status)
+        .order_by(Ticket.board_rank, Ticket.id)
+        .with_for_update(nowait=True)
+    )
+    ids = result.scalars().all()
+    if ids:
+        tickets = Ticket.__table__
+        await db.execute(
+            update(tickets)
+            .where(tickets.c.id == bindparam("ticket_id"))
+            # Set explicitly so the column's onupdate doesn't fire
+            .values(board_rank=bindparam("key"), updated_at=tickets.c.updated_at),
+            [{"ticket_id": ticket_id, "key": key} for ticket_id, key in zip(ids, evenly_spaced(len(ids)))],
+        )
+        await db.execute(update(Project).where(Project.id == project_id).values(version=Project.version + 1))
+    return len(ids)
+
+
+async def _respace_now(db: AsyncSession, project_id: int, ticket_status: TicketStatus) -> None:
+    try:
+        count = await respace_column(db, project_id, ticket_status)
+    except DBAPIError:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The board column is being reordered; retry shortly",
+        )
+    logger.info("Respaced %d ranks in project %s column %s before writing", count, project_id, ticket_status.value)
+
+
+def _check_length(db: AsyncSession, project_id: int, ticket_status: TicketStatus, key: str) -> None:
+    # Rebalanced in the background once this transaction commits
+    if len(key) > RANK_REBALANCE_LENGTH:
+        db.sync_session.info.setdefault("rebalance_columns", set()).add((project_id, ticket_status))
+
+
+def _append_keys(lower: Optional[str], count: int) -> List[str]:
+    keys = []
+    for _ in range(count):
+        lower = rank_between(lower, None)
+        keys.append(lower)
+    return keys
+
+
+async def ranks_at_end(db: AsyncSession, project_id: int, ticket_status: TicketStatus, count: int) -> List[str]:
+    """``count`` ascending keys for tickets added to the bottom of a column, in order."""
+    await lock_columns(db, project_id, [ticket_status])
+    keys = _append_keys(await last_rank(db, project_id, ticket_status), count)
+    if keys and max(map(len, keys)) > _SYNC_REBALANCE_LENGTH:
+        await _respace_now(db, project_id, ticket_status)
+        keys = _append_keys(await last_rank(db, project_id, ticket_status), count)
+    if keys:
+        _check_length(db, project_id, ticket_status, max(keys, key=len))
+    return keys
+
+
+async def rank_at_end(db: AsyncSession, project_id: int, ticket_status: TicketStatus) -> str:
+    """Key for a ticket added to the bottom of its column."""
+    return (await ranks_at_end(db, project_id, ticket_status, 1))[0]
+
+
+async def rank_for_move(
+    db: AsyncSession,
+    project_id: int,
+    ticket_id: int,
+    ticket_status: TicketStatus,
+    after_id: Optional[int],
+    before_id: Optional[int],
+) -> str:
+    """Key placing ``ticket_id`` after ``after_id`` and before ``before_id`` in the column.
+
+    Either neighbour may be omitted; the missing side is looked up with one
+    probe of the (project_id, status, board_rank) index.
+    """
+    await lock_columns(db, project_id, [ticket_status])
+    ids = [i for i in (after_id, before_id) if i is not None]
+    if ticket_id in ids:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="A ticket can't be placed next to itself")
+    key = await _key_between_neighbours(db, project_id, ticket_id, ticket_status, after_id, before_id)
+    if len(key) > _SYNC_REBALANCE_LENGTH:
+        await _respace_now(db, project_id, ticket_status)
+        key = await _key_between_neighbours(db, project_id, ticket_id, ticket_status, after_id, before_id)
+    _check_length(db, project_id, ticket_status, key)
+    return key
+
+
+async def _key_between_neighbours(
+    db: AsyncSession,
+    project_id: int,
+    ticket_id: int,
+    ticket_status: TicketStatus,
+    after_id: Optional[int],
+    before_id: Optional[int],
+) -> str:
+    neighbours = {}
+    ids = [i for i in (after_id, before_id) if i is not None]
+    if ids:
+        result = await db.execute(
+            select(Ticket.id, Ticket.board_rank)
+            .where(Ticket.id.in_(ids), Ticket.project_id == project_id, Ticket.status == ticket_status)
+        )
+        neighbours = dict(result.all())
+        if len(neighbours) != len(ids):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Neighbour ticket not found in the target column")
+
+    column = (
+        Ticket.project_id == project_id,
+        Ticket.status == ticket_status,
+        Ticket.id != ticket_id,
+    )
+    lower = neighbours.get(after_id)
+    upper = neighbours.get(before_id)
+    if after_id is not None and before_id is None:
+        upper = (await db.execute(select(func.min(Ticket.board_rank)).where(*column, Ticket.board_rank > lower))).scalar()
+    elif before_id is not None and after_id is None:
+        lower = (await db.execute(select(func.max(Ticket.board_rank)).where(*column, Ticket.board_rank < upper))).scalar()
+    elif after_id is None and before_id is None:
+        lower = (await db.execute(select(func.max(Ticket.board_rank)).where(*column))).scalar()
+
+    if lower is not None and upper is not None and lower >= upper:
+        # The client's view of the column is out of date
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Neighbours are not in order; reload the board")
+    return rank_between(lower, upper)
+
+
+async def rebalance_column(project_id: int, ticket_status: TicketStatus) -> None:
+    """Respace a column after the write that grew its keys committed, on its own session.
+
+    Retried while other writes hold tickets in the column; if it still can't
+    run, writes respace the column themselves before keys get too long.
+    """
+    for attempt in range(_REBALANCE_ATTEMPTS):
+        if attempt:
+            await asyncio.sleep(1)
+        async with SessionLocal() as db:
+            # Appends and moves into this column wait until the new keys are committed
+            await lock_columns(db, project_id, [ticket_status])
+            try:
+                count = await respace_column(db, project_id, ticket_status)
+            except DBAPIError:
+                continue
+            await db.commit()
+        logger.info("Rebalanced %d ranks in project %s column %s", count, project_id, ticket_status.value)
+        return
+    logger.warning("Gave up rebalancing project %s column %s: tickets stayed locked", project_id, ticket_status.value)
+
+
+# Running background rebalances, kept so they aren't garbage collected mid-run
+_rebalances: Set[asyncio.Task] = set()
+
+
+@event.listens_for(Session, "after_commit")
+def _start_rebalances(session):
+    for project_id, ticket_status in session.info.pop("rebalance_columns", ()):
+        task = asyncio.get_running_loop().create_task(rebalance_column(project_id, ticket_status))
+        _rebalances.add(task)
+        task.add_done_callback(_rebalances.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rebalances(session):
+    session.info.pop("rebalance_columns", None)
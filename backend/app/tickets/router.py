@@ -1,142 +1,379 @@
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
+import logging
+from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile, Query, Request, Response
+from datetime import datetime
+from sqlalchemy import func, insert, tuple_, union, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import noload, selectinload
 from typing import List, Optional
 from ..database import get_db
-from ..models import Ticket, Project, User, Workspace, workspace_members, Comment, Attachment, TicketStatus, TicketPriority
-from ..schemas import TicketCreate, TicketResponse, TicketUpdate, CommentCreate, CommentResponse, AttachmentResponse
+from ..replicas import get_read_db
+from ..models import Ticket, TicketActivity, User, Comment, Attachment, Project, Workspace, TicketStatus, TicketPriority, workspace_members
+from ..schemas import AssignedTicket, UserResponse, TicketCreate, TicketResponse, TicketSummary, TicketSearchResult, TicketUpdate, TicketBulkRequest, TicketBulkResult, TicketActivityResponse, TicketMove, CommentCreate, CommentResponse, AttachmentResponse
 from ..auth.router import get_current_user
+from ..auth.access import require_project_access
+from ..pagination import NEXT_CURSOR_HEADER, encode_cursor, decode_cursor
+from ..etag import make_etag, etag_matches, not_modified, set_etag
+from ..storage import store_upload, stored_file_response
+from ..serialization import FAST_JSON_RESPONSES, dict_json_response, model_json_response
+from .search import apply_search, search_rank, search_snippet, uses_full_text
+from .counters import adjust_ticket_counts, status_deltas
+from .bulk import apply_bulk
+from .comments import load_comment_threads
+from .rows import load_ticket_dicts
+from .activity import field_changes, record_activity, tracked_values
+from .ranking import rank_at_end, rank_for_move
+from ..realtime.hub import publish, row_data
+from ..jobs.handlers import process_attachment
+from ..jobs.queue import enqueue
 
 router = APIRouter(prefix="/projects/{project_id}/tickets", tags=["tickets"])
+me_router = APIRouter(prefix="/me", tags=["tickets"])
+logger = logging.getLogger(__name__)
+
+def _with_details(query):
+    # CRITICAL: Deep selectinload to prevent async serialization crashes
+    return query.options(
+        selectinload(Ticket.assignee),
+        selectinload(Ticket.attachments),
+        selectinload(Ticket.comments).selectinload(Comment.author),
+        selectinload(Ticket.comments).selectinload(Comment.replies)
+    )
+
+def _filter_tickets(query, project_id: int, status: Optional[TicketStatus], priority: Optional[TicketPriority], search: Optional[str], full_text: bool = False):
+    query = query.where(Ticket.project_id == project_id)
+    if status:
+        query = query.where(Ticket.status == status)
+    if priority:
+        query = query.where(Ticket.priority == priority)
+    if search:
+        query = apply_search(query, search, full_text)
+    return query
+
+def _count_columns():
+    comment_count = (
+        select(func.count(Comment.id))
+        .where(Comment.ticket_id == Ticket.id)
+        .correlate(Ticket)
+        .scalar_subquery()
+    )
+    attachment_count = (
+        select(func.count(Attachment.id))
+        .where(Attachment.ticket_id == Ticket.id)
+        .correlate(Ticket)
+        .scalar_subquery()
+    )
+    return comment_count, attachment_count
+
+async def _touch_ticket(db: AsyncSession, ticket_id: int):
+    # Comments and attachments are embedded in ticket listings, so adding one
+    # has to move the ticket's updated_at for the listing ETag to change
+    await db.execute(update(Ticket).where(Ticket.id == ticket_id).values(updated_at=datetime.utcnow()))
+
+async def _known_user(db: AsyncSession, user_id: Optional[int], current_user: User) -> Optional[User]:
+    # Usually the caller assigns themselves or nobody; anyone else is one primary-key lookup
+    if user_id is None:
+        return None
+    if user_id == current_user.id:
+        return current_user
+    return await db.get(User, user_id)
 
 @router.post("/", response_model=TicketResponse)
 async def create_ticket(
     project_id: int, 
     ticket_in: TicketCreate, 
     db: AsyncSession = Depends(get_db), 
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    workspace_id: int = Depends(require_project_access)
 ):
-    # Verify project exists
-    project_result = await db.execute(select(Project).where(Project.id == project_id))
-    db_project = project_result.scalars().first()
-    if not db_project:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-    
-    # Verify access
-    ws_id = db_project.workspace_id
-    ws_result = await db.execute(
-        select(Workspace)
-        .where(Workspace.id == ws_id)
-        .where((Workspace.owner_id == current_user.id) | (Workspace.members.any(id=current_user.id)))
-    )
-    if not ws_result.scalars().first():
-        raise HTTPException(status_code=403, detail="Access denied")
-
-    db_ticket = Ticket(**ticket_in.dict())
-    db_ticket.project_id = project_id
-    db.add(db_ticket)
+    # Access was checked by require_project_access (cached per worker). The
+    # row is written with INSERT ... RETURNING and the response built from it:
+    # a new ticket has no comments or attachments, so nothing is reloaded.
+    # The other round-trips: the column lock and MAX(board_rank) for the rank
+    # (separate, so the MAX sees every append committed before the lock), the
+    # counter upsert, pg_notify on Postgres, and a lookup of the assignee when
+    # it isn't the caller.
+    now = datetime.utcnow()
+    values = {**ticket_in.dict(), "project_id": project_id, "created_at": now, "updated_at": now}
+    values["board_rank"] = await rank_at_end(db, project_id, values["status"])
+    try:
+        result = await db.execute(insert(Ticket).values(**values).returning(*Ticket.__table__.columns))
+        row = result.mappings().one()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Assignee not found")
+
+    await adjust_ticket_counts(db, workspace_id, project_id, status_deltas(added=[row["status"]]))
+    record_activity(db, row["id"], project_id, current_user.id, "created")
+    await publish(db, project_id, "ticket.created", row["id"], dict(row))
+    assignee = await _known_user(db, row["assignee_id"], current_user)
     await db.commit()
-    await db.refresh(db_ticket)
-    
-    # Reload with deep relations for serialization
-    result = await db.execute(
-        select(Ticket)
-        .where(Ticket.id == db_ticket.id)
-        .options(
-            selectinload(Ticket.assignee),
-            selectinload(Ticket.attachments),
-            selectinload(Ticket.comments).selectinload(Comment.author),
-            selectinload(Ticket.comments).selectinload(Comment.replies)
-        )
-    )
-    return result.scalars().first()
+    return TicketResponse(**row, assignee=UserResponse.model_validate(assignee) if assignee else None)
+
+@router.post("/bulk", response_model=List[TicketBulkResult])
+async def bulk_tickets(
+    project_id: int,
+    batch: TicketBulkRequest,
+    minimal: bool = Query(False, description="Return only ids and outcomes, skipping the ticket reload"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    workspace_id: int = Depends(require_project_access)
+):
+    try:
+        results = await apply_bulk(db, project_id, workspace_id, batch, current_user.id)
+        # Too many changes to describe one by one; subscribers refetch
+        await publish(db, project_id, "tickets.bulk", None)
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Bulk request references a missing user or ticket")
+
+    if minimal:
+        return results
+
+    ids = [item.id for item in results if item.ok and item.op != "delete"]
+    if ids:
+        result = await db.execute(_with_details(select(Ticket).where(Ticket.id.in_(ids))))
+        tickets = {ticket.id: ticket for ticket in result.scalars().all()}
+        for item in results:
+            if item.ok and item.op != "delete":
+                item.ticket = TicketResponse.model_validate(tickets[item.id])
+    return results
 
 @router.get("/", response_model=List[TicketResponse])
 async def list_tickets(
     project_id: int,
+    request: Request,
+    response: Response,
     status: Optional[TicketStatus] = None,
     priority: Optional[TicketPriority] = None,
     search: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    workspace_id: int = Depends(require_project_access)
 ):
-    print(f"[API] list_tickets called for project_id: {project_id} by user: {current_user.email}")
+    # Any create, update or delete in the project changes the count or the latest
+    # updated_at. The project version covers rank rebalancing and attachment
+    # processing, and the summed user versions profile changes of embedded users
+    # (assignees, comment authors).
+    embedded_users = union(
+        select(Ticket.assignee_id).where(Ticket.project_id == project_id),
+        select(Comment.user_id).join(Ticket, Ticket.id == Comment.ticket_id).where(Ticket.project_id == project_id),
+    )
+    version = await db.execute(
+        select(
+            func.count(Ticket.id),
+            func.max(Ticket.updated_at),
+            select(Project.version).where(Project.id == project_id).scalar_subquery(),
+            select(func.coalesce(func.sum(User.version), 0)).where(User.id.in_(embedded_users)).scalar_subquery(),
+        ).where(Ticket.project_id == project_id)
+    )
+    etag = make_etag(project_id, *version.one(), status, priority, search)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
     try:
-        query = select(Ticket).where(Ticket.project_id == project_id)
-        
-        if status:
-            query = query.where(Ticket.status == status)
-        if priority:
-            query = query.where(Ticket.priority == priority)
+        full_text = bool(search) and await uses_full_text(db, search)
+        query = _filter_tickets(select(Ticket), project_id, status, priority, search, full_text)
         if search:
-            query = query.where(
-                (Ticket.title.ilike(f"%{search}%")) | (Ticket.description.ilike(f"%{search}%"))
-            )
-            
-        # CRITICAL: Deep selectinload to prevent async serialization crashes
-        result = await db.execute(
-            query.options(
-                selectinload(Ticket.assignee),
-                selectinload(Ticket.attachments),
-                selectinload(Ticket.comments).selectinload(Comment.author),
-                selectinload(Ticket.comments).selectinload(Comment.replies)
-            )
-        )
+            query = query.order_by(search_rank(search, full_text).desc(), Ticket.id.desc())
+        else:
+            # Board order within each column
+            query = query.order_by(Ticket.status, Ticket.board_rank, Ticket.id)
+        if FAST_JSON_RESPONSES:
+            return dict_json_response(await load_ticket_dicts(db, query), response)
+        result = await db.execute(_with_details(query))
         data = result.scalars().all()
-        print(f"[API] Found {len(data)} tickets")
         return data
     except Exception as e:
-        print(f"Error listing tickets: {str(e)}")
-        # Log the full traceback internally if possible, but for now just the error
+        logger.exception("Error listing tickets for project %s", project_id)
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/summary", response_model=List[TicketSummary])
+async def list_ticket_summaries(
+    project_id: int,
+    response: Response,
+    status: Optional[TicketStatus] = None,
+    priority: Optional[TicketPriority] = None,
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    workspace_id: int = Depends(require_project_access)
+):
+    # Keyset pagination over (updated_at, id), newest first. The next page
+    # cursor is returned in the X-Next-Cursor header.
+    full_text = bool(search) and await uses_full_text(db, search)
+    query = _filter_tickets(select(Ticket, *_count_columns()), project_id, status, priority, search, full_text)
+
+    after = decode_cursor(cursor, 2)
+    if after:
+        query = query.where(tuple_(Ticket.updated_at, Ticket.id) < tuple_(*after))
+
+    result = await db.execute(
+        query.order_by(Ticket.updated_at.desc(), Ticket.id.desc())
+        .limit(limit + 1)
+        .options(selectinload(Ticket.assignee))
+    )
+    rows = result.all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1][0]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.updated_at, last.id)
+
+    return [
+        TicketSummary.model_validate(ticket).model_copy(
+            update={"comment_count": comments, "attachment_count": attachments}
+        )
+        for ticket, comments, attachments in rows
+    ]
+
+@router.get("/search", response_model=List[TicketSearchResult])
+async def search_tickets(
+    project_id: int,
+    q: str = Query(..., min_length=1),
+    status: Optional[TicketStatus] = None,
+    priority: Optional[TicketPriority] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    workspace_id: int = Depends(require_project_access)
+):
+    # Ranked full-text search with prefix matching and highlighted snippets
+    # Postgres defers costly select-list expressions like ts_headline until
+    # after ORDER BY/LIMIT, so snippets are only built for the returned page.
+    full_text = await uses_full_text(db, q)
+    rank = search_rank(q, full_text).label("rank")
+    query = _filter_tickets(
+        select(Ticket, *_count_columns(), rank, search_snippet(q, full_text).label("snippet")),
+        project_id, status, priority, q, full_text
+    )
+    result = await db.execute(
+        query.order_by(rank.desc(), Ticket.id.desc())
+        .limit(limit)
+        .options(selectinload(Ticket.assignee))
+    )
+    return [
+        TicketSearchResult.model_validate(ticket).model_copy(
+            update={"comment_count": comments, "attachment_count": attachments, "rank": rank, "snippet": snippet}
+        )
+        for ticket, comments, attachments, rank, snippet in result.all()
+    ]
+
+@router.get("/{ticket_id}", response_model=TicketResponse)
+async def get_ticket(
+    project_id: int,
+    ticket_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    workspace_id: int = Depends(require_project_access)
+):
+    result = await db.execute(
+        _with_details(select(Ticket).where(Ticket.id == ticket_id, Ticket.project_id == project_id))
+    )
+    db_ticket = result.scalars().first()
+    if not db_ticket:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket not found")
+    return db_ticket
+
 @router.patch("/{ticket_id}", response_model=TicketResponse)
 async def update_ticket(
     project_id: int, 
     ticket_id: int, 
     ticket_in: TicketUpdate, 
     db: AsyncSession = Depends(get_db), 
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    workspace_id: int = Depends(require_project_access)
 ):
-    result = await db.execute(select(Ticket).where(Ticket.id == ticket_id, Ticket.project_id == project_id))
+    # Locked until commit: a concurrent update waits, then sees the status this one leaves
+    result = await db.execute(
+        select(Ticket).where(Ticket.id == ticket_id, Ticket.project_id == project_id).with_for_update()
+    )
     db_ticket = result.scalars().first()
     if not db_ticket:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket not found")
     
+    old_status = db_ticket.status
     update_data = ticket_in.dict(exclude_unset=True)
+    changes = field_changes(tracked_values(db_ticket), update_data)
     for key, value in update_data.items():
         setattr(db_ticket, key, value)
+    if db_ticket.status is not None and db_ticket.status != old_status:
+        # A status change outside drag-and-drop lands at the bottom of the new column
+        db_ticket.board_rank = await rank_at_end(db, project_id, db_ticket.status)
     
     db.add(db_ticket)
+    await adjust_ticket_counts(db, workspace_id, project_id, status_deltas(added=[db_ticket.status], removed=[old_status]))
+    await db.flush()
+    if changes:
+        record_activity(db, ticket_id, project_id, current_user.id, "updated", changes)
+    await publish(db, project_id, "ticket.updated", ticket_id, row_data(db_ticket))
     await db.commit()
     
     # Reload with deep relations
+    result = await db.execute(_with_details(select(Ticket).where(Ticket.id == ticket_id)))
+    return result.scalars().first()
+
+@router.post("/{ticket_id}/move", response_model=TicketSummary)
+async def move_ticket(
+    project_id: int,
+    ticket_id: int,
+    move: TicketMove,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    workspace_id: int = Depends(require_project_access)
+):
+    # Reordering rewrites only the moved ticket's row, however long the column.
+    # The row is locked so the status change below is counted once.
     result = await db.execute(
-        select(Ticket)
-        .where(Ticket.id == ticket_id)
-        .options(
-            selectinload(Ticket.assignee),
-            selectinload(Ticket.attachments),
-            selectinload(Ticket.comments).selectinload(Comment.author),
-            selectinload(Ticket.comments).selectinload(Comment.replies)
-        )
+        select(Ticket, *_count_columns())
+        .where(Ticket.id == ticket_id, Ticket.project_id == project_id)
+        .options(selectinload(Ticket.assignee))
+        .with_for_update(of=Ticket)
+    )
+    row = result.first()
+    if not row:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket not found")
+    db_ticket, comments, attachments = row
+
+    old_status = db_ticket.status
+    new_status = move.status or old_status
+    db_ticket.board_rank = await rank_for_move(db, project_id, ticket_id, new_status, move.after_id, move.before_id)
+    if new_status != old_status:
+        db_ticket.status = new_status
+        await adjust_ticket_counts(db, workspace_id, project_id, status_deltas(added=[new_status], removed=[old_status]))
+        record_activity(db, ticket_id, project_id, current_user.id, "updated", field_changes({"status": old_status}, {"status": new_status}))
+    await db.flush()
+    await publish(db, project_id, "ticket.updated", ticket_id, row_data(db_ticket))
+    await db.commit()
+
+    return TicketSummary.model_validate(db_ticket).model_copy(
+        update={"comment_count": comments, "attachment_count": attachments}
     )
-    return result.scalars().first()
 
 @router.delete("/{ticket_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_ticket(
     project_id: int, 
     ticket_id: int, 
     db: AsyncSession = Depends(get_db), 
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    workspace_id: int = Depends(require_project_access)
 ):
-    result = await db.execute(select(Ticket).where(Ticket.id == ticket_id, Ticket.project_id == project_id))
+    # Locked so a concurrent update or delete can't change the status counted as removed
+    result = await db.execute(
+        select(Ticket).where(Ticket.id == ticket_id, Ticket.project_id == project_id).with_for_update()
+    )
     db_ticket = result.scalars().first()
     if not db_ticket:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket not found")
     
     await db.delete(db_ticket)
+    await adjust_ticket_counts(db, workspace_id, project_id, status_deltas(removed=[db_ticket.status]))
+    record_activity(db, ticket_id, project_id, current_user.id, "deleted")
+    await publish(db, project_id, "ticket.deleted", ticket_id)
     await db.commit()
     return None
 
@@ -147,42 +384,94 @@ async def create_comment(
     ticket_id: int,
     comment_in: CommentCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    workspace_id: int = Depends(require_project_access)
 ):
-    ticket_result = await db.execute(select(Ticket).where(Ticket.id == ticket_id))
-    if not ticket_result.scalars().first():
-        raise HTTPException(status_code=404, detail="Ticket not found")
-        
-    db_comment = Comment(
-        content=comment_in.content,
-        ticket_id=ticket_id,
-        user_id=current_user.id,
-        parent_id=comment_in.parent_id
+    # Touching the ticket doubles as the check that it belongs to the project
+    # (and locks it against a concurrent delete until we commit)
+    touched = await db.execute(
+        update(Ticket)
+        .where(Ticket.id == ticket_id, Ticket.project_id == project_id)
+        .values(updated_at=datetime.utcnow())
+        .returning(Ticket.id)
     )
-    db.add(db_comment)
+    if touched.scalar() is None:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+
+    if comment_in.parent_id is not None:
+        # Replies stay within their ticket; a parent elsewhere could belong to a project the caller can't read
+        parent = await db.execute(
+            select(Comment.id).where(Comment.id == comment_in.parent_id, Comment.ticket_id == ticket_id)
+        )
+        if parent.scalar() is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Parent comment not found")
+
+    try:
+        result = await db.execute(
+            insert(Comment)
+            .values(content=comment_in.content, ticket_id=ticket_id, user_id=current_user.id, parent_id=comment_in.parent_id)
+            .returning(*Comment.__table__.columns)
+        )
+        row = result.mappings().one()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Parent comment not found")
+    record_activity(db, ticket_id, project_id, current_user.id, "commented", {"comment_id": [None, row["id"]]})
+    await publish(db, project_id, "comment.created", row["id"], dict(row))
     await db.commit()
-    await db.refresh(db_comment)
-    
-    result = await db.execute(
-        select(Comment)
-        .where(Comment.id == db_comment.id)
-        .options(selectinload(Comment.author), selectinload(Comment.replies))
-    )
-    return result.scalars().first()
+    # The author is the caller and a new comment has no replies
+    return CommentResponse(**row, author=UserResponse.model_validate(current_user))
 
 @router.get("/{ticket_id}/comments", response_model=List[CommentResponse])
 async def list_comments(
     project_id: int,
     ticket_id: int,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    depth: Optional[int] = Query(None, ge=0, description="Deepest reply level to include; top-level comments are depth 0"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    workspace_id: int = Depends(require_project_access)
 ):
+    ticket_result = await db.execute(select(Ticket.id).where(Ticket.id == ticket_id, Ticket.project_id == project_id))
+    if ticket_result.scalar() is None:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+
+    threads, has_more = await load_comment_threads(db, ticket_id, limit, after=decode_cursor(cursor, 2), max_depth=depth)
+    if has_more:
+        last = threads[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+    if FAST_JSON_RESPONSES:
+        return model_json_response(List[CommentResponse], threads, response)
+    return threads
+
+@router.get("/{ticket_id}/activity", response_model=List[TicketActivityResponse])
+async def list_ticket_activity(
+    project_id: int,
+    ticket_id: int,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user),
+    workspace_id: int = Depends(require_project_access)
+):
+    # Newest first, keyset over (created_at, id). History is kept after the
+    # ticket is deleted. Entries appear once the batched writer has flushed
+    # them, normally within ACTIVITY_FLUSH_SECONDS of the change.
+    query = select(TicketActivity).where(TicketActivity.ticket_id == ticket_id, TicketActivity.project_id == project_id)
+    after = decode_cursor(cursor, 2)
+    if after:
+        query = query.where(tuple_(TicketActivity.created_at, TicketActivity.id) < tuple_(*after))
     result = await db.execute(
-        select(Comment)
-        .where(Comment.ticket_id == ticket_id, Comment.parent_id == None)
-        .options(selectinload(Comment.author), selectinload(Comment.replies))
+        query.order_by(TicketActivity.created_at.desc(), TicketActivity.id.desc()).limit(limit + 1)
     )
-    return result.scalars().all()
+    entries = result.scalars().all()
+    if len(entries) > limit:
+        entries = entries[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(entries[-1].created_at, entries[-1].id)
+    return entries
 
 @router.post("/{ticket_id}/attachments", response_model=AttachmentResponse)
 async def create_attachment(
@@ -190,15 +479,99 @@ async def create_attachment(
     ticket_id: int,
     file: UploadFile = File(...),
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    workspace_id: int = Depends(require_project_access)
 ):
-    file_url = f"/uploads/{file.filename}"
+    ticket_result = await db.execute(select(Ticket.id).where(Ticket.id == ticket_id, Ticket.project_id == project_id))
+    if ticket_result.scalar() is None:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+
+    stored = await store_upload(file)
     db_attachment = Attachment(
-        file_name=file.filename,
-        file_url=file_url,
-        ticket_id=ticket_id
+        file_name=file.filename or "attachment",
+        file_url="",
+        ticket_id=ticket_id,
+        sha256=stored.sha256,
+        size=stored.size,
+        content_type=file.content_type
     )
     db.add(db_attachment)
+    await db.flush()
+    db_attachment.file_url = f"/projects/{project_id}/tickets/{ticket_id}/attachments/{db_attachment.id}"
+    await _touch_ticket(db, ticket_id)
+    enqueue(db, process_attachment, {"attachment_id": db_attachment.id})
     await db.commit()
     await db.refresh(db_attachment)
     return db_attachment
+
+@router.get("/{ticket_id}/attachments/{attachment_id}")
+async def download_attachment(
+    project_id: int,
+    ticket_id: int,
+    attachment_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+    workspace_id: int = Depends(require_project_access)
+):
+    result = await db.execute(
+        select(Attachment.file_name, Attachment.sha256, Attachment.size, Attachment.content_type)
+        .join(Ticket, Ticket.id == Attachment.ticket_id)
+        .where(Attachment.id == attachment_id, Attachment.ticket_id == ticket_id, Ticket.project_id == project_id)
+    )
+    attachment = result.first()
+    # Attachments recorded before content was stored have nothing to serve
+    if attachment is None or attachment.sha256 is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Attachment not found")
+    return stored_file_response(request, attachment.sha256, attachment.size, attachment.file_name, attachment.content_type)
+
+# Cross-workspace views of the current user's work
+@me_router.get("/tickets", response_model=List[AssignedTicket])
+async def list_my_tickets(
+    response: Response,
+    status: Optional[List[TicketStatus]] = Query(None),
+    priority: Optional[List[TicketPriority]] = Query(None),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    # Tickets assigned to the caller in every workspace they still have
+    # access to, newest first with the same (updated_at, id) keyset as the
+    # board summary. Access is checked in the query itself, so an assignment
+    # left behind in a workspace the user has left is not returned.
+    accessible = (
+        select(Workspace.id).where(Workspace.owner_id == current_user.id)
+        .union(select(workspace_members.c.workspace_id).where(workspace_members.c.user_id == current_user.id))
+    )
+    query = (
+        select(Ticket, Project.workspace_id, Project.name, *_count_columns())
+        .join(Project, Project.id == Ticket.project_id)
+        .where(Ticket.assignee_id == current_user.id, Project.workspace_id.in_(accessible))
+        # The assignee is always the caller
+        .options(noload(Ticket.assignee))
+    )
+    if status:
+        query = query.where(Ticket.status.in_(status))
+    if priority:
+        query = query.where(Ticket.priority.in_(priority))
+    after = decode_cursor(cursor, 2)
+    if after:
+        query = query.where(tuple_(Ticket.updated_at, Ticket.id) < tuple_(*after))
+
+    result = await db.execute(query.order_by(Ticket.updated_at.desc(), Ticket.id.desc()).limit(limit + 1))
+    rows = result.all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1][0]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.updated_at, last.id)
+
+    assignee = UserResponse.model_validate(current_user)
+    return [
+        AssignedTicket(**{
+            **TicketSummary.model_validate(ticket).model_dump(),
+            "assignee": assignee, "workspace_id": workspace_id, "project_name": project_name,
+            "comment_count": comments, "attachment_count": attachments,
+        })
+        for ticket, workspace_id, project_name, comments, attachments in rows
+    ]
@@ -0,0 +1,76 @@
+from collections import defaultdict
+from typing import Dict, List
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..models import Attachment, Comment, Ticket, User
+
+# Column lists mirror the response schemas, so the dicts built here serialize
+# to the same JSON as TicketResponse without creating any ORM instances.
+_USER_COLUMNS = (User.email, User.full_name, User.role, User.id, User.created_at)
+_TICKET_COLUMNS = (
+    Ticket.title, Ticket.description, Ticket.status, Ticket.priority, Ticket.ticket_type,
+    Ticket.project_id, Ticket.assignee_id, Ticket.id, Ticket.created_at, Ticket.updated_at, Ticket.board_rank,
+)
+_COMMENT_COLUMNS = (Comment.content, Comment.ticket_id, Comment.parent_id, Comment.id, Comment.user_id, Comment.created_at)
+_ATTACHMENT_COLUMNS = (
+    Attachment.file_name, Attachment.file_url, Attachment.ticket_id, Attachment.id,
+    Attachment.created_at, Attachment.size, Attachment.content_type,
+)
+_USER_KEYS = [column.key for column in _USER_COLUMNS]
+_COMMENT_KEYS = [column.key for column in _COMMENT_COLUMNS]
+
+
+def _user(row, offset: int = 0) -> dict:
+    return dict(zip(_USER_KEYS, row[offset:offset + len(_USER_KEYS)]))
+
+
+async def load_ticket_dicts(db: AsyncSession, ticket_query) -> List[dict]:
+    """Run ``ticket_query`` (a filtered ``select(Ticket)``) and return TicketResponse-shaped dicts.
+
+    Uses four column queries: tickets, assignees, attachments, and comments
+    joined to their authors.
+    """
+    result = await db.execute(ticket_query.with_only_columns(*_TICKET_COLUMNS))
+    tickets = [dict(row._mapping) for row in result]
+    if not tickets:
+        return tickets
+    ticket_ids = [ticket["id"] for ticket in tickets]
+
+    assignees: Dict[int, dict] = {}
+    assignee_ids = {ticket["assignee_id"] for ticket in tickets if ticket["assignee_id"] is not None}
+    if assignee_ids:
+        result = await db.execute(select(*_USER_COLUMNS).where(User.id.in_(assignee_ids)))
+        assignees = {row.id: _user(row) for row in result}
+
+    attachments = defaultdict(list)
+    result = await db.execute(
+        select(*_ATTACHMENT_COLUMNS).where(Attachment.ticket_id.in_(ticket_ids)).order_by(Attachment.id)
+    )
+    for row in result:
+        attachments[row.ticket_id].append(dict(row._mapping))
+
+    # Every comment of the ticket is listed, each with its full reply tree,
+    # matching what the selectinload-based path returns.
+    comments = defaultdict(list)
+    replies = defaultdict(list)
+    result = await db.execute(
+        select(*_COMMENT_COLUMNS, *_USER_COLUMNS)
+        .join(User, User.id == Comment.user_id)
+        .where(Comment.ticket_id.in_(ticket_ids))
+        .order_by(Comment.id)
+    )
+    for row in result:
+        comment = dict(zip(_COMMENT_KEYS, row))
+        comment["author"] = _user(row, len(_COMMENT_COLUMNS))
+        comment["replies"] = replies[comment["id"]]
+        comments[comment["ticket_id"]].append(comment)
+        if comment["parent_id"] is not None:
+            replies[comment["parent_id"]].append(comment)
+
+    for ticket in tickets:
+        ticket["assignee"] = assignees.get(ticket["assignee_id"])
+        ticket["comments"] = comments[ticket["id"]]
+        ticket["attachments"] = attachments[ticket["id"]]
+    return tickets
@@ -0,0 +1,79 @@
+import re
+from typing import Optional
+
+from sqlalchemy import func, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from ..cache import TTLCache
+from ..database import IS_POSTGRES
+from ..models import Ticket
+
+# Must match the text search configuration of the generated column created
+# in migration 7d2f1c9a4b10.
+SEARCH_CONFIG = "english"
+HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10, MaxFragments=2"
+
+# tickets.search_vector is a STORED generated tsvector over title (weight A)
+# and description (weight B), with a GIN index. It only exists on Postgres,
+# so it is referenced here rather than mapped on the model.
+search_vector = literal_column("tickets.search_vector", type_=TSVECTOR)
+
+# tsquery text -> whether it reduces to an empty query. Fixed for a given
+# text and configuration, so kept for a long time (per worker).
+_empty_queries = TTLCache(10000, 24 * 3600)
+
+
+def prefix_query(search: str) -> Optional[str]:
+    """Turn free text into a tsquery where every word is a prefix match."""
+    words = re.findall(r"\w+", search.lower())
+    if not words:
+        return None
+    return " & ".join(f"{word}:*" for word in words)
+
+
+def _tsquery(search: str):
+    return func.to_tsquery(SEARCH_CONFIG, prefix_query(search))
+
+
+async def uses_full_text(db: AsyncSession, search: str) -> bool:
+    """Whether ``search`` is matched against the tsvector index rather than with ilike.
+
+    Not off Postgres, and not for text whose tsquery is empty: stop words
+    only ("the", "a to") or no words at all. Such a tsquery matches nothing,
+    so those searches keep the substring matching they had before full-text
+    search. Each distinct query text is checked with the database once.
+    """
+    if not IS_POSTGRES:
+        return False
+    query_text = prefix_query(search)
+    if query_text is None:
+        return False
+    empty = _empty_queries.get(query_text)
+    if empty is None:
+        nodes = await db.execute(select(func.numnode(func.to_tsquery(SEARCH_CONFIG, query_text))))
+        empty = nodes.scalar() == 0
+        _empty_queries.set(query_text, empty)
+    return not empty
+
+
+def apply_search(query, search: str, full_text: bool):
+    if not full_text:
+        return query.where(
+            (Ticket.title.ilike(f"%{search}%")) | (Ticket.description.ilike(f"%{search}%"))
+        )
+    return query.where(search_vector.op("@@", is_comparison=True)(_tsquery(search)))
+
+
+def search_rank(search: str, full_text: bool):
+    if not full_text:
+        return literal_column("0.0")
+    return func.ts_rank(search_vector, _tsquery(search))
+
+
+def search_snippet(search: str, full_text: bool):
+    if not full_text:
+        return literal_column("NULL")
+    document = func.concat_ws(" - ", Ticket.title, Ticket.description)
+    return func.ts_headline(SEARCH_CONFIG, document, _tsquery(search), HEADLINE_OPTIONS)
@@ -0,0 +1,41 @@
+import logging
+import os
+from time import perf_counter
+
+from jose import jwt
+from passlib.hash import bcrypt
+from sqlalchemy.future import select
+from sqlalchemy.orm import configure_mappers
+
+from .auth.hashing import hashing_pool
+from .auth.utils import ALGORITHM, SECRET_KEY, create_access_token
+from .database import SessionLocal, engine, warm_up_pool
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+# Pay the one-off costs of the first login and first authenticated request at
+# startup instead: ORM mapper configuration, compiling the per-request user
+# lookup, passlib's bcrypt backend load and self-test, a hashing pool thread,
+# and python-jose's signing and verification setup
+WARM_STARTUP = os.getenv("WARM_STARTUP", "true").lower() in ("1", "true", "yes")
+
+
+async def warm_up() -> None:
+    """Open DB_POOL_WARMUP pooled connections and, with WARM_STARTUP, exercise the ORM, bcrypt and JWT paths."""
+    start = perf_counter()
+    await warm_up_pool(engine)
+    if not WARM_STARTUP:
+        return
+    try:
+        configure_mappers()
+        async with SessionLocal() as db:
+            # Same statement as the token lookup in get_current_user, so its compiled form is cached
+            await db.execute(select(User).where(User.id == 0))
+        # Minimum cost: loading the backend is the point, not the hash itself
+        await hashing_pool.run(bcrypt.using(rounds=4).hash, "warm-up")
+        jwt.decode(create_access_token({"sub": "warm-up"}), SECRET_KEY, algorithms=[ALGORITHM])
+    except Exception:
+        logger.warning("Startup warm-up failed", exc_info=True)
+        return
+    logger.info("Warmed up in %.0f ms", (perf_counter() - start) * 1000)
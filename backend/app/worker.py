@@ -0,0 +1,43 @@
+"""Standalone background job worker.
+
+    python -m app.worker                      # every queue with a handler
+    python -m app.worker --queues attachments # only these queues
+
+Run any number of these next to (or instead of) the in-process workers; set
+JOB_WORKERS_IN_PROCESS=false on the API to leave all jobs to them. SIGTERM
+stops claiming and lets running jobs finish for up to JOB_SHUTDOWN_SECONDS.
+"""
+import argparse
+import asyncio
+import signal
+
+from .database import engine
+from .jobs.worker import WorkerPool
+from .log import configure_logging
+from .middleware import instrument_engine
+
+
+async def run(queues) -> None:
+    pool = WorkerPool(queues)
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+    await pool.start()
+    await stopping.wait()
+    await pool.stop()
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queues", help="comma-separated queue names (default: all)")
+    args = parser.parse_args()
+    configure_logging()
+    instrument_engine(engine)
+    queues = [queue.strip() for queue in args.queues.split(",") if queue.strip()] if args.queues else None
+    asyncio.run(run(queues))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import json
+import math
+import platform
+import subprocess
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int = 0) -> Dict[str, float]:
+    """Throughput and latency percentiles (milliseconds) for one measured run."""
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_results(path: str, benchmark: str, params: dict, results: dict) -> None:
+    payload = {
+        "benchmark": benchmark,
+        "revision": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "params": params,
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+        f.write("\n")
+
+
+def print_table(results: Dict[str, Dict[str, float]], title: str = "name") -> None:
+    columns = ["requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms"]
+    width = max([len(title)] + [len(name) for name in results]) + 2
+    print(title.ljust(width) + "".join(c.rjust(16) for c in columns))
+    for name, row in results.items():
+        print(name.ljust(width) + "".join(str(row.get(c, "")).rjust(16) for c in columns))
@@ -0,0 +1,67 @@
+"""Compare two benchmark result files written with --json, e.g. before and after a change:
+
+    python -m benchmarks.compare before.json after.json
+    python -m benchmarks.compare before.json after.json --threshold 10
+
+Prints the relative change of throughput and each latency percentile per row.
+With --threshold, exits non-zero if any p95/p99 got slower (or throughput
+dropped) by more than that many percent.
+"""
+import argparse
+import json
+import sys
+
+METRICS = ["throughput_rps", "p50_ms", "p95_ms", "p99_ms"]
+# Metrics where a higher value is a regression
+LATENCY_METRICS = ("p95_ms", "p99_ms")
+
+
+def load(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def change(old: float, new: float) -> float:
+    return (new - old) / old * 100 if old else 0.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=None, help="allowed regression in percent")
+    args = parser.parse_args()
+
+    baseline, candidate = load(args.baseline), load(args.candidate)
+    if baseline["benchmark"] != candidate["benchmark"]:
+        raise SystemExit(f"Different benchmarks: {baseline['benchmark']} vs {candidate['benchmark']}")
+    print(f"{baseline['benchmark']}: {baseline.get('revision')} -> {candidate.get('revision')}")
+    for key in sorted((set(baseline["params"]) | set(candidate["params"])) - {"scenarios", "configs"}):
+        if baseline["params"].get(key) != candidate["params"].get(key):
+            print(f"  warning: {key} differs ({baseline['params'].get(key)} vs {candidate['params'].get(key)})")
+
+    names = [name for name in baseline["results"] if name in candidate["results"]]
+    width = max([len("name")] + [len(name) for name in names]) + 2
+    print("name".ljust(width) + "".join(m.rjust(32) for m in METRICS))
+    regressions = []
+    for name in names:
+        old, new = baseline["results"][name], candidate["results"][name]
+        cells = []
+        for metric in METRICS:
+            pct = change(old[metric], new[metric])
+            cells.append(f"{old[metric]} -> {new[metric]} ({pct:+.1f}%)".rjust(32))
+            worse = pct if metric in LATENCY_METRICS else -pct if metric == "throughput_rps" else 0.0
+            if args.threshold is not None and worse > args.threshold:
+                regressions.append(f"{name} {metric} {pct:+.1f}%")
+        print(name.ljust(width) + "".join(cells))
+
+    if regressions:
+        print("\nregressions over {}%:".format(args.threshold))
+        for line in regressions:
+            print("  " + line)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Engine configuration benchmark: pool sizing, pre-ping, statement caching, pgbouncer mode.
+
+Runs the same read workload against DATABASE_URL once per engine configuration
+and reports throughput and latency percentiles for each, e.g.:
+
+    python -m benchmarks.pool --concurrency 32 --duration 10
+    python -m benchmarks.pool --configs default,no_statement_cache --json pool.json
+
+Point DATABASE_URL at pgbouncer (transaction mode) to compare the pgbouncer
+configuration against direct connections. Needs a migrated database with
+some tickets in it.
+"""
+import argparse
+import asyncio
+from time import perf_counter
+
+from sqlalchemy import text
+
+from app.database import DATABASE_URL, create_engine_from_settings
+from benchmarks.common import print_table, summarize, write_results
+
+CONFIGS = {
+    "default": {},
+    "small_pool": {"pool_size": 2, "max_overflow": 0},
+    "large_pool": {"pool_size": 20, "max_overflow": 10},
+    "pre_ping": {"pool_pre_ping": True},
+    "no_statement_cache": {"statement_cache_size": 0},
+    "pgbouncer": {"pgbouncer": True},
+}
+
+QUERY = text(
+    "SELECT id, title, status, priority, updated_at FROM tickets "
+    "WHERE project_id = :project_id ORDER BY updated_at DESC, id DESC LIMIT 50"
+)
+
+
+async def _worker(engine, project_id: int, deadline: float, latencies: list, errors: list) -> None:
+    while perf_counter() < deadline:
+        start = perf_counter()
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(QUERY, {"project_id": project_id})
+        except Exception:
+            errors.append(1)
+            continue
+        latencies.append(perf_counter() - start)
+
+
+async def run_config(name: str, overrides: dict, args) -> dict:
+    engine = create_engine_from_settings(args.url, **overrides)
+    try:
+        async with engine.connect() as conn:
+            project_id = args.project_id or (await conn.execute(text("SELECT min(project_id) FROM tickets"))).scalar() or 1
+        # Warm-up pass so connection setup isn't counted
+        warm_latencies, warm_errors = [], []
+        await asyncio.gather(*(
+            _worker(engine, project_id, perf_counter() + args.warmup, warm_latencies, warm_errors)
+            for _ in range(args.concurrency)
+        ))
+        latencies, errors = [], []
+        start = perf_counter()
+        await asyncio.gather(*(
+            _worker(engine, project_id, start + args.duration, latencies, errors)
+            for _ in range(args.concurrency)
+        ))
+        return summarize(latencies, perf_counter() - start, len(errors))
+    finally:
+        await engine.dispose()
+
+
+async def main(args) -> None:
+    results = {}
+    for name in args.configs.split(","):
+        results[name] = await run_config(name, CONFIGS[name], args)
+        print(f"{name}: {results[name]['throughput_rps']} req/s")
+    print()
+    print_table(results, "config")
+    if args.json:
+        write_results(args.json, "pool", {k: v for k, v in vars(args).items() if k not in ("url", "json")}, results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DATABASE_URL)
+    parser.add_argument("--configs", default=",".join(CONFIGS))
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds measured per configuration")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before each run")
+    parser.add_argument("--project-id", type=int, default=None)
+    parser.add_argument("--json", help="write results to this JSON file")
+    asyncio.run(main(parser.parse_args()))
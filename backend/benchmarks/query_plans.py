@@ -0,0 +1,126 @@
+"""Query-plan regression check for the API's read paths.
+
+Calls each read endpoint in-process as the seeded workspace owner, captures
+every SELECT it issues, runs EXPLAIN on it with the same parameters and fails
+if any plan sequentially scans one of the large tables:
+
+    python -m benchmarks.seed
+    python -m benchmarks.query_plans --verbose
+
+Uses the database in DATABASE_URL, which must be Postgres and seeded with
+benchmarks.seed (small tables are legitimately seq-scanned). Needs httpx.
+Exits non-zero when a plan regresses, so it can gate CI against a seeded
+database.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from typing import Dict, Iterator, List, Tuple
+
+import httpx
+from sqlalchemy import event
+
+from app.auth.utils import create_access_token
+from app.database import IS_POSTGRES, engine
+from app.main import app
+from benchmarks.seed import OWNER_EMAIL, seeded_ids
+
+LARGE_TABLES = ("tickets", "comments", "attachments")
+
+ENDPOINTS = [
+    "/workspaces/",
+    "/workspaces/{workspace_id}/projects",
+    "/workspaces/{workspace_id}/members",
+    "/workspaces/{workspace_id}/stats",
+    "/projects/{project_id}/tickets/?status=done",
+    "/projects/{project_id}/tickets/?priority=high",
+    "/projects/{project_id}/tickets/summary?limit=50",
+    "/projects/{project_id}/tickets/search?q=timeout",
+    "/projects/{project_id}/tickets/{ticket_id}",
+    "/projects/{project_id}/tickets/{ticket_id}/comments",
+    "/me/tickets?status=backlog&status=in_progress",
+]
+
+_captured: List[Tuple[str, object]] = []
+
+
+def _capture(conn, cursor, statement, parameters, context, executemany):
+    if statement.lstrip().upper().startswith(("SELECT", "WITH")):
+        _captured.append((statement, parameters))
+
+
+def plan_nodes(plan: dict) -> Iterator[dict]:
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from plan_nodes(child)
+
+
+async def explain(statement: str, parameters) -> dict:
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters)
+        plan = result.scalar()
+    return (json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"]
+
+
+async def fixture_ids() -> Dict[str, int]:
+    ids = await seeded_ids(engine)
+    if ids is None:
+        raise SystemExit("No seeded data found; run python -m benchmarks.seed first")
+    return ids
+
+
+async def check(args) -> int:
+    if not IS_POSTGRES:
+        raise SystemExit("Query plans are only meaningful on Postgres; point DATABASE_URL at a seeded database")
+    ids = await fixture_ids()
+    token = create_access_token({"sub": OWNER_EMAIL, "uid": ids["user_id"]})
+    tables = set(args.tables.split(","))
+    event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+
+    failures = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for template in ENDPOINTS:
+            path = template.format(**ids)
+            _captured.clear()
+            response = await client.get(path, headers={"Authorization": f"Bearer {token}"})
+            statements = list(_captured)
+            print(f"{path}  [{response.status_code}, {len(statements)} queries]")
+            if response.status_code != 200:
+                failures += 1
+                continue
+            for statement, parameters in statements:
+                # The capture hook must not see the EXPLAINs themselves
+                event.remove(engine.sync_engine, "before_cursor_execute", _capture)
+                try:
+                    plan = await explain(statement, parameters)
+                finally:
+                    event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+                nodes = list(plan_nodes(plan))
+                seq_scans = sorted({
+                    node["Relation Name"] for node in nodes
+                    if node["Node Type"] == "Seq Scan" and node.get("Relation Name") in tables
+                })
+                indexes = sorted({node["Index Name"] for node in nodes if "Index Name" in node})
+                status = "FAIL" if seq_scans else "ok"
+                failures += bool(seq_scans)
+                summary = " ".join(statement.split())[:100]
+                print(f"  {status:<4} cost={plan['Total Cost']:<10} indexes={','.join(indexes) or '-'}"
+                      + (f" seq_scan={','.join(seq_scans)}" if seq_scans else ""))
+                if seq_scans or args.verbose:
+                    print(f"       {summary}")
+    await engine.dispose()
+    print("query plans:", "FAILED" if failures else "ok")
+    return 1 if failures else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", default=",".join(LARGE_TABLES), help="tables that must never be sequentially scanned")
+    parser.add_argument("--verbose", action="store_true", help="print every statement, not just failing ones")
+    sys.exit(asyncio.run(check(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
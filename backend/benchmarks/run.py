@@ -0,0 +1,154 @@
+"""End-to-end endpoint benchmark: the real ASGI app, in process, at fixed concurrency.
+
+Drives each scenario through httpx's ASGI transport (middleware, auth, routing,
+serialization and the database all included, no network) as the seeded
+workspace owner and reports throughput and latency percentiles per endpoint:
+
+    python -m benchmarks.seed
+    python -m benchmarks.run --concurrency 16 --duration 10 --json before.json
+    python -m benchmarks.compare before.json after.json
+
+Uses the database in DATABASE_URL. Without Postgres, a SQLite file works as a
+stand-in and --seed fills it first (numbers are only comparable against runs
+on the same backend and volumes):
+
+    DATABASE_URL=sqlite+aiosqlite:///bench.db python -m benchmarks.run --seed --tickets 500
+
+Write scenarios create and update tickets in the first seeded project, so
+re-seed (or use a throwaway database) for strictly repeatable runs. Needs httpx.
+"""
+import argparse
+import asyncio
+import logging
+import random
+from time import perf_counter
+from typing import Awaitable, Callable, Dict
+
+import httpx
+
+from app.auth.utils import create_access_token
+from app.database import engine
+from app.main import app
+from benchmarks.common import print_table, summarize, write_results
+from benchmarks.seed import OWNER_EMAIL, add_volume_arguments, seed, seeded_ids
+
+Scenario = Callable[[httpx.AsyncClient, Dict[str, int], random.Random], Awaitable[httpx.Response]]
+
+
+def _get(template: str) -> Scenario:
+    async def call(client, ids, rng):
+        return await client.get(template.format(**ids))
+    return call
+
+
+async def _get_ticket(client, ids, rng):
+    ticket_id = ids["ticket_id"] + rng.randrange(ids["ticket_span"])
+    return await client.get(f"/projects/{ids['project_id']}/tickets/{ticket_id}")
+
+
+async def _create_ticket(client, ids, rng):
+    return await client.post(f"/projects/{ids['project_id']}/tickets/", json={
+        "title": f"Benchmark ticket {rng.randrange(1_000_000)}",
+        "description": "Created by benchmarks.run",
+        "priority": "low",
+        "project_id": ids["project_id"],
+    })
+
+
+async def _update_ticket(client, ids, rng):
+    ticket_id = ids["ticket_id"] + rng.randrange(ids["ticket_span"])
+    return await client.patch(
+        f"/projects/{ids['project_id']}/tickets/{ticket_id}",
+        json={"status": rng.choice(["backlog", "in_progress", "done"])},
+    )
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "list_workspaces": _get("/workspaces/"),
+    "list_projects": _get("/workspaces/{workspace_id}/projects"),
+    "workspace_stats": _get("/workspaces/{workspace_id}/stats"),
+    "list_tickets": _get("/projects/{project_id}/tickets/"),
+    "list_tickets_filtered": _get("/projects/{project_id}/tickets/?status=done&priority=high"),
+    "ticket_summary": _get("/projects/{project_id}/tickets/summary?limit=50"),
+    "search_tickets": _get("/projects/{project_id}/tickets/search?q=timeout"),
+    "get_ticket": _get_ticket,
+    "list_comments": _get("/projects/{project_id}/tickets/{ticket_id}/comments"),
+    "create_ticket": _create_ticket,
+    "update_ticket": _update_ticket,
+}
+
+
+async def _worker(client, scenario: Scenario, ids: dict, rng: random.Random, deadline: float,
+                  latencies: list, errors: list) -> None:
+    while perf_counter() < deadline:
+        start = perf_counter()
+        try:
+            response = await scenario(client, ids, rng)
+        except Exception:
+            errors.append(1)
+            continue
+        if response.status_code >= 400:
+            errors.append(1)
+            continue
+        latencies.append(perf_counter() - start)
+
+
+async def run_scenario(client, scenario: Scenario, ids: dict, args) -> dict:
+    # Seeded per worker so every run issues the same request sequence
+    rngs = [random.Random(args.random_seed + i) for i in range(args.concurrency)]
+    warm_latencies, warm_errors = [], []
+    await asyncio.gather(*(
+        _worker(client, scenario, ids, rng, perf_counter() + args.warmup, warm_latencies, warm_errors)
+        for rng in rngs
+    ))
+    latencies, errors = [], []
+    start = perf_counter()
+    await asyncio.gather(*(
+        _worker(client, scenario, ids, rng, start + args.duration, latencies, errors)
+        for rng in rngs
+    ))
+    return summarize(latencies, perf_counter() - start, len(errors))
+
+
+async def main(args) -> None:
+    # Per-request client logging is the benchmark's own overhead, not the app's
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    if args.seed:
+        await seed(args, engine)
+    ids = await seeded_ids(engine)
+    if ids is None:
+        raise SystemExit("No seeded data found; run python -m benchmarks.seed first (or pass --seed)")
+    # get/update spread over the first tickets of the project, not just one hot row
+    ids["ticket_span"] = max(1, min(args.tickets, 100))
+    token = create_access_token({"sub": OWNER_EMAIL, "uid": ids["user_id"]})
+
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    # Run inside the app's lifespan so startup work (pool warm-up, realtime hub) happens as in production
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", headers={"Authorization": f"Bearer {token}"}
+        ) as client:
+            for name in args.scenarios.split(","):
+                results[name] = await run_scenario(client, SCENARIOS[name], ids, args)
+                print(f"{name}: {results[name]['throughput_rps']} req/s, p99 {results[name]['p99_ms']} ms")
+    await engine.dispose()
+    print()
+    print_table(results, "scenario")
+    if args.json:
+        params = {k: v for k, v in vars(args).items() if k not in ("json", "password", "seed")}
+        params["backend"] = engine.dialect.name
+        write_results(args.json, "endpoints", params, results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds measured per scenario")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds before each scenario")
+    parser.add_argument("--random-seed", type=int, default=1)
+    parser.add_argument("--json", help="write results to this JSON file")
+    parser.add_argument("--seed", action="store_true", help="seed DATABASE_URL with the volumes below first")
+    add_volume_arguments(parser, users=50, workspaces=2, projects=2, tickets=500, comments=3)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,234 @@
+"""Seed a large synthetic dataset into a migrated Postgres database or a SQLite stand-in.
+
+On Postgres everything is generated server-side with generate_series, so a
+few million rows take seconds rather than minutes. Other backends get their
+tables created and rows inserted from Python:
+
+    python -m benchmarks.seed --workspaces 20 --projects 10 --tickets 5000
+    python -m benchmarks.seed --url sqlite+aiosqlite:///bench.db --workspaces 2 --tickets 500
+
+All seeded users share the password given by --password. The owner of every
+workspace is bench-owner@example.com; the first project id is printed at the end.
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.utils import get_password_hash
+from app.database import Base, DATABASE_URL, create_engine_from_settings
+from app.models import (
+    Attachment, Comment, Project, Ticket, TicketPriority, TicketStatus, TicketType,
+    User, UserRole, Workspace, workspace_members,
+)
+from app.tickets.counters import rebuild_ticket_counts
+
+OWNER_EMAIL = "bench-owner@example.com"
+
+STEPS = [
+    ("users", """
+        INSERT INTO users (email, hashed_password, full_name, role, created_at)
+        SELECT 'bench-' || g || '@example.com', :hash, 'Bench User ' || g, 'MEMBER', now()
+        FROM generate_series(1, :users) g
+        ON CONFLICT (email) DO NOTHING
+    """),
+    ("workspaces", """
+        INSERT INTO workspaces (name, description, owner_id, created_at)
+        SELECT 'Bench workspace ' || g, 'Seeded', (SELECT id FROM users WHERE email = :owner), now()
+        FROM generate_series(1, :workspaces) g
+    """),
+    ("workspace_members", """
+        INSERT INTO workspace_members (workspace_id, user_id, joined_at)
+        SELECT w.id, u.id, now()
+        FROM workspaces w
+        JOIN users u ON u.email LIKE 'bench-%' AND u.email <> :owner AND (u.id + w.id) % 4 = 0
+        WHERE w.description = 'Seeded'
+        ON CONFLICT DO NOTHING
+    """),
+    ("projects", """
+        INSERT INTO projects (name, workspace_id, created_at)
+        SELECT 'Bench project ' || g, w.id, now()
+        FROM workspaces w, generate_series(1, :projects) g
+        WHERE w.description = 'Seeded'
+    """),
+    ("tickets", """
+        INSERT INTO tickets (title, description, status, priority, ticket_type, project_id, assignee_id, created_at, updated_at, board_rank)
+        SELECT
+            'Ticket ' || g || ' ' || (ARRAY['login', 'crash', 'timeout', 'layout', 'export', 'billing'])[1 + g % 6],
+            'Steps to reproduce the ' || (ARRAY['login', 'crash', 'timeout', 'layout', 'export', 'billing'])[1 + g % 6] || ' problem, case ' || g,
+            ((ARRAY['BACKLOG', 'IN_PROGRESS', 'DONE'])[1 + g % 3])::ticketstatus,
+            ((ARRAY['LOW', 'MEDIUM', 'HIGH', 'CRITICAL'])[1 + g % 4])::ticketpriority,
+            ((ARRAY['BUG', 'TASK', 'FEATURE'])[1 + g % 3])::tickettype,
+            p.id,
+            (SELECT min(id) FROM users WHERE email LIKE 'bench-%') + (g % :users),
+            now() - make_interval(mins => g),
+            now() - make_interval(mins => g),
+            lpad(to_hex(g), 8, '0') || 'i'
+        FROM projects p
+        JOIN workspaces w ON w.id = p.workspace_id AND w.description = 'Seeded'
+        CROSS JOIN generate_series(1, :tickets) g
+    """),
+    ("comments", """
+        INSERT INTO comments (content, ticket_id, user_id, parent_id, created_at)
+        SELECT 'Comment ' || g, t.id, t.assignee_id, NULL, t.created_at + make_interval(mins => g)
+        FROM tickets t
+        JOIN projects p ON p.id = t.project_id
+        JOIN workspaces w ON w.id = p.workspace_id AND w.description = 'Seeded'
+        CROSS JOIN generate_series(1, :comments) g
+    """),
+    ("replies", """
+        INSERT INTO comments (content, ticket_id, user_id, parent_id, created_at)
+        SELECT 'Reply to ' || c.id, c.ticket_id, c.user_id, c.id, c.created_at + interval '1 minute'
+        FROM comments c
+        WHERE c.parent_id IS NULL AND c.id % 2 = 0 AND c.content LIKE 'Comment %'
+    """),
+    ("attachments", """
+        INSERT INTO attachments (file_name, file_url, ticket_id, created_at)
+        SELECT 'trace-' || t.id || '.log', '', t.id, t.created_at
+        FROM tickets t
+        JOIN projects p ON p.id = t.project_id
+        JOIN workspaces w ON w.id = p.workspace_id AND w.description = 'Seeded'
+        WHERE t.id % 5 = 0
+    """),
+]
+
+
+async def _insert(conn, name: str, table, rows: list) -> list:
+    """Insert ``rows`` and return their ids in row order (empty for association tables)."""
+    ids = []
+    if rows and hasattr(table, "id"):
+        result = await conn.execute(insert(table).returning(table.id, sort_by_parameter_order=True), rows)
+        ids = result.scalars().all()
+    elif rows:
+        await conn.execute(insert(table), rows)
+    print(f"{name:<18} {len(rows):>10} rows")
+    return ids
+
+
+async def _seed_portable(engine, args, password_hash: str) -> None:
+    """Same shape of data as STEPS, generated in Python for backends without generate_series."""
+    now = datetime.utcnow()
+    topics = ["login", "crash", "timeout", "layout", "export", "billing"]
+    statuses, priorities, types = list(TicketStatus), list(TicketPriority), list(TicketType)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        owner_id = (await conn.execute(insert(User).returning(User.id), {
+            "email": OWNER_EMAIL, "hashed_password": password_hash, "full_name": "Bench Owner",
+            "role": UserRole.ADMIN, "created_at": now,
+        })).scalar()
+        user_ids = await _insert(conn, "users", User, [{
+            "email": f"bench-{g}@example.com", "hashed_password": password_hash,
+            "full_name": f"Bench User {g}", "role": UserRole.MEMBER, "created_at": now,
+        } for g in range(1, args.users + 1)])
+        workspace_ids = await _insert(conn, "workspaces", Workspace, [{
+            "name": f"Bench workspace {g}", "description": "Seeded", "owner_id": owner_id, "created_at": now,
+        } for g in range(1, args.workspaces + 1)])
+        await _insert(conn, "workspace_members", workspace_members, [{
+            "workspace_id": w, "user_id": u, "joined_at": now,
+        } for w in workspace_ids for u in user_ids if (u + w) % 4 == 0])
+        project_ids = await _insert(conn, "projects", Project, [{
+            "name": f"Bench project {g}", "workspace_id": w, "created_at": now,
+        } for w in workspace_ids for g in range(1, args.projects + 1)])
+        ticket_rows = [{
+            "title": f"Ticket {g} {topics[g % 6]}",
+            "description": f"Steps to reproduce the {topics[g % 6]} problem, case {g}",
+            "status": statuses[g % 3], "priority": priorities[g % 4], "ticket_type": types[g % 3],
+            "project_id": p, "assignee_id": user_ids[g % len(user_ids)] if user_ids else None,
+            "created_at": now - timedelta(minutes=g), "updated_at": now - timedelta(minutes=g),
+            "board_rank": f"{g:08x}i",
+        } for p in project_ids for g in range(1, args.tickets + 1)]
+        ticket_ids = await _insert(conn, "tickets", Ticket, ticket_rows)
+        comment_rows = [{
+            "content": f"Comment {g}", "ticket_id": t, "user_id": row["assignee_id"] or owner_id,
+            "parent_id": None, "created_at": row["created_at"] + timedelta(minutes=g),
+        } for t, row in zip(ticket_ids, ticket_rows) for g in range(1, args.comments + 1)]
+        comment_ids = await _insert(conn, "comments", Comment, comment_rows)
+        await _insert(conn, "replies", Comment, [{
+            "content": f"Reply to {c}", "ticket_id": row["ticket_id"], "user_id": row["user_id"],
+            "parent_id": c, "created_at": row["created_at"] + timedelta(minutes=1),
+        } for c, row in zip(comment_ids, comment_rows) if c % 2 == 0])
+        await _insert(conn, "attachments", Attachment, [{
+            "file_name": f"trace-{t}.log", "file_url": "", "ticket_id": t, "created_at": row["created_at"],
+        } for t, row in zip(ticket_ids, ticket_rows) if t % 5 == 0])
+
+
+async def _seed_postgres(engine, params: dict) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("INSERT INTO users (email, hashed_password, full_name, role, created_at) "
+                 "VALUES (:owner, :hash, 'Bench Owner', 'ADMIN', now()) ON CONFLICT (email) DO NOTHING"),
+            params,
+        )
+        for name, sql in STEPS:
+            result = await conn.execute(text(sql), params)
+            print(f"{name:<18} {result.rowcount:>10} rows")
+
+
+async def seeded_ids(engine) -> Optional[Dict[str, int]]:
+    """Owner user, first seeded workspace/project and that project's first ticket."""
+    async with engine.connect() as conn:
+        row = (await conn.execute(text(
+            "SELECT u.id, w.id, p.id, (SELECT min(t.id) FROM tickets t WHERE t.project_id = p.id) "
+            "FROM users u JOIN workspaces w ON w.owner_id = u.id JOIN projects p ON p.workspace_id = w.id "
+            "WHERE u.email = :owner AND w.description = 'Seeded' ORDER BY p.id LIMIT 1"
+        ), {"owner": OWNER_EMAIL})).first()
+    if row is None:
+        return None
+    return {"user_id": row[0], "workspace_id": row[1], "project_id": row[2], "ticket_id": row[3]}
+
+
+async def seed(args, engine=None) -> None:
+    """Seed into ``args.url``, or into ``engine`` when given (left open for the caller)."""
+    own_engine = engine is None
+    engine = engine or create_engine_from_settings(args.url)
+    is_postgres = engine.dialect.name == "postgresql"
+    password_hash = get_password_hash(args.password)
+    params = {
+        "hash": password_hash,
+        "owner": OWNER_EMAIL,
+        "users": args.users,
+        "workspaces": args.workspaces,
+        "projects": args.projects,
+        "tickets": args.tickets,
+        "comments": args.comments,
+    }
+    try:
+        if is_postgres:
+            await _seed_postgres(engine, params)
+        else:
+            await _seed_portable(engine, args, password_hash)
+        async with AsyncSession(engine) as session:
+            await rebuild_ticket_counts(session)
+        async with engine.begin() as conn:
+            # Fresh statistics, so the planner sees the real table sizes
+            await conn.execute(text("ANALYZE"))
+        ids = await seeded_ids(engine)
+        print(f"owner {OWNER_EMAIL} / {args.password}, first project id {ids['project_id']}")
+    finally:
+        if own_engine:
+            await engine.dispose()
+
+
+def add_volume_arguments(parser: argparse.ArgumentParser, **defaults) -> None:
+    volumes = {"users": 200, "workspaces": 20, "projects": 10, "tickets": 2000, "comments": 3, **defaults}
+    parser.add_argument("--users", type=int, default=volumes["users"])
+    parser.add_argument("--workspaces", type=int, default=volumes["workspaces"])
+    parser.add_argument("--projects", type=int, default=volumes["projects"], help="projects per workspace")
+    parser.add_argument("--tickets", type=int, default=volumes["tickets"], help="tickets per project")
+    parser.add_argument("--comments", type=int, default=volumes["comments"], help="top-level comments per ticket")
+    parser.add_argument("--password", default="bench-password")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DATABASE_URL)
+    add_volume_arguments(parser)
+    asyncio.run(seed(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
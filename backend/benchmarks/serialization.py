@@ -0,0 +1,122 @@
+"""Response serialization benchmark: default FastAPI path vs the FAST_JSON_RESPONSES paths.
+
+Builds an in-memory board (ORM instances and the equivalent plain dicts) and
+times encoding the full list_tickets payload three ways:
+
+    fastapi   response_model validation + dump_python + stdlib json (today's path)
+    adapter   cached TypeAdapter validate + dump_json (model_json_response)
+    rows      dicts built from Row tuples encoded with orjson (dict_json_response)
+
+    python -m benchmarks.serialization --tickets 500 --comments 5 --iterations 50
+
+No database is needed; only encoding is measured.
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+from time import perf_counter
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.models import Attachment, Comment, Ticket, TicketPriority, TicketStatus, TicketType, User, UserRole
+from app.schemas import TicketResponse
+from app.serialization import dict_json_response, model_json_response
+from benchmarks.common import print_table, summarize, write_results
+
+
+def build_board(tickets: int, comments: int, attachments: int) -> List[Ticket]:
+    now = datetime(2026, 1, 1)
+    users = [
+        User(id=i, email=f"user{i}@example.com", full_name=f"User {i}", role=UserRole.MEMBER, created_at=now)
+        for i in range(1, 21)
+    ]
+    board = []
+    comment_id = attachment_id = 0
+    for t in range(1, tickets + 1):
+        ticket = Ticket(
+            id=t, title=f"Ticket {t}", description="Steps to reproduce " * 5,
+            status=list(TicketStatus)[t % 3], priority=list(TicketPriority)[t % 4], ticket_type=list(TicketType)[t % 3],
+            project_id=1, assignee_id=users[t % 20].id, assignee=users[t % 20],
+            created_at=now + timedelta(minutes=t), updated_at=now + timedelta(minutes=t), board_rank=f"{t:08x}i",
+        )
+        thread = []
+        for c in range(comments):
+            comment_id += 1
+            parent = thread[-1] if c % 2 and thread else None
+            comment = Comment(
+                id=comment_id, content=f"Comment {c}", ticket_id=t, user_id=users[c % 20].id, author=users[c % 20],
+                parent_id=parent.id if parent else None, created_at=now + timedelta(minutes=t, seconds=c),
+            )
+            comment.replies = []
+            if parent:
+                parent.replies.append(comment)
+            thread.append(comment)
+        ticket.comments = thread
+        ticket.attachments = []
+        for _ in range(attachments):
+            attachment_id += 1
+            ticket.attachments.append(Attachment(
+                id=attachment_id, file_name="trace.log", file_url=f"/attachments/{attachment_id}", ticket_id=t,
+                created_at=now, size=1024, content_type="text/plain",
+            ))
+        board.append(ticket)
+    return board
+
+
+def as_dicts(board: List[Ticket]) -> List[dict]:
+    # What app.tickets.rows.load_ticket_dicts produces for the same data
+    return [TicketResponse.model_validate(t).model_dump() for t in board]
+
+
+async def encode_fastapi(board, field):
+    content = await serialize_response(field=field, response_content=board)
+    return JSONResponse(content).body
+
+
+def time_path(name: str, encode, iterations: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        encode()
+    latencies = []
+    start = perf_counter()
+    for _ in range(iterations):
+        began = perf_counter()
+        encode()
+        latencies.append(perf_counter() - began)
+    return summarize(latencies, perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickets", type=int, default=500)
+    parser.add_argument("--comments", type=int, default=5, help="comments per ticket (every other one is a reply)")
+    parser.add_argument("--attachments", type=int, default=1, help="attachments per ticket")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    board = build_board(args.tickets, args.comments, args.attachments)
+    rows = as_dicts(board)
+    field = create_model_field(name="Response_list_tickets", type_=List[TicketResponse], mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    paths = {
+        "fastapi": lambda: loop.run_until_complete(encode_fastapi(board, field)),
+        "adapter": lambda: model_json_response(List[TicketResponse], board).body,
+        "rows": lambda: dict_json_response(rows).body,
+    }
+    sizes = {name: len(encode()) for name, encode in paths.items()}
+    results = {name: time_path(name, encode, args.iterations, args.warmup) for name, encode in paths.items()}
+    loop.close()
+
+    print(f"{args.tickets} tickets, {args.comments} comments each, payload {sizes['fastapi']} bytes")
+    print_table(results, title="path")
+    if args.json:
+        write_results(args.json, "serialization", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
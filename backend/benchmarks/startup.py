@@ -0,0 +1,146 @@
+"""Startup benchmark: time from launching the server to its first successful request.
+
+Starts the API as a real subprocess once per launch configuration and run,
+polls an authenticated, database-backed endpoint until it answers 200, then
+times the first login (bcrypt) and a few warm requests before sending SIGTERM:
+
+    python -m benchmarks.seed
+    python -m benchmarks.startup --runs 5 --json startup.json
+    python -m benchmarks.startup --configs server,server_cold --workers 4
+
+    ready_ms          launch until the first 200 from GET /workspaces/
+    first_request_ms  latency of that first successful request
+    first_login_ms    latency of the first POST /auth/login afterwards
+    warm_p50_ms       median of the following --warm-requests requests
+
+Configurations:
+
+    uvicorn_reload  uvicorn --reload, one process (the old container command)
+    uvicorn         uvicorn, one process, no startup warm-up
+    server_cold     python -m app.server with warm-up disabled
+    server          python -m app.server (pool, bcrypt and JWT warmed at startup)
+
+Uses the database in DATABASE_URL, which the subprocesses inherit; SQLite
+works as a stand-in. Needs httpx.
+"""
+import argparse
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+from time import perf_counter
+from typing import Dict, List
+
+import httpx
+
+from app.auth.utils import create_access_token
+from app.database import engine
+from benchmarks.common import write_results
+from benchmarks.seed import OWNER_EMAIL, seeded_ids
+
+_COLD = {"WARM_STARTUP": "false", "DB_POOL_WARMUP": "0"}
+
+CONFIGS = {
+    "uvicorn_reload": (["-m", "uvicorn", "app.main:app", "--reload"], _COLD),
+    "uvicorn": (["-m", "uvicorn", "app.main:app"], _COLD),
+    "server_cold": (["-m", "app.server"], _COLD),
+    "server": (["-m", "app.server"], {}),
+}
+
+COLUMNS = ["ready_ms", "first_request_ms", "first_login_ms", "warm_p50_ms"]
+
+
+def launch(name: str, port: int, workers: int) -> subprocess.Popen:
+    args, env = CONFIGS[name]
+    if args[1] == "uvicorn":
+        args = args + ["--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"]
+        # uvicorn's CLI also reads WEB_CONCURRENCY
+        workers = 1
+    return subprocess.Popen(
+        [sys.executable] + args,
+        env={**os.environ, **env, "HOST": "127.0.0.1", "PORT": str(port), "WEB_CONCURRENCY": str(workers), "LOG_LEVEL": "WARNING"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def measure(name: str, args, token: str) -> Dict[str, float]:
+    base_url = f"http://127.0.0.1:{args.port}"
+    headers = {"Authorization": f"Bearer {token}"}
+    start = perf_counter()
+    process = launch(name, args.port, args.workers)
+    try:
+        with httpx.Client(base_url=base_url, timeout=30) as client:
+            while True:
+                if perf_counter() - start > args.timeout:
+                    raise RuntimeError(f"{name}: no successful request within {args.timeout}s")
+                if process.poll() is not None:
+                    raise RuntimeError(f"{name}: server exited with code {process.returncode}")
+                sent = perf_counter()
+                try:
+                    response = client.get("/workspaces/", headers=headers)
+                except httpx.TransportError:
+                    time.sleep(0.01)
+                    continue
+                if response.status_code == 200:
+                    break
+                time.sleep(0.01)
+            done = perf_counter()
+            result = {"ready_ms": (done - start) * 1000, "first_request_ms": (done - sent) * 1000}
+
+            sent = perf_counter()
+            client.post("/auth/login", data={"username": OWNER_EMAIL, "password": args.password}).raise_for_status()
+            result["first_login_ms"] = (perf_counter() - sent) * 1000
+
+            warm = []
+            for _ in range(args.warm_requests):
+                sent = perf_counter()
+                client.get("/workspaces/", headers=headers).raise_for_status()
+                warm.append(perf_counter() - sent)
+            result["warm_p50_ms"] = statistics.median(warm) * 1000 if warm else 0.0
+        return result
+    finally:
+        process.send_signal(signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--configs", default=",".join(CONFIGS), help="comma-separated, from: " + ", ".join(CONFIGS))
+    parser.add_argument("--runs", type=int, default=3, help="launches per configuration (medians are reported)")
+    parser.add_argument("--workers", type=int, default=2, help="WEB_CONCURRENCY for app.server")
+    parser.add_argument("--warm-requests", type=int, default=20)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=60, help="seconds to wait for the first successful request")
+    parser.add_argument("--password", default="bench-password", help="password the seeded owner was created with")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    ids = asyncio.run(seeded_ids(engine))
+    if ids is None:
+        raise SystemExit("No seeded data found; run python -m benchmarks.seed first")
+    token = create_access_token({"sub": OWNER_EMAIL, "uid": ids["user_id"]})
+
+    results = {}
+    for name in args.configs.split(","):
+        runs: List[Dict[str, float]] = [measure(name, args, token) for _ in range(args.runs)]
+        results[name] = {column: round(statistics.median(run[column] for run in runs), 1) for column in COLUMNS}
+        results[name]["runs"] = len(runs)
+
+    width = max(len(name) for name in results) + 2
+    print("config".ljust(width) + "".join(column.rjust(18) for column in COLUMNS))
+    for name, row in results.items():
+        print(name.ljust(width) + "".join(str(row[column]).rjust(18) for column in COLUMNS))
+    if args.json:
+        write_results(args.json, "startup", vars(args), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""attachment storage
+
+Revision ID: 4f7b2e9c1a86
+Revises: e5a8c3f1b7d2
+Create Date: 2026-10-18 13:05:12.640318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4f7b2e9c1a86'
+down_revision = 'e5a8c3f1b7d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('attachments', sa.Column('sha256', sa.String(length=64), nullable=True))
+    op.add_column('attachments', sa.Column('size', sa.BigInteger(), nullable=True))
+    op.add_column('attachments', sa.Column('content_type', sa.String(), nullable=True))
+    op.create_index(op.f('ix_attachments_sha256'), 'attachments', ['sha256'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_attachments_sha256'), table_name='attachments')
+    op.drop_column('attachments', 'content_type')
+    op.drop_column('attachments', 'size')
+    op.drop_column('attachments', 'sha256')
@@ -0,0 +1,33 @@
+"""ticket full text search
+
+Revision ID: 7d2f1c9a4b10
+Revises: 3eb3de3b6d24
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d2f1c9a4b10'
+down_revision = '3eb3de3b6d24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Generated columns can only reference their own row, so comment text is
+    # not part of the vector. Config must match app.tickets.search.SEARCH_CONFIG.
+    op.execute(
+        "ALTER TABLE tickets ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+        ") STORED"
+    )
+    op.create_index('ix_tickets_search_vector', 'tickets', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tickets_search_vector', table_name='tickets')
+    op.drop_column('tickets', 'search_vector')
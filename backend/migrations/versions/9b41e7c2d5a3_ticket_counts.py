@@ -0,0 +1,42 @@
+"""ticket counts
+
+Revision ID: 9b41e7c2d5a3
+Revises: 7d2f1c9a4b10
+Create Date: 2026-10-18 11:02:17.554310
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '9b41e7c2d5a3'
+down_revision = '7d2f1c9a4b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    ticket_status = postgresql.ENUM('BACKLOG', 'IN_PROGRESS', 'DONE', name='ticketstatus', create_type=False)
+    op.create_table('ticket_counts',
+    sa.Column('workspace_id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('status', ticket_status, nullable=False),
+    sa.Column('ticket_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['workspace_id'], ['workspaces.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('workspace_id', 'project_id', 'status')
+    )
+    # Backfill from the existing tickets
+    op.execute(
+        "INSERT INTO ticket_counts (workspace_id, project_id, status, ticket_count) "
+        "SELECT projects.workspace_id, tickets.project_id, tickets.status, count(tickets.id) "
+        "FROM tickets JOIN projects ON projects.id = tickets.project_id "
+        "WHERE tickets.status IS NOT NULL "
+        "GROUP BY projects.workspace_id, tickets.project_id, tickets.status"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ticket_counts')
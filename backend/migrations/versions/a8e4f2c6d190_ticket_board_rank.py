@@ -0,0 +1,38 @@
+"""ticket board rank
+
+Revision ID: a8e4f2c6d190
+Revises: f1c8d3b5a927
+Create Date: 2026-10-18 16:48:31.207764
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8e4f2c6d190'
+down_revision = 'f1c8d3b5a927'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    rank_type = sa.String(length=64, collation='C')
+    op.add_column('tickets', sa.Column('board_rank', rank_type, nullable=True))
+    # Existing cards keep their creation order: fixed-width hex of the row
+    # number within the column, plus a trailing digit so there is always room
+    # after every key (see app/tickets/ranking.py)
+    op.execute(
+        "UPDATE tickets SET board_rank = ranked.board_rank FROM ("
+        "  SELECT id, lpad(to_hex(n), 8, '0') || 'i' AS board_rank FROM ("
+        "    SELECT id, row_number() OVER (PARTITION BY project_id, status ORDER BY created_at, id) AS n FROM tickets"
+        "  ) numbered"
+        ") ranked WHERE ranked.id = tickets.id"
+    )
+    op.alter_column('tickets', 'board_rank', existing_type=rank_type, nullable=False)
+    op.create_index('ix_tickets_project_id_status_board_rank', 'tickets', ['project_id', 'status', 'board_rank'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tickets_project_id_status_board_rank', table_name='tickets')
+    op.drop_column('tickets', 'board_rank')
@@ -0,0 +1,26 @@
+"""user and project version
+
+Revision ID: b2e6d8f4a071
+Revises: c5f1e8a3b729
+Create Date: 2026-10-18 19:05:12.417302
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2e6d8f4a071'
+down_revision = 'c5f1e8a3b729'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('projects', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('projects', 'version')
+    op.drop_column('users', 'version')
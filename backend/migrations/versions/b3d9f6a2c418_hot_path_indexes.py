@@ -0,0 +1,58 @@
+"""hot path indexes
+
+Revision ID: b3d9f6a2c418
+Revises: 4f7b2e9c1a86
+Create Date: 2026-10-18 14:10:03.271845
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3d9f6a2c418'
+down_revision = '4f7b2e9c1a86'
+branch_labels = None
+depends_on = None
+
+# (name, table, columns)
+INDEXES = [
+    ('ix_tickets_project_id_status', 'tickets', ['project_id', 'status']),
+    ('ix_tickets_project_id_priority', 'tickets', ['project_id', 'priority']),
+    ('ix_tickets_project_id_updated_at', 'tickets', ['project_id', 'updated_at', 'id']),
+    ('ix_tickets_assignee_id', 'tickets', ['assignee_id']),
+    ('ix_comments_ticket_id_parent_id', 'comments', ['ticket_id', 'parent_id']),
+    ('ix_comments_parent_id', 'comments', ['parent_id']),
+    ('ix_attachments_ticket_id', 'attachments', ['ticket_id']),
+    ('ix_projects_workspace_id', 'projects', ['workspace_id']),
+    ('ix_workspace_members_user_id', 'workspace_members', ['user_id']),
+]
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction, and building without it
+    # would block writes to these tables for the whole build.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            # A concurrent build that failed leaves an INVALID index behind; drop it so it is rebuilt
+            if _is_invalid(name):
+                op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def _is_invalid(name: str) -> bool:
+    if op.get_context().as_sql:
+        return False
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return False
+    return bool(bind.execute(
+        sa.text("SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid WHERE c.relname = :name AND NOT i.indisvalid"),
+        {"name": name},
+    ).scalar())
@@ -0,0 +1,41 @@
+"""jobs
+
+Revision ID: c5f1e8a3b729
+Revises: a8e4f2c6d190
+Create Date: 2026-10-18 18:42:07.551930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5f1e8a3b729'
+down_revision = 'a8e4f2c6d190'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('jobs',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('queue', sa.String(length=64), nullable=False),
+    sa.Column('name', sa.String(length=128), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'FAILED', name='jobstatus'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('run_at', sa.DateTime(), nullable=False),
+    sa.Column('locked_at', sa.DateTime(), nullable=True),
+    sa.Column('locked_by', sa.String(length=128), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_jobs_queue_status_run_at', 'jobs', ['queue', 'status', 'run_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_queue_status_run_at', table_name='jobs')
+    op.drop_table('jobs')
+    sa.Enum(name='jobstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,36 @@
+"""ticket activity
+
+Revision ID: d7e2a4c9f316
+Revises: b3d9f6a2c418
+Create Date: 2026-10-18 15:21:40.118203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7e2a4c9f316'
+down_revision = 'b3d9f6a2c418'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('ticket_activity',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('ticket_id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('action', sa.String(length=32), nullable=False),
+    sa.Column('changes', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_ticket_activity_ticket_id_created_at', 'ticket_activity', ['ticket_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ticket_activity_ticket_id_created_at', table_name='ticket_activity')
+    op.drop_table('ticket_activity')
@@ -0,0 +1,24 @@
+"""workspace version
+
+Revision ID: e5a8c3f1b7d2
+Revises: 9b41e7c2d5a3
+Create Date: 2026-10-18 12:20:41.108934
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a8c3f1b7d2'
+down_revision = '9b41e7c2d5a3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('workspaces', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('workspaces', 'version')
@@ -0,0 +1,46 @@
+"""assignee tickets index
+
+Revision ID: f1c8d3b5a927
+Revises: d7e2a4c9f316
+Create Date: 2026-10-18 16:02:55.904417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1c8d3b5a927'
+down_revision = 'd7e2a4c9f316'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves GET /me/tickets: equality on assignee (and status), then the
+    # (updated_at, id) keyset. It also covers every assignee_id-only lookup,
+    # so the single-column index is dropped once it exists.
+    with op.get_context().autocommit_block():
+        if _is_invalid('ix_tickets_assignee_id_status_updated_at'):
+            op.drop_index('ix_tickets_assignee_id_status_updated_at', table_name='tickets', postgresql_concurrently=True, if_exists=True)
+        op.create_index('ix_tickets_assignee_id_status_updated_at', 'tickets', ['assignee_id', 'status', 'updated_at', 'id'],
+                        unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_tickets_assignee_id', table_name='tickets', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tickets_assignee_id', 'tickets', ['assignee_id'], unique=False, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index('ix_tickets_assignee_id_status_updated_at', table_name='tickets', postgresql_concurrently=True, if_exists=True)
+
+
+def _is_invalid(name: str) -> bool:
+    if op.get_context().as_sql:
+        return False
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return False
+    return bool(bind.execute(
+        sa.text("SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid WHERE c.relname = :name AND NOT i.indisvalid"),
+        {"name": name},
+    ).scalar())
@@ -0,0 +1,18 @@
+import asyncio
+import sys
+from app.database import SessionLocal, engine
+from app.tickets.counters import rebuild_ticket_counts
+
+async def reconcile(workspace_id=None):
+    scope = f"workspace {workspace_id}" if workspace_id is not None else "all workspaces"
+    print(f"Rebuilding ticket counters for {scope}...")
+    try:
+        async with SessionLocal() as session:
+            await rebuild_ticket_counts(session, workspace_id)
+        print("Ticket counters rebuilt.")
+    finally:
+        await engine.dispose()
+
+if __name__ == "__main__":
+    # Usage: python reconcile_ticket_counts.py [workspace_id]
+    asyncio.run(reconcile(int(sys.argv[1]) if len(sys.argv) > 1 else None))
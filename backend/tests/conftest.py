@@ -0,0 +1,74 @@
+"""Shared setup for the API tests.
+
+    cd backend && python -m pytest tests
+
+The app runs in-process against a throwaway SQLite database, driven through
+httpx's ASGI transport. Its lifespan (pool warm-up, realtime hub, job workers)
+is not started. Each test gets a fresh schema and empty per-worker caches.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+
+_tmp = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_tmp}/test.db"
+os.environ["UPLOAD_DIR"] = os.path.join(_tmp, "uploads")
+os.environ["JOB_WORKERS_IN_PROCESS"] = "false"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from app import models  # noqa: E402,F401
+from app.auth import access, cache  # noqa: E402
+from app.database import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+PASSWORD = "password123"
+
+
+def _clear_caches() -> None:
+    # Ids are reused by the next schema, so nothing cached may survive it
+    for ttl_cache in (cache._tokens, cache._users, access._memberships, access._project_workspaces):
+        ttl_cache.clear()
+
+
+@pytest.fixture
+def api():
+    """Runs ``await scenario(client)`` on its own event loop and returns the result."""
+
+    def run(scenario):
+        async def main():
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.drop_all)
+                await conn.run_sync(Base.metadata.create_all)
+            _clear_caches()
+            try:
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                    return await scenario(client)
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(main())
+
+    return run
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str = PASSWORD) -> dict:
+    """Registers ``email`` if needed and returns its Authorization header."""
+    await client.post("/auth/register", json={"email": email, "password": password})
+    response = await client.post("/auth/login", data={"username": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def create_project(client: httpx.AsyncClient, headers: dict) -> int:
+    """A workspace owned by the caller with one project in it; returns the project id."""
+    workspace = (await client.post("/workspaces/", json={"name": "W"}, headers=headers)).json()["id"]
+    response = await client.post(
+        f"/workspaces/{workspace}/projects", json={"name": "P", "workspace_id": workspace}, headers=headers
+    )
+    response.raise_for_status()
+    return response.json()["id"]
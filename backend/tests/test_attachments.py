@@ -0,0 +1,125 @@
+"""Attachment storage and downloads: dedup, size limit, conditional and range requests."""
+import os
+
+import pytest
+from fastapi import HTTPException
+
+from app import storage
+from app.storage import parse_range
+from conftest import create_project, login
+
+CONTENT = bytes(range(100))
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("bytes=-", None),
+    ("items=0-5", None),
+    ("bytes=0-1, 5-6", None),
+    ("bytes=0-9", (0, 9)),
+    ("bytes=90-", (90, 99)),
+    ("bytes=90-500", (90, 99)),
+    ("bytes=-10", (90, 99)),
+    ("bytes=-500", (0, 99)),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, len(CONTENT)) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=100-", "bytes=100-200", "bytes=9-5", "bytes=-0"])
+def test_parse_range_unsatisfiable(header):
+    with pytest.raises(HTTPException) as raised:
+        parse_range(header, len(CONTENT))
+    assert raised.value.status_code == 416
+    assert raised.value.headers == {"Content-Range": "bytes */100"}
+
+
+async def _upload(client, project, ticket, headers, content=CONTENT, name="data.bin"):
+    return await client.post(
+        f"/projects/{project}/tickets/{ticket}/attachments",
+        files={"file": (name, content, "application/octet-stream")},
+        headers=headers,
+    )
+
+
+async def _ticket(client, project, headers):
+    response = await client.post(f"/projects/{project}/tickets/", json={"title": "t", "project_id": project}, headers=headers)
+    return response.json()["id"]
+
+
+def test_range_and_conditional_downloads(api):
+    async def scenario(client):
+        headers = await login(client, "owner@example.com")
+        project = await create_project(client, headers)
+        ticket = await _ticket(client, project, headers)
+        url = (await _upload(client, project, ticket, headers)).json()["file_url"]
+
+        full = await client.get(url, headers=headers)
+        etag = full.headers["ETag"]
+
+        async def get(**extra):
+            return await client.get(url, headers={**headers, **extra})
+
+        return full, {
+            "range": await get(Range="bytes=10-19"),
+            "suffix": await get(Range="bytes=-5"),
+            "unsatisfiable": await get(Range="bytes=100-"),
+            "if_range_match": await get(Range="bytes=0-3", **{"If-Range": etag}),
+            "if_range_stale": await get(Range="bytes=0-3", **{"If-Range": '"stale"'}),
+            "not_modified": await get(**{"If-None-Match": etag}),
+        }
+
+    full, responses = api(scenario)
+    assert full.status_code == 200 and full.content == CONTENT
+    assert full.headers["Accept-Ranges"] == "bytes"
+
+    partial = responses["range"]
+    assert partial.status_code == 206 and partial.content == CONTENT[10:20]
+    assert partial.headers["Content-Range"] == "bytes 10-19/100"
+    assert partial.headers["Content-Length"] == "10"
+    assert partial.headers["ETag"] == full.headers["ETag"]
+    assert responses["suffix"].status_code == 206 and responses["suffix"].content == CONTENT[-5:]
+
+    assert responses["unsatisfiable"].status_code == 416
+    assert responses["unsatisfiable"].headers["Content-Range"] == "bytes */100"
+
+    assert responses["if_range_match"].status_code == 206 and responses["if_range_match"].content == CONTENT[:4]
+    # A changed representation gets the whole file, not a piece of it
+    assert responses["if_range_stale"].status_code == 200 and responses["if_range_stale"].content == CONTENT
+    assert responses["not_modified"].status_code == 304 and not responses["not_modified"].content
+
+
+def test_identical_uploads_share_one_blob(api):
+    async def scenario(client):
+        headers = await login(client, "owner@example.com")
+        project = await create_project(client, headers)
+        ticket = await _ticket(client, project, headers)
+        first = await _upload(client, project, ticket, headers, name="a.bin")
+        second = await _upload(client, project, ticket, headers, name="b.bin")
+        downloads = [await client.get(response.json()["file_url"], headers=headers) for response in (first, second)]
+        return [response.json()["size"] for response in (first, second)], downloads
+
+    sizes, downloads = api(scenario)
+    assert sizes == [100, 100]
+    assert downloads[0].headers["ETag"] == downloads[1].headers["ETag"]
+    assert [response.content for response in downloads] == [CONTENT, CONTENT]
+    assert 'filename="b.bin"' in downloads[1].headers["Content-Disposition"]
+    blobs = [name for _, _, files in os.walk(storage.UPLOAD_DIR) for name in files]
+    assert blobs.count(downloads[0].headers["ETag"].strip('"')) == 1
+    assert not [name for name in blobs if name.startswith(".upload-")]
+
+
+def test_upload_size_limit(api, monkeypatch):
+    monkeypatch.setattr(storage, "MAX_UPLOAD_BYTES", 50)
+
+    async def scenario(client):
+        headers = await login(client, "owner@example.com")
+        project = await create_project(client, headers)
+        ticket = await _ticket(client, project, headers)
+        at_limit = await _upload(client, project, ticket, headers, content=CONTENT[:50])
+        over_limit = await _upload(client, project, ticket, headers, content=CONTENT[:51])
+        listed = (await client.get(f"/projects/{project}/tickets/{ticket}", headers=headers)).json()["attachments"]
+        return at_limit.status_code, over_limit.status_code, len(listed)
+
+    assert api(scenario) == (200, 413, 1)
@@ -0,0 +1,26 @@
+"""The per-worker user cache must not reject tokens issued after an email change."""
+from app.auth.cache import cached_user, remember_user
+from conftest import PASSWORD, login
+
+
+def test_new_token_works_with_stale_cached_email(api):
+    async def scenario(client):
+        old = await login(client, "old@example.com")
+        me = (await client.get("/auth/me", headers=old)).json()
+        # What another worker still holds after this one handles the change
+        stale = cached_user(me["id"])
+        assert stale is not None and stale.email == "old@example.com"
+
+        response = await client.patch("/auth/me", params={"email": "new@example.com"}, headers=old)
+        assert response.status_code == 200
+        remember_user(stale)
+
+        response = await client.post("/auth/login", data={"username": "new@example.com", "password": PASSWORD})
+        new = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        response = await client.get("/auth/me", headers=new)
+        assert response.status_code == 200
+        assert response.json()["email"] == "new@example.com"
+        # The re-read row replaced the stale entry
+        assert cached_user(me["id"]).email == "new@example.com"
+
+    api(scenario)
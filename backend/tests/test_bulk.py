@@ -0,0 +1,88 @@
+"""Bulk ticket writes: per-item results in batch order, board placement, and request limits."""
+from app.tickets import bulk
+from conftest import create_project, login
+
+
+async def _create(client, project, headers, title, **fields):
+    response = await client.post(f"/projects/{project}/tickets/", json={"title": title, "project_id": project, **fields}, headers=headers)
+    return response.json()["id"]
+
+
+def test_results_follow_batch_order(api):
+    async def scenario(client):
+        headers = await login(client, "owner@example.com")
+        project = await create_project(client, headers)
+        elsewhere = await create_project(client, headers)
+        kept = await _create(client, project, headers, "kept")
+        moved = await _create(client, project, headers, "moved")
+        doomed = await _create(client, project, headers, "doomed")
+        await client.post(
+            f"/projects/{project}/tickets/{doomed}/comments", json={"content": "c", "ticket_id": doomed}, headers=headers
+        )
+        foreign = await _create(client, elsewhere, headers, "foreign")
+        response = await client.post(
+            f"/projects/{project}/tickets/bulk",
+            json={
+                "create": [{"title": f"new {i}", "project_id": project, "status": "done"} for i in range(3)],
+                "update": [{"id": moved, "status": "done"}, {"id": foreign, "title": "hijacked"}, {"id": kept, "title": "renamed"}],
+                "delete": [999999, doomed],
+            },
+            headers=headers,
+        )
+        assert response.status_code == 200, response.text
+        results = response.json()
+        tickets = (await client.get(f"/projects/{project}/tickets/", headers=headers)).json()
+        foreign_title = (await client.get(f"/projects/{elsewhere}/tickets/{foreign}", headers=headers)).json()["title"]
+        return kept, moved, doomed, foreign, results, tickets, foreign_title
+
+    kept, moved, doomed, foreign, results, tickets, foreign_title = api(scenario)
+    assert [(item["op"], item["ok"], item["error"]) for item in results] == [
+        ("create", True, None), ("create", True, None), ("create", True, None),
+        ("update", True, None), ("update", False, "Ticket not found"), ("update", True, None),
+        ("delete", False, "Ticket not found"), ("delete", True, None),
+    ]
+    created = [item["id"] for item in results[:3]]
+    assert [item["id"] for item in results[3:]] == [moved, foreign, kept, 999999, doomed]
+    assert [item["ticket"]["title"] for item in results[:3]] == ["new 0", "new 1", "new 2"]
+    assert results[5]["ticket"]["title"] == "renamed" and results[7]["ticket"] is None
+
+    # New cards, then the card that changed column, at the bottom of the column in batch order
+    done = [ticket["id"] for ticket in tickets if ticket["status"] == "done"]
+    assert done == created + [moved]
+    assert doomed not in {ticket["id"] for ticket in tickets}
+    assert foreign_title == "foreign"
+
+
+def test_minimal_response_skips_tickets(api):
+    async def scenario(client):
+        headers = await login(client, "owner@example.com")
+        project = await create_project(client, headers)
+        response = await client.post(
+            f"/projects/{project}/tickets/bulk",
+            params={"minimal": True},
+            json={"create": [{"title": "t", "project_id": project}]},
+            headers=headers,
+        )
+        return response.json()
+
+    [result] = api(scenario)
+    assert result["op"] == "create" and result["ok"] and result["ticket"] is None
+
+
+def test_rejected_batches(api, monkeypatch):
+    monkeypatch.setattr(bulk, "TICKET_BULK_MAX_ITEMS", 3)
+
+    async def scenario(client):
+        headers = await login(client, "owner@example.com")
+        project = await create_project(client, headers)
+        ticket = await _create(client, project, headers, "t")
+        url = f"/projects/{project}/tickets/bulk"
+        duplicate = await client.post(url, json={"update": [{"id": ticket, "title": "x"}], "delete": [ticket]}, headers=headers)
+        too_many = await client.post(
+            url, json={"create": [{"title": f"t{i}", "project_id": project} for i in range(4)]}, headers=headers
+        )
+        titles = [item["title"] for item in (await client.get(f"{url[:-len('bulk')]}", headers=headers)).json()]
+        return duplicate.status_code, too_many.status_code, titles
+
+    # Nothing from a rejected batch is applied
+    assert api(scenario) == (400, 400, ["t"])
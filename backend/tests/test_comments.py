@@ -0,0 +1,75 @@
+"""Comment threads: reply trees, depth limits, paging, and replies staying on their ticket."""
+from conftest import create_project, login
+
+
+async def _ticket(client, project, headers, title="T"):
+    response = await client.post(f"/projects/{project}/tickets/", json={"title": title, "project_id": project}, headers=headers)
+    return response.json()["id"]
+
+
+async def _comment(client, project, ticket, headers, content, parent_id=None):
+    response = await client.post(
+        f"/projects/{project}/tickets/{ticket}/comments",
+        json={"content": content, "ticket_id": ticket, "parent_id": parent_id},
+        headers=headers,
+    )
+    return response
+
+
+def _shape(threads):
+    return [(comment["content"], _shape(comment["replies"])) for comment in threads]
+
+
+def test_threads_depth_and_paging(api):
+    async def scenario(client):
+        headers = await login(client, "owner@example.com")
+        project = await create_project(client, headers)
+        ticket = await _ticket(client, project, headers)
+        root = (await _comment(client, project, ticket, headers, "root")).json()["id"]
+        reply = (await _comment(client, project, ticket, headers, "reply", root)).json()["id"]
+        await _comment(client, project, ticket, headers, "nested", reply)
+        await _comment(client, project, ticket, headers, "second")
+        await _comment(client, project, ticket, headers, "third")
+
+        url = f"/projects/{project}/tickets/{ticket}/comments"
+        full = (await client.get(url, headers=headers)).json()
+        shallow = (await client.get(url, params={"depth": 1}, headers=headers)).json()
+        flat = (await client.get(url, params={"depth": 0}, headers=headers)).json()
+
+        first = await client.get(url, params={"limit": 2}, headers=headers)
+        cursor = first.headers.get("X-Next-Cursor")
+        rest = await client.get(url, params={"limit": 2, "cursor": cursor}, headers=headers)
+        return full, shallow, flat, first.json(), cursor, rest
+
+    full, shallow, flat, first, cursor, rest = api(scenario)
+    assert _shape(full) == [("root", [("reply", [("nested", [])])]), ("second", []), ("third", [])]
+    assert _shape(shallow) == [("root", [("reply", [])]), ("second", []), ("third", [])]
+    assert _shape(flat) == [("root", []), ("second", []), ("third", [])]
+    assert _shape(first) == _shape(full)[:2]
+    assert cursor is not None
+    assert _shape(rest.json()) == [("third", [])] and "X-Next-Cursor" not in rest.headers
+
+
+def test_reply_to_another_tickets_comment_is_rejected(api):
+    async def scenario(client):
+        owner = await login(client, "owner@example.com")
+        other = await login(client, "other@example.com")
+        project = await create_project(client, owner)
+        ticket = await _ticket(client, project, owner, "mine")
+        neighbour = await _ticket(client, project, owner, "neighbour")
+        # A comment in a project the owner can't read
+        private_project = await create_project(client, other)
+        private_ticket = await _ticket(client, private_project, other)
+        private = (await _comment(client, private_project, private_ticket, other, "private")).json()["id"]
+        nearby = (await _comment(client, project, neighbour, owner, "nearby")).json()["id"]
+
+        statuses = [
+            (await _comment(client, project, ticket, owner, "reply", parent_id)).status_code
+            for parent_id in (private, nearby, 999999)
+        ]
+        private_thread = (await client.get(f"/projects/{private_project}/tickets/{private_ticket}/comments", headers=other)).json()
+        return statuses, private_thread
+
+    statuses, private_thread = api(scenario)
+    assert statuses == [400, 400, 400]
+    assert _shape(private_thread) == [("private", [])]
@@ -0,0 +1,97 @@
+"""Per-status ticket counters: kept in step by every write, and rebuilt from the tickets table."""
+from sqlalchemy import func, update
+from sqlalchemy.future import select
+
+from app.database import SessionLocal
+from app.models import Project, Ticket, TicketCount, TicketStatus
+from app.tickets.counters import rebuild_ticket_counts, status_deltas
+from conftest import create_project, login
+
+
+def test_status_deltas():
+    deltas = status_deltas(
+        added=[TicketStatus.IN_PROGRESS, TicketStatus.IN_PROGRESS, TicketStatus.DONE, None],
+        removed=[TicketStatus.DONE, TicketStatus.BACKLOG, None],
+    )
+    assert deltas == {TicketStatus.IN_PROGRESS: 2, TicketStatus.BACKLOG: -1}
+
+
+async def _workspace(client, headers):
+    return (await client.get("/workspaces/", headers=headers)).json()[0]["id"]
+
+
+async def _stats(client, workspace, headers):
+    return (await client.get(f"/workspaces/{workspace}/stats", headers=headers)).json()["status_counts"]
+
+
+async def _actual(workspace):
+    async with SessionLocal() as db:
+        result = await db.execute(
+            select(Ticket.status, func.count(Ticket.id))
+            .join(Project, Project.id == Ticket.project_id)
+            .where(Project.workspace_id == workspace)
+            .group_by(Ticket.status)
+        )
+        return {ticket_status.value: count for ticket_status, count in result.all()}
+
+
+def test_counts_follow_every_write(api):
+    async def scenario(client):
+        headers = await login(client, "owner@example.com")
+        project = await create_project(client, headers)
+        workspace = await _workspace(client, headers)
+        base = f"/projects/{project}/tickets"
+        seen = []
+
+        async def check():
+            stats = await _stats(client, workspace, headers)
+            assert stats == await _actual(workspace)
+            seen.append(stats)
+
+        first = (await client.post(f"{base}/", json={"title": "a", "project_id": project}, headers=headers)).json()["id"]
+        second = (await client.post(f"{base}/", json={"title": "b", "project_id": project, "status": "in_progress"}, headers=headers)).json()["id"]
+        await check()
+        await client.patch(f"{base}/{first}", json={"status": "done"}, headers=headers)
+        await check()
+        await client.delete(f"{base}/{second}", headers=headers)
+        await check()
+        await client.post(
+            f"{base}/bulk",
+            json={
+                "create": [{"title": "c", "project_id": project, "status": "in_progress"}, {"title": "d", "project_id": project}],
+                "update": [{"id": first, "status": "backlog"}],
+            },
+            headers=headers,
+        )
+        await check()
+        return seen
+
+    assert api(scenario) == [
+        {"backlog": 1, "in_progress": 1},
+        {"done": 1, "in_progress": 1},
+        {"done": 1},
+        {"backlog": 2, "in_progress": 1},
+    ]
+
+
+def test_rebuild_restores_drifted_counts(api):
+    async def scenario(client):
+        owner = await login(client, "owner@example.com")
+        other = await login(client, "other@example.com")
+        projects = [await create_project(client, headers) for headers in (owner, other)]
+        workspaces = []
+        for project, headers in zip(projects, (owner, other)):
+            await client.post(f"/projects/{project}/tickets/", json={"title": "t", "project_id": project}, headers=headers)
+            workspaces.append(await _workspace(client, headers))
+
+        async with SessionLocal() as db:
+            await db.execute(update(TicketCount).values(ticket_count=TicketCount.ticket_count + 5))
+            await db.commit()
+        async with SessionLocal() as db:
+            await rebuild_ticket_counts(db, workspaces[0])
+        return await _stats(client, workspaces[0], owner), await _stats(client, workspaces[1], other)
+
+    rebuilt, untouched = api(scenario)
+    assert rebuilt == {"backlog": 1}
+    # Only the named workspace is rebuilt
+    assert untouched == {"backlog": 6}
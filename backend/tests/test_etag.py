@@ -0,0 +1,108 @@
+"""Conditional GETs: 304 while nothing in the response changed, 200 as soon as anything did."""
+from app.database import SessionLocal
+from app.jobs.handlers import process_attachment
+from app.models import Attachment, TicketStatus
+from app.tickets.ranking import rebalance_column
+from conftest import create_project, login
+
+
+async def _revalidate(client, url, headers, etag):
+    response = await client.get(url, headers={**headers, "If-None-Match": etag})
+    return response.status_code, response.headers.get("ETag")
+
+
+def test_if_none_match(api):
+    async def scenario(client):
+        headers = await login(client, "owner@example.com")
+        project = await create_project(client, headers)
+        url = f"/projects/{project}/tickets/"
+        first = await client.get(url, headers=headers)
+        etag = first.headers["ETag"]
+        return (
+            first.headers["Cache-Control"],
+            await _revalidate(client, url, headers, etag),
+            await _revalidate(client, url, headers, f'"other", W/{etag}'),
+            await _revalidate(client, url, headers, "*"),
+            await _revalidate(client, url, headers, '"other"'),
+            etag,
+        )
+
+    cache_control, plain, weak, star, other, etag = api(scenario)
+    assert cache_control == "private, no-cache"
+    assert plain == weak == star == (304, etag)
+    assert other == (200, etag)
+
+
+def test_ticket_listing_etag_tracks_everything_embedded(api):
+    async def scenario(client):
+        owner = await login(client, "owner@example.com")
+        project = await create_project(client, owner)
+        me = (await client.get("/auth/me", headers=owner)).json()
+        for title in ("a", "b"):
+            await client.post(
+                f"/projects/{project}/tickets/",
+                json={"title": title, "project_id": project, "assignee_id": me["id"]},
+                headers=owner,
+            )
+        ticket = (await client.get(f"/projects/{project}/tickets/", headers=owner)).json()[0]["id"]
+        url = f"/projects/{project}/tickets/"
+
+        async def status_after(action):
+            etag = (await client.get(url, headers=owner)).headers["ETag"]
+            assert (await _revalidate(client, url, owner, etag))[0] == 304
+            await action()
+            return (await _revalidate(client, url, owner, etag))[0]
+
+        async def update():
+            await client.patch(f"/projects/{project}/tickets/{ticket}", json={"title": "renamed"}, headers=owner)
+
+        async def comment():
+            await client.post(
+                f"/projects/{project}/tickets/{ticket}/comments", json={"content": "c", "ticket_id": ticket}, headers=owner
+            )
+
+        async def profile():
+            await client.patch("/auth/me", params={"full_name": "Renamed"}, headers=owner)
+
+        async def rebalance():
+            await rebalance_column(project, TicketStatus.BACKLOG)
+
+        async def attachment():
+            await client.post(
+                f"/projects/{project}/tickets/{ticket}/attachments",
+                files={"file": ("image.bin", b"\x89PNG\r\n\x1a\n" + b"0" * 16, "application/octet-stream")},
+                headers=owner,
+            )
+
+        async def processed():
+            async with SessionLocal() as db:
+                attachment_id = (await db.execute(Attachment.__table__.select())).first().id
+                await process_attachment.fn(db, {"attachment_id": attachment_id})
+                await db.commit()
+
+        actions = {
+            "update": update, "comment": comment, "profile": profile,
+            "rebalance": rebalance, "attachment": attachment, "processed": processed,
+        }
+        return {name: await status_after(action) for name, action in actions.items()}
+
+    assert api(scenario) == {
+        "update": 200, "comment": 200, "profile": 200, "rebalance": 200, "attachment": 200, "processed": 200,
+    }
+
+
+def test_workspace_listing_etag_tracks_member_profiles(api):
+    async def scenario(client):
+        owner = await login(client, "owner@example.com")
+        member = await login(client, "member@example.com")
+        await create_project(client, owner)
+        workspace = (await client.get("/workspaces/", headers=owner)).json()[0]["id"]
+        await client.post(f"/workspaces/{workspace}/members", json={"email": "member@example.com"}, headers=owner)
+
+        etag = (await client.get("/workspaces/", headers=owner)).headers["ETag"]
+        unchanged, _ = await _revalidate(client, "/workspaces/", owner, etag)
+        await client.patch("/auth/me", params={"full_name": "New Name"}, headers=member)
+        after_profile, _ = await _revalidate(client, "/workspaces/", owner, etag)
+        return unchanged, after_profile
+
+    assert api(scenario) == (304, 200)
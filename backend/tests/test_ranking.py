@@ -0,0 +1,131 @@
+"""Board rank keys: ordering properties, and keys staying within the column width."""
+import asyncio
+import random
+
+import pytest
+from sqlalchemy import update
+
+from app.database import SessionLocal
+from app.models import Ticket
+from app.tickets import ranking
+from app.tickets.ranking import ALPHABET, RANK_MAX_LENGTH, evenly_spaced, rank_between
+from conftest import create_project, login
+
+
+def test_rank_between_keeps_order():
+    rng = random.Random(0)
+    keys = []
+    for _ in range(3000):
+        i = rng.randint(0, len(keys))
+        # Favour the same few gaps so keys actually grow
+        if rng.random() < 0.5 and keys:
+            i = min(i, 2)
+        lower = keys[i - 1] if i > 0 else None
+        upper = keys[i] if i < len(keys) else None
+        key = rank_between(lower, upper)
+        assert (lower is None or lower < key) and (upper is None or key < upper)
+        assert set(key) <= set(ALPHABET) and not key.endswith("0")
+        keys.insert(i, key)
+    assert keys == sorted(keys) and len(set(keys)) == len(keys)
+
+
+def test_rank_between_rejects_unordered_neighbours():
+    with pytest.raises(ValueError):
+        rank_between("b", "a")
+    with pytest.raises(ValueError):
+        rank_between("a", "a")
+
+
+@pytest.mark.parametrize("count", [1, 2, 35, 1000, 50000])
+def test_evenly_spaced(count):
+    keys = evenly_spaced(count)
+    assert len(keys) == count
+    assert keys == sorted(keys) and len(set(keys)) == count
+    assert all(key and not key.endswith("0") for key in keys)
+
+
+async def _board(client, project, headers):
+    response = await client.get(f"/projects/{project}/tickets/", headers=headers)
+    return [(ticket["id"], ticket["board_rank"]) for ticket in response.json() if ticket["status"] == "backlog"]
+
+
+async def _squeeze(client, project, headers, moves, stop_above=None):
+    """Creates three cards, then keeps moving the last one in between the first two.
+
+    Stops early once a key is longer than ``stop_above``.
+    """
+    order = []
+    for title in "abc":
+        response = await client.post(f"/projects/{project}/tickets/", json={"title": title, "project_id": project}, headers=headers)
+        order.append(response.json()["id"])
+    longest = 0
+    for _ in range(moves):
+        moved = order.pop()
+        response = await client.post(
+            f"/projects/{project}/tickets/{moved}/move",
+            json={"after_id": order[0], "before_id": order[1]},
+            headers=headers,
+        )
+        assert response.status_code == 200, response.text
+        longest = max(longest, len(response.json()["board_rank"]))
+        order.insert(1, moved)
+        if stop_above is not None and longest > stop_above:
+            break
+    return order, longest
+
+
+def test_moves_into_one_gap_respace_the_column(api, monkeypatch):
+    # No background rebalance: the writes themselves must keep keys short
+    monkeypatch.setattr(ranking, "RANK_REBALANCE_LENGTH", RANK_MAX_LENGTH)
+
+    async def scenario(client):
+        headers = await login(client, "owner@example.com")
+        project = await create_project(client, headers)
+        order, longest = await _squeeze(client, project, headers, 400)
+        board = await _board(client, project, headers)
+        assert [ticket_id for ticket_id, _ in board] == order
+        return longest, max(len(rank) for _, rank in board)
+
+    longest, final = api(scenario)
+    assert longest <= RANK_MAX_LENGTH // 2 and final <= RANK_MAX_LENGTH // 2
+
+
+def test_long_key_schedules_background_rebalance(api, monkeypatch):
+    monkeypatch.setattr(ranking, "RANK_REBALANCE_LENGTH", 6)
+
+    async def scenario(client):
+        headers = await login(client, "owner@example.com")
+        project = await create_project(client, headers)
+        # No moves race the rebalance scheduled by the first long key
+        order, longest = await _squeeze(client, project, headers, 40, stop_above=6)
+        await asyncio.gather(*ranking._rebalances)
+        board = await _board(client, project, headers)
+        assert [ticket_id for ticket_id, _ in board] == order
+        return longest, [rank for _, rank in board]
+
+    longest, ranks = api(scenario)
+    assert longest > 6
+    assert ranks == evenly_spaced(3)
+
+
+def test_bulk_appends_past_a_crowded_end(api):
+    async def scenario(client):
+        headers = await login(client, "owner@example.com")
+        project = await create_project(client, headers)
+        last = (await client.post(f"/projects/{project}/tickets/", json={"title": "last", "project_id": project}, headers=headers)).json()["id"]
+        # A column whose last key leaves no room to step: every append would grow the key
+        async with SessionLocal() as db:
+            await db.execute(update(Ticket).where(Ticket.id == last).values(board_rank="z" * 30))
+            await db.commit()
+        response = await client.post(
+            f"/projects/{project}/tickets/bulk",
+            json={"create": [{"title": f"t{i}", "project_id": project} for i in range(100)]},
+            headers=headers,
+        )
+        assert response.status_code == 200, response.text
+        created = [result["id"] for result in response.json()]
+        board = await _board(client, project, headers)
+        assert [ticket_id for ticket_id, _ in board] == [last] + created
+        return max(len(rank) for _, rank in board)
+
+    assert api(scenario) <= RANK_MAX_LENGTH // 2
@@ -0,0 +1,27 @@
+"""Ticket search: stop-word-only queries still match by substring."""
+from app.tickets.search import prefix_query
+from conftest import create_project, login
+
+
+def test_prefix_query():
+    assert prefix_query("Login bug!") == "login:* & bug:*"
+    assert prefix_query("  -- ") is None
+
+
+def test_stop_word_search_matches(api):
+    async def scenario(client):
+        headers = await login(client, "owner@example.com")
+        project = await create_project(client, headers)
+        for title in ("Fix the login page", "Unrelated"):
+            await client.post(f"/projects/{project}/tickets/", json={"title": title, "project_id": project}, headers=headers)
+        base = f"/projects/{project}/tickets"
+        return [
+            [ticket["title"] for ticket in (await client.get(url, params=params, headers=headers)).json()]
+            for url, params in (
+                (f"{base}/", {"search": "the"}),
+                (f"{base}/summary", {"search": "the"}),
+                (f"{base}/search", {"q": "the"}),
+            )
+        ]
+
+    assert api(scenario) == [["Fix the login page"]] * 3
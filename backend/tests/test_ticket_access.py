@@ -0,0 +1,25 @@
+"""Ticket endpoints must answer 404 to users outside the project's workspace."""
+from conftest import create_project, login
+
+
+def test_non_member_gets_404(api):
+    async def scenario(client):
+        owner = await login(client, "owner@example.com")
+        outsider = await login(client, "outsider@example.com")
+        project = await create_project(client, owner)
+        ticket = (await client.post(
+            f"/projects/{project}/tickets/", json={"title": "T", "project_id": project}, headers=owner
+        )).json()["id"]
+
+        paths = {
+            "summary": f"/projects/{project}/tickets/summary",
+            "detail": f"/projects/{project}/tickets/{ticket}",
+            "search": f"/projects/{project}/tickets/search?q=T",
+        }
+        statuses = {}
+        for name, path in paths.items():
+            assert (await client.get(path, headers=owner)).status_code == 200, name
+            statuses[name] = (await client.get(path, headers=outsider)).status_code
+        return statuses
+
+    assert api(scenario) == {"summary": 404, "detail": 404, "search": 404}
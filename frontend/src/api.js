@@ -4,12 +4,27 @@ const api = axios.create({
     baseURL: import.meta.env.VITE_API_URL || 'http://localhost:8000',
 });
 
+// Set by the API after a write: until then reads must go to the primary
+// database, so they see the write even when replicas lag behind
+let primaryUntil = null;
+
 api.interceptors.request.use((config) => {
     const token = localStorage.getItem('token');
     if (token) {
         config.headers.Authorization = `Bearer ${token}`;
     }
+    if (primaryUntil) {
+        config.headers['X-Primary-Until'] = primaryUntil;
+    }
     return config;
 });
 
+api.interceptors.response.use((response) => {
+    const until = response.headers['x-primary-until'];
+    if (until) {
+        primaryUntil = until;
+    }
+    return response;
+});
+
 export default api;
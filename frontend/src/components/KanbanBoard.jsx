@@ -1,6 +1,7 @@
 import React, { useState } from 'react';
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import api from '../api';
+import { useProjectEvents } from '../realtime';
 import {
     DndContext,
     closestCenter,
@@ -24,6 +25,9 @@ const COLUMNS = [
     { id: 'done', title: 'Done' }
 ];
 
+// Cards sort by their board rank (plain string comparison), then id
+const byRank = (a, b) => (a.board_rank < b.board_rank ? -1 : a.board_rank > b.board_rank ? 1 : a.id - b.id);
+
 const DroppableColumn = ({ column, tickets, onAdd, onDelete, onSelect }) => {
     const { setNodeRef } = useDroppable({
         id: column.id,
@@ -81,6 +85,9 @@ const KanbanBoard = ({ project, onBack }) => {
     const [selectedTicket, setSelectedTicket] = useState(null);
     const [commentText, setCommentText] = useState('');
 
+    // Live updates replace polling while the socket is up
+    const live = useProjectEvents(project?.id);
+
     const { data: tickets, isLoading, isError, refetch, isFetching, error } = useQuery({
         queryKey: ['tickets', project?.id],
         queryFn: async () => {
@@ -88,7 +95,7 @@ const KanbanBoard = ({ project, onBack }) => {
             const response = await api.get(`/projects/${project.id}/tickets/`);
             return response.data;
         },
-        refetchInterval: 5000,
+        refetchInterval: live ? false : 5000,
         retry: 3,
         enabled: !!project?.id,
         staleTime: 10000,
@@ -103,9 +110,9 @@ const KanbanBoard = ({ project, onBack }) => {
         enabled: !!project?.workspace_id
     });
 
-    const updateMutation = useMutation({
-        mutationFn: async ({ ticketId, status }) => {
-            return api.patch(`/projects/${project.id}/tickets/${ticketId}`, { status });
+    const moveMutation = useMutation({
+        mutationFn: async ({ ticketId, status, after_id, before_id }) => {
+            return api.post(`/projects/${project.id}/tickets/${ticketId}/move`, { status, after_id, before_id });
         },
         onSuccess: () => {
             queryClient.invalidateQueries(['tickets', project.id]);
@@ -171,22 +178,43 @@ const KanbanBoard = ({ project, onBack }) => {
 
     const handleDragEnd = (event) => {
         const { active, over } = event;
-        if (!over) return;
-
-        const ticketId = active.id;
-        let newStatus = over.id;
-
-        if (!COLUMNS.some(col => col.id === newStatus)) {
-            const overTicket = tickets?.find(t => t.id === newStatus);
-            if (overTicket) newStatus = overTicket.status;
+        if (!over || active.id === over.id) return;
+
+        const activeTicket = tickets?.find(t => t.id === active.id);
+        const overTicket = tickets?.find(t => t.id === over.id);
+        const newStatus = overTicket ? overTicket.status : over.id;
+        if (!activeTicket || !COLUMNS.some(col => col.id === newStatus)) return;
+
+        // Dropped on a card it takes that card's slot; dropped on the column it goes to the bottom
+        const column = columnTickets(newStatus);
+        const from = column.findIndex(t => t.id === activeTicket.id);
+        const rest = column.filter(t => t.id !== activeTicket.id);
+        let index = rest.length;
+        if (overTicket) {
+            index = rest.findIndex(t => t.id === overTicket.id);
+            // Dragging down within a column lands below the card it was dropped on
+            if (from !== -1 && from <= index) index += 1;
         }
+        if (from === index && activeTicket.status === newStatus) return;
+
+        moveMutation.mutate({
+            ticketId: activeTicket.id,
+            status: newStatus,
+            after_id: rest[index - 1]?.id ?? null,
+            before_id: rest[index]?.id ?? null,
+        });
+    };
 
-        if (COLUMNS.some(col => col.id === newStatus)) {
-            const activeTicket = tickets?.find(t => t.id === ticketId);
-            if (activeTicket && activeTicket.status !== newStatus) {
-                updateMutation.mutate({ ticketId, status: newStatus });
-            }
-        }
+    // Downloads need the bearer token, so fetch through the API client instead of following the link
+    const handleDownload = async (e, attachment) => {
+        e.preventDefault();
+        const response = await api.get(attachment.file_url, { responseType: 'blob' });
+        const url = URL.createObjectURL(response.data);
+        const link = document.createElement('a');
+        link.href = url;
+        link.download = attachment.file_name;
+        link.click();
+        URL.revokeObjectURL(url);
     };
 
     const handleCreateTicket = (e) => {
@@ -213,6 +241,8 @@ const KanbanBoard = ({ project, onBack }) => {
         return matchesSearch && matchesPriority && matchesType;
     });
 
+    const columnTickets = (status) => filteredTickets.filter(t => t.status === status).sort(byRank);
+
     const handleComment = (e, parentId = null) => {
         e.preventDefault();
         if (commentText.trim()) {
@@ -322,7 +352,7 @@ const KanbanBoard = ({ project, onBack }) => {
                         <DroppableColumn
                             key={column.id}
                             column={column}
-                            tickets={filteredTickets.filter(t => t.status === column.id)}
+                            tickets={columnTickets(column.id)}
                             onAdd={openCreateModal}
                             onDelete={(id) => deleteMutation.mutate(id)}
                             onSelect={setSelectedTicket}
@@ -394,7 +424,7 @@ const KanbanBoard = ({ project, onBack }) => {
                                     <div className="space-y-2 mb-4">
                                         {selectedTicket.attachments?.length === 0 ? <p className="text-[10px] italic text-slate-400">No files uploaded.</p> :
                                             selectedTicket.attachments.map(att => (
-                                                <a key={att.id} href={att.file_url} target="_blank" className="block text-xs text-blue-600 hover:underline">{att.file_name}</a>
+                                                <a key={att.id} href={att.file_url} onClick={(e) => handleDownload(e, att)} className="block text-xs text-blue-600 hover:underline">{att.file_name}</a>
                                             ))}
                                     </div>
                                     <label className="block">
@@ -0,0 +1,69 @@
+import { useEffect, useState } from 'react';
+import { useQueryClient } from '@tanstack/react-query';
+import api from './api';
+
+const MAX_RETRY_DELAY = 30000;
+
+// Subscribes to /ws/projects/{id} and keeps the ['tickets', id] query in sync.
+// Returns true while the socket is open so callers can stop polling.
+export const useProjectEvents = (projectId) => {
+    const queryClient = useQueryClient();
+    const [connected, setConnected] = useState(false);
+
+    useEffect(() => {
+        if (!projectId) return undefined;
+        const queryKey = ['tickets', projectId];
+        let socket;
+        let retryTimer;
+        let retryDelay = 1000;
+        let closed = false;
+
+        const refetch = () => queryClient.invalidateQueries(queryKey);
+
+        const applyEvent = (event) => {
+            if (event.type === 'ticket.deleted') {
+                queryClient.setQueryData(queryKey, (old) => old?.filter(t => t.id !== event.id));
+            } else if (event.type === 'ticket.updated' && event.data) {
+                const cached = queryClient.getQueryData(queryKey)?.find(t => t.id === event.id);
+                // A new assignee needs the embedded user object, so fall back to a refetch
+                if (!cached || cached.assignee_id !== event.data.assignee_id) {
+                    refetch();
+                    return;
+                }
+                queryClient.setQueryData(queryKey, (old) => old?.map(t => t.id === event.id ? { ...t, ...event.data } : t));
+            } else {
+                // Created tickets, comments, bulk changes and resyncs carry nested data we don't have
+                refetch();
+            }
+        };
+
+        const connect = () => {
+            const token = localStorage.getItem('token');
+            if (!token) return;
+            const base = api.defaults.baseURL.replace(/^http/, 'ws');
+            socket = new WebSocket(`${base}/ws/projects/${projectId}?token=${encodeURIComponent(token)}`);
+            socket.onopen = () => {
+                retryDelay = 1000;
+                setConnected(true);
+                // Catch up on anything missed while disconnected
+                refetch();
+            };
+            socket.onmessage = (message) => applyEvent(JSON.parse(message.data));
+            socket.onclose = () => {
+                setConnected(false);
+                if (closed) return;
+                retryTimer = setTimeout(connect, retryDelay);
+                retryDelay = Math.min(retryDelay * 2, MAX_RETRY_DELAY);
+            };
+        };
+
+        connect();
+        return () => {
+            closed = true;
+            clearTimeout(retryTimer);
+            socket?.close();
+        };
+    }, [projectId, queryClient]);
+
+    return connected;
+};